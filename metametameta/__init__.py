@@ -21,10 +21,45 @@ __all__ = [
     "generate_from_conda_meta",
 ]
 
-from metametameta.from_conda_meta import generate_from_conda_meta
-from metametameta.from_importlib import generate_from_importlib
-from metametameta.from_pep621 import generate_from_pep621
-from metametameta.from_poetry import generate_from_poetry
-from metametameta.from_requirements_txt import generate_from_requirements_txt
-from metametameta.from_setup_cfg import generate_from_setup_cfg
-from metametameta.from_setup_py import generate_from_setup_py
+# Type checkers treat this as True; at runtime it spares importing typing.
+TYPE_CHECKING = False
+
+# Generators are imported on first access (PEP 562), so importing a light
+# submodule such as metametameta.runtime does not load every reader.
+_GENERATOR_MODULES = {
+    "generate_from_setup_cfg": "metametameta.from_setup_cfg",
+    "generate_from_pep621": "metametameta.from_pep621",
+    "generate_from_poetry": "metametameta.from_poetry",
+    "generate_from_importlib": "metametameta.from_importlib",
+    "generate_from_setup_py": "metametameta.from_setup_py",
+    "generate_from_requirements_txt": "metametameta.from_requirements_txt",
+    "generate_from_conda_meta": "metametameta.from_conda_meta",
+}
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from metametameta.from_conda_meta import generate_from_conda_meta
+    from metametameta.from_importlib import generate_from_importlib
+    from metametameta.from_pep621 import generate_from_pep621
+    from metametameta.from_poetry import generate_from_poetry
+    from metametameta.from_requirements_txt import generate_from_requirements_txt
+    from metametameta.from_setup_cfg import generate_from_setup_cfg
+    from metametameta.from_setup_py import generate_from_setup_py
+
+
+def __getattr__(name: str) -> Any:
+    """Import a generator the first time it is accessed."""
+    module_name = _GENERATOR_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib  # pylint: disable=import-outside-toplevel
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the lazily imported generators along with the module's own names."""
+    return sorted({*globals(), *__all__})
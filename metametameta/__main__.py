@@ -5,10 +5,11 @@ Console interface for metametameta.
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import logging.config
 import sys
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from pathlib import Path
 from typing import Any
 
@@ -17,7 +18,12 @@ from rich_argparse import RichHelpFormatter
 
 from metametameta import __about__, logging_config
 from metametameta.autodetect import detect_source
-from metametameta.filesystem import PackageDirectoryNotFoundError, find_existing_package_dir
+from metametameta.filesystem import (
+    INVALIDATION_MODES,
+    PackageDirectoryNotFoundError,
+    compile_files,
+    find_existing_package_dir,
+)
 from metametameta.from_conda_meta import generate_from_conda_meta, read_conda_meta_metadata
 from metametameta.from_importlib import generate_from_importlib
 from metametameta.from_pep621 import generate_from_pep621, read_pep621_metadata
@@ -25,6 +31,10 @@ from metametameta.from_poetry import generate_from_poetry, read_poetry_metadata
 from metametameta.from_requirements_txt import generate_from_requirements_txt, read_requirements_txt_metadata
 from metametameta.from_setup_cfg import generate_from_setup_cfg, read_setup_cfg_metadata
 from metametameta.from_setup_py import generate_from_setup_py, read_setup_py_metadata
+from metametameta.pipeline import DEFAULT_QUEUE_SIZE, index_conda_recipes, run_batch
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.query import main as query_main
+from metametameta.reports import build_report, job_record, merge_reports, parse_shard, report_passed, write_report
 from metametameta.utils.cli_suggestions import SmartParser
 from metametameta.validate_sync import check_sync
 
@@ -80,6 +90,20 @@ def process_args(args: argparse.Namespace) -> dict[str, Any]:
     return kwargs
 
 
+def compile_generated(args: argparse.Namespace, written: str) -> None:
+    """
+    Byte-compile what a generator wrote, if ``--compile`` was given.
+
+    Args:
+        args (argparse.Namespace): The arguments.
+        written (str): The generator's return value, one path or several joined with ", ".
+    """
+    if not getattr(args, "compile", False):
+        return
+    paths = [path for path in written.split(", ") if path.endswith(".py") and Path(path).is_file()]
+    compile_files(paths, args.invalidation_mode)
+
+
 def handle_importlib(args: argparse.Namespace) -> None:
     """
     Handle the importlib subcommand.
@@ -88,7 +112,7 @@ def handle_importlib(args: argparse.Namespace) -> None:
     """
     print("Generating metadata source from importlib")
     # Call the generator with only the arguments it needs.
-    generate_from_importlib(name=args.name, output=args.output)
+    compile_generated(args, generate_from_importlib(name=args.name, output=args.output, precompute=args.precompute))
 
 
 def handle_poetry(args: argparse.Namespace) -> None:
@@ -98,7 +122,9 @@ def handle_poetry(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from poetry section of pyproject.toml")
-    generate_from_poetry(name=args.name, source=args.source, output=args.output)
+    compile_generated(
+        args, generate_from_poetry(name=args.name, source=args.source, output=args.output, precompute=args.precompute)
+    )
 
 
 def handle_cfg(args: argparse.Namespace) -> None:
@@ -108,7 +134,10 @@ def handle_cfg(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from setup.cfg")
-    generate_from_setup_cfg(name=args.name, source=args.source, output=args.output)
+    compile_generated(
+        args,
+        generate_from_setup_cfg(name=args.name, source=args.source, output=args.output, precompute=args.precompute),
+    )
 
 
 def handle_pep621(args: argparse.Namespace) -> None:
@@ -118,7 +147,9 @@ def handle_pep621(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from project section of pyproject.toml")
-    generate_from_pep621(name=args.name, source=args.source, output=args.output)
+    compile_generated(
+        args, generate_from_pep621(name=args.name, source=args.source, output=args.output, precompute=args.precompute)
+    )
 
 
 def handle_setup_py(args: argparse.Namespace) -> None:
@@ -128,7 +159,16 @@ def handle_setup_py(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from setup.py using AST")
-    generate_from_setup_py(name=args.name, source=args.source, output=args.output)
+    compile_generated(
+        args,
+        generate_from_setup_py(
+            name=args.name,
+            source=args.source,
+            output=args.output,
+            execute=args.execute,
+            precompute=args.precompute,
+        ),
+    )
 
 
 def handle_requirements_txt(args: argparse.Namespace) -> None:
@@ -138,7 +178,16 @@ def handle_requirements_txt(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from requirements.txt")
-    generate_from_requirements_txt(name=args.name, source=args.source, output=args.output, validate=args.validate)
+    compile_generated(
+        args,
+        generate_from_requirements_txt(
+            name=args.name,
+            source=args.source,
+            output=args.output,
+            validate=args.validate,
+            precompute=args.precompute,
+        ),
+    )
 
 
 def handle_conda_meta(args: argparse.Namespace) -> None:
@@ -148,7 +197,16 @@ def handle_conda_meta(args: argparse.Namespace) -> None:
         args (argparse.Namespace): The arguments.
     """
     print("Generating metadata source from conda/meta.yaml")
-    generate_from_conda_meta(name=args.name, source=args.source, output=args.output, validate=args.validate)
+    compile_generated(
+        args,
+        generate_from_conda_meta(
+            name=args.name,
+            source=args.source,
+            output=args.output,
+            validate=args.validate,
+            precompute=args.precompute,
+        ),
+    )
 
 
 def handle_auto(args: argparse.Namespace) -> None:
@@ -159,7 +217,11 @@ def handle_auto(args: argparse.Namespace) -> None:
         source_type = detect_source(project_root)
         print(f"✅ Found single source: '{source_type}'")
 
-        generators = {
+        if args.check:
+            handle_auto_check(project_root, args.output, args.precompute)
+            return
+
+        generators: dict[str, Callable[..., str]] = {
             "pep621": generate_from_pep621,
             "poetry": generate_from_poetry,
             "setup_cfg": generate_from_setup_cfg,
@@ -171,11 +233,13 @@ def handle_auto(args: argparse.Namespace) -> None:
         generator_func = generators[source_type]
 
         # The file-based generators all share a compatible function signature
-        generator_func(
+        written = generator_func(
             name=args.name,
             output=args.output,
             validate=args.validate,
+            precompute=args.precompute,
         )
+        compile_generated(args, written)
         print(f"Successfully generated {args.output} from {source_type}.")
 
     except (FileNotFoundError, ValueError) as e:
@@ -184,6 +248,31 @@ def handle_auto(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def handle_auto_check(project_root: Path, output: str, precompute: bool = False) -> None:
+    """
+    Render the metadata file in memory and diff it against the file on disk, like ``black --check``.
+
+    Args:
+        project_root: The project's root directory.
+        output: The metadata file name or relative path.
+        precompute: Render with ``__version_info__`` and a tuple ``__dependencies__``, as ``--precompute`` writes it.
+    """
+    (job,) = run_batch(
+        project_root, output=output, workers=1, projects=[project_root], check=True, precompute=precompute
+    )
+    if job.status == "failed":
+        print(f"Check failed: {job.message}", file=sys.stderr)
+        _emit_status_glyph("❌", file=sys.stderr)
+        sys.exit(1)
+    if job.status == "would-change":
+        print(job.message, end="")
+        print(f"{job.about_path} would be changed.", file=sys.stderr)
+        _emit_status_glyph("❌", file=sys.stderr)
+        sys.exit(1)
+    print(f"{job.about_path} is up to date.")
+    _emit_status_glyph("✅")
+
+
 def handle_sync_check(args: argparse.Namespace) -> None:
     """Handle the sync-check subcommand."""
     print("Performing sync check...")
@@ -201,8 +290,8 @@ def handle_sync_check(args: argparse.Namespace) -> None:
             "conda_meta": read_conda_meta_metadata,
         }
 
-        # Read the source metadata
-        source_metadata = metadata_readers[source_type]()  # type: ignore[operator]
+        # Read the source metadata and normalize it once for the checks below
+        source_metadata = ProjectMetadata(metadata_readers[source_type]())  # type: ignore[operator]
         project_name = source_metadata.get("name")
         if not project_name:
             print("❌ Error: Could not determine project name from metadata source.", file=sys.stderr)
@@ -235,6 +324,112 @@ def handle_sync_check(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+def handle_batch(args: argparse.Namespace) -> None:
+    """Handle the batch subcommand: generate or sync-check every project under a root."""
+    root = Path(args.root).resolve()
+    if args.check:
+        action = "Checking"
+    elif args.sync_check:
+        action = "Sync-checking"
+    else:
+        action = "Generating metadata for"
+    print(f"{action} projects under {root}...")
+
+    processed = 0
+    failures = 0
+    records = []
+    for job in run_batch(
+        root,
+        output=args.output,
+        sync_check=args.sync_check,
+        workers=args.workers,
+        maxsize=args.queue_size,
+        shard=args.shard,
+        fsync=not args.no_fsync,
+        check=args.check,
+        execute_setup_py=args.execute_setup_py,
+        pin_dependencies=args.pin_dependencies,
+        compile_bytecode=args.compile,
+        invalidation_mode=args.invalidation_mode,
+        precompute=args.precompute,
+    ):
+        processed += 1
+        if args.report:
+            records.append(job_record(job, root))
+        if job.status == "would-change":
+            failures += 1
+            print(job.message, end="")
+            print(f"{job.root}: would-change {job.about_path}", file=sys.stderr)
+        elif job.failed:
+            failures += 1
+            print(f"{job.root}: {job.status}: {job.message}", file=sys.stderr)
+        else:
+            print(f"{job.root}: {job.status} {job.about_path}")
+
+    if args.report:
+        write_report(Path(args.report), build_report(records, args.shard))
+        print(f"Wrote report to {args.report}")
+    if not processed:
+        if args.shard:
+            # An empty slice is normal when there are more CI nodes than projects.
+            print(f"No projects fall in shard {args.shard[0]}/{args.shard[1]}.")
+            return
+        print(f"No projects found under {root}.", file=sys.stderr)
+        sys.exit(1)
+    print(f"{processed} project(s) processed, {failures} failed.")
+    if failures:
+        _emit_status_glyph("❌", file=sys.stderr)
+        sys.exit(1)
+    _emit_status_glyph("✅")
+
+
+def handle_query(args: argparse.Namespace) -> None:
+    """Handle the version and get subcommands; ``mmm`` answers these before loading this module."""
+    key = [args.key] if args.source == "get" else []
+    exit_code = query_main([args.source, *key, *args.paths])
+    if exit_code:
+        sys.exit(exit_code)
+
+
+def handle_conda_index(args: argparse.Namespace) -> None:
+    """Handle the conda-index subcommand: print the metadata of every conda recipe under a root as JSON lines."""
+    root = Path(args.root).resolve()
+    count = 0
+    for path, recipe in index_conda_recipes(root, workers=args.workers, maxsize=args.queue_size):
+        count += 1
+        record = {"recipe": path.relative_to(root).as_posix(), "package": recipe.package, "outputs": recipe.outputs}
+        print(json.dumps(record), flush=True)
+    if not count:
+        print(f"No conda recipes found under {root}.", file=sys.stderr)
+        sys.exit(1)
+
+
+def handle_merge_reports(args: argparse.Namespace) -> None:
+    """Handle the merge-reports subcommand: combine per-shard batch reports."""
+    try:
+        merged = merge_reports(Path(report) for report in args.reports)
+    except (OSError, ValueError, argparse.ArgumentTypeError) as e:
+        print(f"Could not merge reports: {e}", file=sys.stderr)
+        _emit_status_glyph("❌", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        write_report(Path(args.output), merged)
+        print(f"Wrote merged report to {args.output}")
+    for record in merged["results"]:
+        if record["failed"]:
+            print(f"{record['project']}: {record['status']}: {record['message']}", file=sys.stderr)
+    if merged["missing_shards"]:
+        missing = ", ".join(str(index) for index in merged["missing_shards"])
+        print(f"Missing reports for shard(s): {missing}", file=sys.stderr)
+    print(f"{len(merged['results'])} project(s) in {len(args.reports)} report(s), {merged['failed']} failed.")
+
+    if not report_passed(merged):
+        _emit_status_glyph("❌", file=sys.stderr)
+        sys.exit(1)
+    _emit_status_glyph("✅")
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """Parse arguments and run the CLI tool.
     Args:
@@ -267,6 +462,20 @@ def main(argv: Sequence[str] | None = None) -> int:
     gen_parser.add_argument(
         "--validate", action="store_true", help="Validate that source values exist in the generated file."
     )
+    gen_parser.add_argument(
+        "--compile", action="store_true", help="Byte-compile the generated file into __pycache__ after writing it"
+    )
+    gen_parser.add_argument(
+        "--invalidation-mode",
+        choices=sorted(INVALIDATION_MODES),
+        default=None,
+        help="How the compiled file is validated on import (unchecked-hash for reproducible builds)",
+    )
+    gen_parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help="Also emit __version_info__ and a tuple __dependencies__ so importers need not parse them",
+    )
 
     # Subparser: setup_cfg
     parser_setup_cfg = subparsers.add_parser("setup_cfg", help="Generate from setup.cfg", parents=[gen_parser])
@@ -304,6 +513,12 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser_setup_py.add_argument("--name", type=str, default="", help="Name of the project (from file if omitted)")
     parser_setup_py.add_argument("--source", type=str, default="setup.py", help="Path to setup.py")
     parser_setup_py.add_argument("--output", type=str, default="__about__.py", help="Output file")
+    parser_setup_py.add_argument(
+        "--execute",
+        action="store_true",
+        help="Execute setup.py when static parsing misses the name or version. This runs project code with your "
+        "permissions (files, network, environment); it is not sandboxed",
+    )
     parser_setup_py.set_defaults(func=handle_setup_py)
 
     parser_requirements = subparsers.add_parser(
@@ -330,6 +545,9 @@ def main(argv: Sequence[str] | None = None) -> int:
         "--name", type=str, default="", help="Name of the project (overrides name found in source file)"
     )
     parser_auto.add_argument("--output", type=str, default="__about__.py", help="Output file name")
+    parser_auto.add_argument(
+        "--check", action="store_true", help="Show a diff and exit non-zero if the file would change; never write"
+    )
     parser_auto.set_defaults(func=handle_auto)
 
     # Subparser: sync-check (New command)
@@ -339,6 +557,83 @@ def main(argv: Sequence[str] | None = None) -> int:
     parser_sync_check.add_argument("--output", type=str, default="__about__.py", help="The metadata file to check")
     parser_sync_check.set_defaults(func=handle_sync_check)
 
+    # Subparser: batch
+    parser_batch = subparsers.add_parser(
+        "batch", help="Generate or sync-check metadata files for every project under a directory"
+    )
+    parser_batch.add_argument("root", nargs="?", default=".", help="Directory to search for projects")
+    parser_batch.add_argument("--output", type=str, default="__about__.py", help="Output file name")
+    batch_mode = parser_batch.add_mutually_exclusive_group()
+    batch_mode.add_argument("--sync-check", action="store_true", help="Check existing files instead of writing them")
+    batch_mode.add_argument(
+        "--check", action="store_true", help="Diff rendered output against existing files instead of writing them"
+    )
+    parser_batch.add_argument("--workers", type=int, default=4, help="Worker threads per pipeline stage")
+    parser_batch.add_argument(
+        "--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Capacity of each queue between stages"
+    )
+    parser_batch.add_argument(
+        "--shard", type=parse_shard, default=None, help="Only process slice i of N (1-based), e.g. --shard 3/16"
+    )
+    parser_batch.add_argument(
+        "--no-fsync", action="store_true", help="Skip the final flush of written files to disk (faster, less durable)"
+    )
+    parser_batch.add_argument("--report", type=str, default="", help="Write a JSON report of the results")
+    parser_batch.add_argument(
+        "--execute-setup-py",
+        action="store_true",
+        help="Execute setup.py files when static parsing misses the name or version. This runs project code with "
+        "your permissions (files, network, environment); it is not sandboxed",
+    )
+    parser_batch.add_argument(
+        "--pin-dependencies",
+        action="store_true",
+        help="List locked versions from uv.lock, poetry.lock or pdm.lock in __dependencies__",
+    )
+    parser_batch.add_argument(
+        "--precompute",
+        action="store_true",
+        help="Also emit __version_info__ and a tuple __dependencies__ so importers need not parse them",
+    )
+    parser_batch.add_argument(
+        "--compile", action="store_true", help="Byte-compile every written file on the worker pool once all are done"
+    )
+    parser_batch.add_argument(
+        "--invalidation-mode",
+        choices=sorted(INVALIDATION_MODES),
+        default=None,
+        help="How compiled files are validated on import (unchecked-hash for reproducible builds)",
+    )
+    parser_batch.set_defaults(func=handle_batch)
+
+    # Subparser: merge-reports
+    parser_merge = subparsers.add_parser(
+        "merge-reports", help="Merge per-shard batch reports into one report and exit code"
+    )
+    parser_merge.add_argument("reports", nargs="+", help="Report files written by batch --report")
+    parser_merge.add_argument("--output", type=str, default="", help="Write the merged report to this file")
+    parser_merge.set_defaults(func=handle_merge_reports)
+
+    # Subparser: conda-index
+    parser_conda_index = subparsers.add_parser(
+        "conda-index", help="Print the metadata of every conda recipe under a directory, one JSON line each"
+    )
+    parser_conda_index.add_argument("root", nargs="?", default=".", help="Directory of feedstocks to search")
+    parser_conda_index.add_argument("--workers", type=int, default=4, help="Worker threads reading recipes")
+    parser_conda_index.add_argument(
+        "--queue-size", type=int, default=DEFAULT_QUEUE_SIZE, help="Capacity of the reader's queues"
+    )
+    parser_conda_index.set_defaults(func=handle_conda_index)
+
+    # Subparsers: version and get (fast single-field queries)
+    parser_version = subparsers.add_parser("version", help="Print the version of each project, one per line")
+    parser_version.add_argument("paths", nargs="*", help="Project directories, pyproject.toml or __about__.py files")
+    parser_version.set_defaults(func=handle_query)
+    parser_get = subparsers.add_parser("get", help="Print one metadata field of each project, one per line")
+    parser_get.add_argument("key", help="A [project] key, e.g. version, requires-python or description")
+    parser_get.add_argument("paths", nargs="*", help="Project directories, pyproject.toml or __about__.py files")
+    parser_get.set_defaults(func=handle_query)
+
     # Subparser: gui
     parser_gui = subparsers.add_parser("gui", help="Launch the graphical interface")
     parser_gui.set_defaults(func=None, gui_requested=True)
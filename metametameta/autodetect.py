@@ -7,25 +7,66 @@ Autodetects the primary source of project metadata.
 from __future__ import annotations
 
 import logging
+import os
 from pathlib import Path
+from typing import Any, NamedTuple
 
 import toml
 
+from metametameta.toml_sections import load_toml_table
+
 logger = logging.getLogger(__name__)
 
+# Keys that make conda/meta.yaml a usable recipe.
+_CONDA_META_MARKERS = ("package:", "about:")
 
-def detect_source(project_root: Path | None = None) -> str:
+
+class SourceDetection(NamedTuple):
+    """
+    The outcome of autodetection, carrying what was learned so readers need not repeat it.
+
+    Attributes:
+        source: The name of the source (e.g., 'pep621', 'poetry', 'setup_cfg').
+        path: The file the metadata should be read from.
+        table: For pyproject.toml sources, the already parsed ``[project]`` or
+            ``[tool.poetry]`` table; None for other sources.
+    """
+
+    source: str
+    path: Path
+    table: dict[str, Any] | None = None
+
+
+def _has_requirement_line(path: Path) -> bool:
+    """Return True at the first line of a requirements file that is neither blank nor a comment."""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            stripped = line.strip()
+            if stripped and not stripped.startswith("#"):
+                return True
+    return False
+
+
+def _has_conda_section(path: Path) -> bool:
+    """Return True at the first line of a conda recipe that holds a ``package:`` or ``about:`` key."""
+    with open(path, encoding="utf-8") as file:
+        return any(marker in line for line in file for marker in _CONDA_META_MARKERS)
+
+
+def detect(project_root: Path | None = None) -> SourceDetection:
     """
     Autodetects the single viable metadata source in a project.
 
-    It checks for the presence and content of standard Python packaging files
-    in a specific order of preference.
+    The project root is listed once with ``os.scandir``. pyproject.toml is read
+    once and only its ``[project]`` and ``[tool.poetry]`` tables are parsed;
+    requirements.txt and conda/meta.yaml are read only until the first line
+    that settles the question.
 
     Args:
         project_root: The path to the project's root directory. Defaults to CWD.
 
     Returns:
-        The name of the single viable source (e.g., 'pep621', 'poetry', 'setup_cfg').
+        The detection result for the single viable source.
 
     Raises:
         FileNotFoundError: If no viable metadata source can be found.
@@ -35,50 +76,55 @@ def detect_source(project_root: Path | None = None) -> str:
         project_root = Path.cwd()
 
     logger.debug(f"Autodetecting metadata source in {project_root}")
-    primary_sources = []
-    fallback_sources = []
+    with os.scandir(project_root) as entries:
+        files = set()
+        dirs = set()
+        for entry in entries:
+            if entry.is_file():
+                files.add(entry.name)
+            elif entry.is_dir():
+                dirs.add(entry.name)
+
+    primary_sources: list[SourceDetection] = []
+    fallback_sources: list[SourceDetection] = []
 
     # Check pyproject.toml for PEP 621 or Poetry (highest priority)
-    pyproject_path = project_root / "pyproject.toml"
-    if pyproject_path.is_file():
+    if "pyproject.toml" in files:
+        pyproject_path = project_root / "pyproject.toml"
         try:
-            data = toml.load(pyproject_path)
-            if "project" in data:
+            text = pyproject_path.read_text(encoding="utf-8")
+            project_table = load_toml_table(text, "project")
+            poetry_table = load_toml_table(text, "tool.poetry")
+            if project_table is not None:
                 logger.debug("Found [project] section in pyproject.toml (PEP 621)")
-                primary_sources.append("pep621")
-            if data.get("tool", {}).get("poetry"):
+                primary_sources.append(SourceDetection("pep621", pyproject_path, project_table))
+            if poetry_table:
                 logger.debug("Found [tool.poetry] section in pyproject.toml")
-                primary_sources.append("poetry")
+                primary_sources.append(SourceDetection("poetry", pyproject_path, poetry_table))
         except toml.TomlDecodeError:
             logger.warning("Could not parse pyproject.toml, skipping.")
 
     # Check for setup.cfg
-    if (project_root / "setup.cfg").is_file():
+    if "setup.cfg" in files:
         logger.debug("Found setup.cfg")
-        primary_sources.append("setup_cfg")
+        primary_sources.append(SourceDetection("setup_cfg", project_root / "setup.cfg"))
 
     # Check for setup.py (lowest priority)
-    if (project_root / "setup.py").is_file():
+    if "setup.py" in files:
         logger.debug("Found setup.py")
-        primary_sources.append("setup_py")
-
-    requirements_path = project_root / "requirements.txt"
-    if requirements_path.is_file():
-        requirements_lines = [
-            line.strip()
-            for line in requirements_path.read_text(encoding="utf-8").splitlines()
-            if line.strip() and not line.strip().startswith("#")
-        ]
-        if requirements_lines:
+        primary_sources.append(SourceDetection("setup_py", project_root / "setup.py"))
+
+    # Fallbacks are only worth reading when there is no primary source.
+    if not primary_sources:
+        requirements_path = project_root / "requirements.txt"
+        if "requirements.txt" in files and _has_requirement_line(requirements_path):
             logger.debug("Found populated requirements.txt")
-            fallback_sources.append("requirements_txt")
+            fallback_sources.append(SourceDetection("requirements_txt", requirements_path))
 
-    conda_meta_path = project_root / "conda" / "meta.yaml"
-    if conda_meta_path.is_file():
-        conda_text = conda_meta_path.read_text(encoding="utf-8")
-        if "package:" in conda_text or "about:" in conda_text:
+        conda_meta_path = project_root / "conda" / "meta.yaml"
+        if "conda" in dirs and conda_meta_path.is_file() and _has_conda_section(conda_meta_path):
             logger.debug("Found conda/meta.yaml")
-            fallback_sources.append("conda_meta")
+            fallback_sources.append(SourceDetection("conda_meta", conda_meta_path))
 
     viable_sources = primary_sources or fallback_sources
 
@@ -89,9 +135,29 @@ def detect_source(project_root: Path | None = None) -> str:
 
     if len(viable_sources) > 1:
         raise ValueError(
-            f"Multiple viable metadata sources found: {', '.join(viable_sources)}. Cannot determine which to use for sync check. Please specify one."
+            f"Multiple viable metadata sources found: {', '.join(detection.source for detection in viable_sources)}. Cannot determine which to use for sync check. Please specify one."
         )
 
-    source = viable_sources[0]
-    logger.info(f"Autodetected '{source}' as the metadata source.")
-    return source
+    detection = viable_sources[0]
+    logger.info(f"Autodetected '{detection.source}' as the metadata source.")
+    return detection
+
+
+def detect_source(project_root: Path | None = None) -> str:
+    """
+    Autodetects the single viable metadata source in a project.
+
+    It checks for the presence and content of standard Python packaging files
+    in a specific order of preference.
+
+    Args:
+        project_root: The path to the project's root directory. Defaults to CWD.
+
+    Returns:
+        The name of the single viable source (e.g., 'pep621', 'poetry', 'setup_cfg').
+
+    Raises:
+        FileNotFoundError: If no viable metadata source can be found.
+        ValueError: If multiple viable metadata sources are found, causing ambiguity.
+    """
+    return detect(project_root).source
@@ -0,0 +1,41 @@
+"""
+Console entry point for ``mmm`` and ``metametameta``.
+
+Metadata queries (``mmm version``, ``mmm get``) are answered by
+:mod:`metametameta.query` without importing the full CLI, whose argument parser
+and readers take far longer to load than the query takes to run. Every other
+command is handed to :func:`metametameta.__main__.main`.
+"""
+
+from __future__ import annotations
+
+import sys
+
+from metametameta.query import QUERY_COMMANDS
+from metametameta.query import main as query_main
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Run the command line.
+
+    Args:
+        argv: The arguments, defaulting to ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit code.
+    """
+    arguments = sys.argv[1:] if argv is None else list(argv)
+    if arguments and arguments[0] in QUERY_COMMANDS:
+        return query_main(arguments)
+    from metametameta.__main__ import main as cli_main  # pylint: disable=import-outside-toplevel
+
+    return cli_main(arguments)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
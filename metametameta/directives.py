@@ -0,0 +1,311 @@
+"""
+Resolve setuptools-style ``attr:`` and ``file:`` directives without importing anything.
+
+setuptools resolves ``version = attr: mypkg.__version__`` by importing the
+package when the value is not a plain literal. Here the module file is located
+on disk and its top-level assignments are read with ``ast`` only, following
+``from x import name`` re-exports and simple name aliases. Parsed modules and
+read files are cached per file signature (path, mtime, size), so a file edited
+between runs is re-read while repeated lookups in one run cost nothing.
+"""
+
+from __future__ import annotations
+
+import ast
+import logging
+import os
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple, Union
+
+logger = logging.getLogger(__name__)
+
+# How many re-exports or aliases are followed before giving up (guards against cycles).
+MAX_RESOLUTION_DEPTH = 8
+
+# A top-level binding: either the assigned expression, or (module, level, name) for an import.
+_Binding = Union[ast.expr, tuple[str, int, str]]
+
+
+class DirectiveError(ValueError):
+    """Raised when a directive cannot be resolved statically."""
+
+
+class _ModuleBindings(NamedTuple):
+    """The top-level names a module binds, and the modules it star-imports."""
+
+    names: dict[str, _Binding]
+    star_imports: list[tuple[str, int]]
+
+
+def file_signature(path: Path) -> tuple[str, int, int]:
+    """Return the cache key for a file's current contents: its resolved path, mtime and size."""
+    stat = os.stat(path)
+    return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=256)
+def _module_bindings(path: str, mtime_ns: int, size: int) -> _ModuleBindings:  # pylint: disable=unused-argument
+    """Parse a module once per signature and index its top-level bindings, later ones winning."""
+    with open(path, "rb") as file:
+        tree = ast.parse(file.read(), filename=path)
+    names: dict[str, _Binding] = {}
+    star_imports: list[tuple[str, int]] = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    names[target.id] = node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            names[node.target.id] = node.value
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    star_imports.append((node.module or "", node.level))
+                else:
+                    names[alias.asname or alias.name] = (node.module or "", node.level, alias.name)
+    return _ModuleBindings(names, star_imports)
+
+
+@lru_cache(maxsize=256)
+def _read_text(path: str, mtime_ns: int, size: int) -> str:  # pylint: disable=unused-argument
+    """Read a file once per signature."""
+    with open(path, encoding="utf-8") as file:
+        return file.read()
+
+
+def _module_candidates(base: Path, parts: list[str]) -> list[Path]:
+    """Return the files a dotted module path may live in under ``base``."""
+    target = base.joinpath(*parts)
+    if not parts:
+        return [target / "__init__.py"]
+    return [target.with_name(f"{target.name}.py"), target / "__init__.py"]
+
+
+def find_module_file(module: str, root: Path, package_dir: Mapping[str, str] | None = None) -> Path | None:
+    """
+    Locate the source file of a module the way setuptools maps packages to directories.
+
+    Args:
+        module: Dotted module name, e.g. ``"mypkg.version"``.
+        root: The project root directory.
+        package_dir: setuptools ``package_dir`` mapping; ``""`` maps the root package directory.
+
+    Returns:
+        The module's ``.py`` or ``__init__.py`` file, or None if there is none.
+    """
+    package_dir = package_dir or {}
+    parts = module.split(".") if module else []
+    bases: list[tuple[Path, list[str]]] = []
+    for length in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:length])
+        if prefix in package_dir:
+            bases.append((root / package_dir[prefix], parts[length:]))
+            break
+    bases.append((root / package_dir.get("", ""), parts))
+    # Unconfigured src layouts are common enough to try as a last resort.
+    bases.append((root / "src", parts))
+    for base, rest in bases:
+        for candidate in _module_candidates(base, rest):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def _relative_module_file(module_file: Path, module: str, level: int) -> Path | None:
+    """Locate the target of a relative import made from ``module_file``."""
+    base = module_file.parent
+    for _ in range(level - 1):
+        base = base.parent
+    for candidate in _module_candidates(base, module.split(".") if module else []):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def read_static_attribute(
+    module_file: Path,
+    name: str,
+    root: Path | None = None,
+    package_dir: Mapping[str, str] | None = None,
+    depth: int = 0,
+) -> Any:
+    """
+    Read a module-level literal from a source file without importing it.
+
+    Follows ``NAME = OTHER_NAME`` aliases and ``from x import NAME`` re-exports
+    (relative ones, and absolute ones that resolve inside the project).
+
+    Args:
+        module_file: The module's source file.
+        name: The attribute to read.
+        root: The project root, used to find absolutely imported modules.
+        package_dir: setuptools ``package_dir`` mapping.
+        depth: Current re-export depth (internal).
+
+    Returns:
+        The attribute's literal value.
+
+    Raises:
+        DirectiveError: If the attribute is missing or not a static literal.
+    """
+    if depth > MAX_RESOLUTION_DEPTH:
+        raise DirectiveError(f"Too many re-exports while resolving {name!r} from {module_file}.")
+    try:
+        bindings = _module_bindings(*file_signature(module_file))
+    except (OSError, SyntaxError, ValueError) as e:
+        raise DirectiveError(f"Could not parse {module_file}: {e}") from e
+
+    binding = bindings.names.get(name)
+    if binding is None:
+        for module, level in reversed(bindings.star_imports):
+            source_file = _import_target(module_file, module, level, root, package_dir)
+            if source_file is None:
+                continue
+            try:
+                return read_static_attribute(source_file, name, root, package_dir, depth + 1)
+            except DirectiveError:
+                continue
+        raise DirectiveError(f"{name!r} is not assigned at module level in {module_file}.")
+
+    if isinstance(binding, tuple):
+        module, level, imported_name = binding
+        source_file = _import_target(module_file, module, level, root, package_dir)
+        if source_file is None:
+            raise DirectiveError(f"Could not find module {'.' * level}{module} imported by {module_file}.")
+        return read_static_attribute(source_file, imported_name, root, package_dir, depth + 1)
+    if isinstance(binding, ast.Name):
+        return read_static_attribute(module_file, binding.id, root, package_dir, depth + 1)
+    try:
+        return ast.literal_eval(binding)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as e:
+        raise DirectiveError(f"{name!r} in {module_file} is not a static literal.") from e
+
+
+def _import_target(
+    module_file: Path, module: str, level: int, root: Path | None, package_dir: Mapping[str, str] | None
+) -> Path | None:
+    """Locate the file an import statement in ``module_file`` refers to."""
+    if level:
+        return _relative_module_file(module_file, module, level)
+    if root is None:
+        return None
+    return find_module_file(module, root, package_dir)
+
+
+def resolve_attr(spec: str, root: Path, package_dir: Mapping[str, str] | None = None) -> Any:
+    """
+    Resolve the target of an ``attr:`` directive.
+
+    Args:
+        spec: The dotted attribute path after ``attr:``, e.g. ``"mypkg.__version__"``.
+        root: The project root directory.
+        package_dir: setuptools ``package_dir`` mapping.
+
+    Returns:
+        The attribute's literal value.
+
+    Raises:
+        DirectiveError: If the module cannot be found or the value is not a static literal.
+    """
+    module, _, name = spec.strip().rpartition(".")
+    if not name:
+        raise DirectiveError(f"Invalid attr: directive {spec!r}.")
+    module_file = find_module_file(module or "__init__", root, package_dir)
+    if module_file is None:
+        raise DirectiveError(f"Could not find module {module!r} for attr: {spec.strip()}.")
+    return read_static_attribute(module_file, name, root, package_dir)
+
+
+def resolve_file(spec: str, root: Path) -> str:
+    """
+    Resolve the target of a ``file:`` directive: the named files' contents, joined by newlines.
+
+    Args:
+        spec: The comma-separated file list after ``file:``.
+        root: The project root directory; files must lie inside it.
+
+    Returns:
+        The concatenated file contents.
+
+    Raises:
+        DirectiveError: If a file is missing or lies outside the project.
+    """
+    contents = []
+    for raw_path in spec.split(","):
+        relative = raw_path.strip()
+        if relative:
+            contents.append(read_project_file(root / relative, root))
+    return "\n".join(contents)
+
+
+def read_project_file(path: Path | str, root: Path) -> str:
+    """
+    Read a text file that must lie inside the project, cached per file signature.
+
+    Args:
+        path: The file to read.
+        root: The project root directory.
+
+    Returns:
+        The file's contents.
+
+    Raises:
+        DirectiveError: If the file is missing, unreadable, or outside the project.
+    """
+    real_root = os.path.realpath(root)
+    try:
+        signature = file_signature(Path(path))
+    except OSError as e:
+        raise DirectiveError(f"Could not read {path}: {e}") from e
+    if os.path.commonpath([real_root, signature[0]]) != real_root:
+        raise DirectiveError(f"{str(path)!r} points outside the project.")
+    try:
+        return _read_text(*signature)
+    except (OSError, UnicodeDecodeError) as e:
+        raise DirectiveError(f"Could not read {path}: {e}") from e
+
+
+def resolve_directive(value: Any, root: Path, package_dir: Mapping[str, str] | None = None) -> Any:
+    """
+    Resolve a setup.cfg value if it is an ``attr:`` or ``file:`` directive.
+
+    Args:
+        value: The raw configuration value.
+        root: The project root directory.
+        package_dir: setuptools ``package_dir`` mapping.
+
+    Returns:
+        The resolved value, or ``value`` unchanged if it is not a directive.
+
+    Raises:
+        DirectiveError: If the directive cannot be resolved statically.
+    """
+    if not isinstance(value, str):
+        return value
+    stripped = value.strip()
+    if stripped.startswith("attr:"):
+        return resolve_attr(stripped[len("attr:") :], root, package_dir)
+    if stripped.startswith("file:"):
+        return resolve_file(stripped[len("file:") :], root)
+    return value
+
+
+def parse_package_dir(value: str) -> dict[str, str]:
+    """
+    Parse a setup.cfg ``package_dir`` option (``=src`` or ``name = path`` lines).
+
+    Args:
+        value: The raw option value.
+
+    Returns:
+        The package-to-directory mapping.
+    """
+    mapping = {}
+    for line in value.replace(",", "\n").splitlines():
+        if "=" not in line:
+            continue
+        package, _, directory = line.partition("=")
+        mapping[package.strip()] = directory.strip()
+    return mapping
@@ -0,0 +1,189 @@
+"""
+Resolve a PEP 621 ``dynamic = ["version"]`` without running the build backend.
+
+Asking a backend for ``prepare_metadata_for_build_wheel`` costs an isolated
+environment and seconds per project. The common backends only ever read the
+version from a file, so their configuration is interpreted here instead:
+
+* hatchling: ``[tool.hatch.version] path`` (and optional ``pattern``)
+* setuptools: ``[tool.setuptools.dynamic] version = {attr = ...}`` or ``{file = ...}``
+* pdm: ``[tool.pdm.version] source = "file"`` (and the older ``version = {from = ...}``)
+* flit: the module's ``__version__``
+* VCS sources (hatch-vcs, pdm ``source = "scm"``, setuptools-scm): computed from
+  ``.git`` by :mod:`metametameta.vcs`, without running git
+
+Version files are read through :mod:`metametameta.directives`, which caches
+them per file signature.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from metametameta.directives import (
+    DirectiveError,
+    find_module_file,
+    read_project_file,
+    read_static_attribute,
+    resolve_attr,
+    resolve_file,
+)
+from metametameta.toml_sections import load_toml_table
+from metametameta.vcs import describe_version
+
+logger = logging.getLogger(__name__)
+
+# hatchling's default version pattern.
+DEFAULT_VERSION_PATTERN = r"(?i)^(__version__|VERSION) *= *([\'\"])v?(?P<version>.+?)\2"
+
+# Build backend module -> the tool that configures its version source.
+BACKEND_TOOLS = {
+    "hatchling.build": "hatch",
+    "setuptools.build_meta": "setuptools",
+    "setuptools.build_meta:__legacy__": "setuptools",
+    "pdm.backend": "pdm",
+    "pdm.pep517.api": "pdm",
+    "flit_core.buildapi": "flit",
+}
+
+
+def read_version_file(path: Path, root: Path, pattern: str = DEFAULT_VERSION_PATTERN) -> str:
+    """
+    Read a version string from a file with a regular expression.
+
+    Args:
+        path: The file holding the version.
+        root: The project root; the file must lie inside it.
+        pattern: A regex with a ``version`` group (or a single group).
+
+    Returns:
+        The version.
+
+    Raises:
+        DirectiveError: If the file cannot be read or the pattern does not match.
+    """
+    match = re.search(pattern, read_project_file(path, root), re.MULTILINE)
+    if match is None:
+        raise DirectiveError(f"No version found in {path}.")
+    return match.group("version") if "version" in match.re.groupindex else match.group(1)
+
+
+def _hatch_version(  # pylint: disable=unused-argument
+    tables: Callable[[str], dict[str, Any]], root: Path, project: Mapping[str, Any]
+) -> str | None:
+    config = tables("tool.hatch.version")
+    if config.get("source") == "vcs":
+        return describe_version(root)
+    if config.get("source", "regex") != "regex" or "path" not in config:
+        return None
+    return read_version_file(root / config["path"], root, config.get("pattern") or DEFAULT_VERSION_PATTERN)
+
+
+def _setuptools_version(  # pylint: disable=unused-argument
+    tables: Callable[[str], dict[str, Any]], root: Path, project: Mapping[str, Any]
+) -> str | None:
+    spec = tables("tool.setuptools.dynamic").get("version")
+    if not isinstance(spec, dict):
+        requires = " ".join(map(str, tables("build-system").get("requires", [])))
+        if "setuptools_scm" in requires or "setuptools-scm" in requires or tables("tool.setuptools_scm"):
+            return describe_version(root)
+        return None
+    if "attr" in spec:
+        package_dir = tables("tool.setuptools").get("package-dir") or {}
+        return str(resolve_attr(spec["attr"], root, package_dir))
+    if "file" in spec:
+        files = spec["file"] if isinstance(spec["file"], list) else [spec["file"]]
+        return resolve_file(",".join(files), root).strip()
+    return None
+
+
+def _pdm_version(  # pylint: disable=unused-argument
+    tables: Callable[[str], dict[str, Any]], root: Path, project: Mapping[str, Any]
+) -> str | None:
+    config = tables("tool.pdm.version")
+    if config.get("source") == "scm":
+        return describe_version(root)
+    if config.get("source") == "file" and "path" in config:
+        return read_version_file(root / config["path"], root)
+    legacy = tables("tool.pdm").get("version")
+    if isinstance(legacy, dict) and "from" in legacy:
+        return read_version_file(root / legacy["from"], root)
+    return None
+
+
+def _flit_version(tables: Callable[[str], dict[str, Any]], root: Path, project: Mapping[str, Any]) -> str | None:
+    module = tables("tool.flit.module").get("name") or str(project.get("name", "")).replace("-", "_")
+    module_file = find_module_file(module, root) if module else None
+    if module_file is None:
+        return None
+    return str(read_static_attribute(module_file, "__version__", root))
+
+
+RESOLVERS: dict[str, Callable[[Callable[[str], dict[str, Any]], Path, Mapping[str, Any]], str | None]] = {
+    "hatch": _hatch_version,
+    "setuptools": _setuptools_version,
+    "pdm": _pdm_version,
+    "flit": _flit_version,
+}
+
+
+def resolve_dynamic_version(pyproject_path: Path, project: Mapping[str, Any]) -> str | None:
+    """
+    Resolve a dynamic version from the build backend's configuration.
+
+    The backend named in ``[build-system]`` decides which configuration is read;
+    without one, every known backend's configuration is tried in turn.
+
+    Args:
+        pyproject_path: The project's pyproject.toml.
+        project: The parsed ``[project]`` table.
+
+    Returns:
+        The version, or None if it cannot be determined statically.
+    """
+    root = pyproject_path.parent
+    try:
+        text = read_project_file(pyproject_path, root)
+    except DirectiveError as e:
+        logger.warning(f"Could not resolve dynamic version: {e}")
+        return None
+
+    def tables(name: str) -> dict[str, Any]:
+        return load_toml_table(text, name) or {}
+
+    tool = BACKEND_TOOLS.get(str(tables("build-system").get("build-backend", "")))
+    for name, resolver in RESOLVERS.items():
+        if tool is not None and name != tool:
+            continue
+        try:
+            version = resolver(tables, root, project)
+        except DirectiveError as e:
+            logger.warning(f"Could not resolve dynamic version from [tool.{name}] in {pyproject_path}: {e}")
+            continue
+        if version:
+            return version
+    logger.debug(f"No static version source found in {pyproject_path}")
+    return None
+
+
+def apply_dynamic_version(project: dict[str, Any], pyproject_path: Path) -> dict[str, Any]:
+    """
+    Fill in ``version`` when the ``[project]`` table declares it dynamic.
+
+    Args:
+        project: The parsed ``[project]`` table.
+        pyproject_path: The pyproject.toml it came from.
+
+    Returns:
+        The table, with ``version`` added if it could be resolved.
+    """
+    if "version" in project or "version" not in project.get("dynamic", []):
+        return project
+    version = resolve_dynamic_version(pyproject_path, project)
+    if version is None:
+        return project
+    return {**project, "version": version}
@@ -0,0 +1,194 @@
+"""
+Extract dunder metadata assignments from Python source without importing it.
+
+This is the single scanner behind ``find``, ``find_it`` and ``validate_sync``.
+It works on bytes (or an mmap of a file) with two precompiled patterns: one that
+hops from assignment head to assignment head while stepping over strings and
+comments, and one that tokenizes just the value expression that follows so it
+can be handed to ``ast.literal_eval``.
+"""
+
+from __future__ import annotations
+
+import ast
+import logging
+import mmap
+import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+# Files at least this large are scanned through an mmap instead of a read().
+MMAP_THRESHOLD = 64 * 1024
+
+# Dunder names that describe the module itself rather than the project.
+NON_METADATA_NAMES = frozenset({"__all__"})
+
+# Finds the next `__name__ = ` / `__name__: annotation = ` at the start of a line or after a `;`.
+# Strings and comments are matched (and ignored) first so assignment-looking text
+# inside a docstring or a comment is never mistaken for a head.
+_HEAD_SCANNER = re.compile(
+    rb"""
+    (?P<skip>
+        \"\"\"(?:\\.|[^\\])*?\"\"\"
+      | '''(?:\\.|[^\\])*?'''
+      | "(?:\\.|[^"\\\n])*"
+      | '(?:\\.|[^'\\\n])*'
+      | \#[^\n]*
+    )
+    | (?:^|;)[ \t]*(?P<name>__\w+__)[ \t]*(?::[^=\n]*)?=(?!=)[ \t]*
+    """,
+    re.MULTILINE | re.VERBOSE,
+)
+
+# Another target of a chained assignment, as in `__title__ = __name__ = "demo"`.
+_CHAINED_TARGET = re.compile(rb"(?P<name>[A-Za-z_]\w*)[ \t]*=(?!=)[ \t]*")
+
+# Tokenizes a value expression until the end of its logical line.
+_VALUE_TOKEN = re.compile(
+    rb"""
+    (?P<string>
+        [rRbBuU]{0,2}
+        (?:\"\"\"(?:\\.|[^\\])*?\"\"\"
+          | '''(?:\\.|[^\\])*?'''
+          | "(?:\\.|[^"\\\n])*"
+          | '(?:\\.|[^'\\\n])*'
+        )
+    )
+    | (?P<open>[\[({])
+    | (?P<close>[\])}])
+    | (?P<end>\#[^\n]*|;|\r?\n)
+    | (?P<other>\\\r?\n|[^\s\[\](){}"'\#;\\]+|[ \t\f]+|\\)
+    """,
+    re.VERBOSE,
+)
+
+
+def _value_end(data: Buffer, pos: int) -> int | None:
+    """Return the offset where the value starting at ``pos`` ends, or None if it is unterminated."""
+    depth = 0
+    size = len(data)
+    while pos < size:
+        token = _VALUE_TOKEN.match(data, pos)
+        if token is None:
+            return None
+        kind = token.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif kind == "end" and depth == 0:
+            return pos
+        pos = token.end()
+    return pos if depth == 0 else None
+
+
+def extract_metadata(source: str | Buffer) -> dict[str, Any]:
+    """
+    Extract literal dunder assignments from Python source.
+
+    Values may be any literal ``ast.literal_eval`` accepts (strings, numbers,
+    lists, tuples, dicts, ...). Chained assignments (``__a__ = __b__ = "x"``)
+    give every dunder target the value, and statements joined by ``;`` are read
+    one by one. Assignments whose value is not a literal are skipped, and
+    scanning stops quietly at the first unterminated value.
+
+    Args:
+        source: Source text, raw bytes, or an mmap of a source file.
+
+    Returns:
+        A dictionary keyed by the full dunder name, e.g. ``"__version__"``.
+    """
+    data = source.encode("utf-8") if isinstance(source, str) else source
+    metadata: dict[str, Any] = {}
+    pos = 0
+    while True:
+        head = _HEAD_SCANNER.search(data, pos)
+        if head is None:
+            break
+        pos = head.end()
+        if head.lastgroup == "skip":
+            continue
+        names = [head.group("name")]
+        target = _CHAINED_TARGET.match(data, pos)
+        while target is not None:
+            names.append(target.group("name"))
+            pos = target.end()
+            target = _CHAINED_TARGET.match(data, pos)
+        end = _value_end(data, pos)
+        if end is None:
+            break
+        expression = bytes(data[pos:end]).decode("utf-8", errors="replace").strip()
+        pos = end
+        try:
+            value = ast.literal_eval(expression)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            logger.debug(f"Skipping non-literal assignment for {names[0].decode('ascii', errors='replace')}")
+            continue
+        for name in names:
+            if name.startswith(b"__") and name.endswith(b"__") and len(name) > 4:
+                metadata[name.decode("ascii", errors="replace")] = value
+    return metadata
+
+
+def extract_file(file_path: Path | str) -> dict[str, Any]:
+    """
+    Extract literal dunder assignments from a Python file.
+
+    Large files are scanned through a read-only mmap, so only the value
+    expressions are ever copied out of the page cache.
+
+    Args:
+        file_path: Path to the Python file.
+
+    Returns:
+        A dictionary keyed by the full dunder name, e.g. ``"__version__"``.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return {}
+        if size < MMAP_THRESHOLD:
+            return extract_metadata(file.read())
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return extract_metadata(mapped)
+
+
+def extract_many(paths: Iterable[Path | str], workers: int | None = None) -> dict[Path, dict[str, Any]]:
+    """
+    Extract metadata from many files on a thread pool.
+
+    Unreadable files are logged and reported with an empty result.
+
+    Args:
+        paths: Files to scan.
+        workers: Number of threads. Defaults to the executor default.
+
+    Returns:
+        A dictionary mapping each path to its extracted metadata, in input order.
+    """
+    path_list = [Path(path) for path in paths]
+
+    def extract_or_empty(path: Path) -> dict[str, Any]:
+        try:
+            return extract_file(path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Skipping unreadable file {path}: {e}")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {path: executor.submit(extract_or_empty, path) for path in path_list}
+        return {path: future.result() for path, future in futures.items()}
+
+
+def strip_dunders(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Re-key extracted metadata from ``__version__`` style names to ``version``, dropping ``__all__``."""
+    return {key[2:-2]: value for key, value in metadata.items() if key not in NON_METADATA_NAMES}
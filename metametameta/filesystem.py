@@ -7,11 +7,38 @@ locating the correct Python package directory within a given project root.
 
 from __future__ import annotations
 
+import difflib
+import hashlib
+import importlib.util
 import logging
+import os
+import py_compile
+import sys
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
 logger = logging.getLogger(__name__)
 
+# One in-process lock per target directory, for threads of the batch pipeline.
+_DIRECTORY_LOCKS: dict[str, threading.Lock] = {}
+_DIRECTORY_LOCKS_GUARD = threading.Lock()
+
+# ``--invalidation-mode`` names, as compileall spells them.
+INVALIDATION_MODES = {
+    "timestamp": py_compile.PycInvalidationMode.TIMESTAMP,
+    "checked-hash": py_compile.PycInvalidationMode.CHECKED_HASH,
+    "unchecked-hash": py_compile.PycInvalidationMode.UNCHECKED_HASH,
+}
+
 
 # --- Private Helper Functions ---
 
@@ -127,13 +154,143 @@ def write_to_package_dir(
         The full path to the file that was written as a string.
     """
     target_dir = determine_target_dir(project_root, package_dir_name)
-    output_path = target_dir / output_filename
+    # target_dir is guaranteed to exist (determine_target_dir would have raised
+    # otherwise). write_output only creates parents for a nested output_filename.
+    return write_output(target_dir / output_filename, about_content)
+
+
+def _lock_file_path(directory: Path) -> Path:
+    """
+    Return the advisory lock file for a directory, kept out of the package itself.
+
+    Lock files live in a private per-user directory under the temp directory
+    (the temp directory is already per-user on Windows), so one user cannot
+    create or hold another's locks.
+
+    Raises:
+        OSError: If the lock directory cannot be created or belongs to another user.
+    """
+    digest = hashlib.sha1(os.path.realpath(directory).encode("utf-8"), usedforsecurity=False).hexdigest()
+    if hasattr(os, "getuid"):
+        uid = os.getuid()
+        lock_dir = Path(tempfile.gettempdir()) / f"metametameta-locks-{uid}"
+        lock_dir.mkdir(mode=0o700, exist_ok=True)
+        if lock_dir.is_symlink() or lock_dir.stat().st_uid != uid:
+            raise PermissionError(f"{lock_dir} is not owned by the current user")
+    else:
+        lock_dir = Path(tempfile.gettempdir()) / "metametameta-locks"
+        lock_dir.mkdir(mode=0o700, exist_ok=True)
+    return lock_dir / f"{digest}.lock"
+
+
+@contextmanager
+def directory_lock(directory: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on a target directory while writing into it.
+
+    Threads in this process serialize on an in-process lock; other processes
+    (parallel pre-commit hooks, xdist workers) serialize on an advisory lock
+    file in the temp directory. If the lock file cannot be created the write
+    proceeds with the in-process lock only.
+
+    Args:
+        directory: The directory about to be written into.
+    """
+    key = os.path.realpath(directory)
+    with _DIRECTORY_LOCKS_GUARD:
+        thread_lock = _DIRECTORY_LOCKS.setdefault(key, threading.Lock())
+    with thread_lock:
+        try:
+            lock_file = open(_lock_file_path(directory), "a+b")
+        except OSError as e:
+            logger.debug(f"Could not create lock file for {directory}, locking in-process only: {e}")
+            yield
+            return
+        with lock_file:
+            if sys.platform == "win32":
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if sys.platform == "win32":
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a directory entry change (the rename) on platforms that support it."""
+    if sys.platform == "win32":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def remove_cached_bytecode(source_path: Path) -> None:
+    """
+    Delete the ``__pycache__`` files compiled from a source file, at every optimization level.
+
+    An unchecked-hash pyc is never validated against its source, so a regenerated
+    file would otherwise keep importing the old values.
+
+    Args:
+        source_path: The ``.py`` file whose bytecode is stale.
+    """
+    for optimization in ("", 1, 2):
+        try:
+            Path(importlib.util.cache_from_source(str(source_path), optimization=optimization)).unlink(missing_ok=True)
+        except (NotImplementedError, OSError) as e:
+            logger.debug(f"Could not remove cached bytecode for {source_path}: {e}")
+
+
+def write_output(output_path: Path, about_content: str, fsync: bool = True) -> str:
+    """
+    Atomically writes content to an already resolved output path.
+
+    The content goes to a temporary file in the same directory which then
+    replaces the target with ``os.replace``, under a per-directory lock. A crash
+    or Ctrl-C leaves either the old file or the new one, never a truncated mix,
+    and concurrent writers cannot interleave. Bytecode cached for the old file is
+    removed, since a hash-based pyc may never notice the change.
+
+    Args:
+        output_path: The exact file to write.
+        about_content: The string content to write to the file.
+        fsync: Flush the file and directory to disk before returning. Batch runs
+            pass False and call :func:`sync_files` once at the end instead.
 
+    Returns:
+        The full path to the file that was written as a string.
+    """
+    directory = output_path.parent
+    temp_path = directory / f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
     try:
-        # target_dir is guaranteed to exist (determine_target_dir would have raised
-        # otherwise). Only create parents needed for a nested output_filename.
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(about_content, encoding="utf-8")
+        directory.mkdir(parents=True, exist_ok=True)
+        with directory_lock(directory):
+            # os.open applies the umask, matching the permissions write_text would give a new file.
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+                    temp_file.write(about_content)
+                    temp_file.flush()
+                    if fsync:
+                        os.fsync(temp_file.fileno())
+                if output_path.exists():
+                    os.chmod(temp_path, output_path.stat().st_mode & 0o7777)
+                os.replace(temp_path, output_path)
+            except BaseException:
+                temp_path.unlink(missing_ok=True)
+                raise
+            if output_path.suffix == ".py":
+                remove_cached_bytecode(output_path)
+            if fsync:
+                _fsync_directory(directory)
         logger.info(f"Successfully wrote metadata to {output_path}")
         return str(output_path)
     except OSError as e:
@@ -141,6 +298,86 @@ def write_to_package_dir(
         raise
 
 
+def diff_output(output_path: Path, about_content: str) -> str:
+    """
+    Compare rendered content with the file it would be written to, without writing.
+
+    Args:
+        output_path: The exact file that would be written.
+        about_content: The rendered content.
+
+    Returns:
+        A unified diff from the existing file to the rendered content, or an empty
+        string if they are identical. A missing file diffs against nothing.
+    """
+    try:
+        existing = output_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        existing = None
+    if existing == about_content:
+        return ""
+    return "".join(
+        difflib.unified_diff(
+            (existing or "").splitlines(keepends=True),
+            about_content.splitlines(keepends=True),
+            fromfile=str(output_path) if existing is not None else "/dev/null",
+            tofile=str(output_path),
+        )
+    )
+
+
+def sync_files(paths: Iterable[Path | str]) -> None:
+    """
+    Flush many written files, and each of their directories once, to disk.
+
+    Args:
+        paths: Files written with ``write_output(..., fsync=False)``.
+    """
+    directories = set()
+    for path in paths:
+        path = Path(path)
+        try:
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Skipping fsync of {path}: {e}")
+            continue
+        directories.add(path.parent)
+    for directory in directories:
+        _fsync_directory(directory)
+
+
+def compile_files(paths: Iterable[Path | str], invalidation_mode: str | None = None, workers: int = 4) -> list[Path]:
+    """
+    Byte-compile written files into ``__pycache__`` so the first import does not pay for it.
+
+    Args:
+        paths: Python files to compile.
+        invalidation_mode: ``timestamp``, ``checked-hash`` or ``unchecked-hash``. Unchecked-hash
+            pycs are reproducible and never re-validated against the source. None uses Python's
+            default: timestamp, or checked-hash when ``SOURCE_DATE_EPOCH`` is set.
+        workers: Worker threads compiling files.
+
+    Returns:
+        The ``.pyc`` files written. Files that fail to compile are logged and skipped.
+    """
+    mode = INVALIDATION_MODES[invalidation_mode] if invalidation_mode else None
+
+    def compile_one(path: Path | str) -> Path | None:
+        try:
+            pyc = py_compile.compile(str(path), doraise=True, invalidation_mode=mode)
+        except (py_compile.PyCompileError, OSError) as e:
+            logger.warning(f"Could not byte-compile {path}: {e}")
+            return None
+        return Path(pyc) if pyc else None
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        return [pyc for pyc in executor.map(compile_one, paths) if pyc is not None]
+
+
 # --- Legacy Backward-Compatible Wrapper ---
 
 
@@ -7,9 +7,10 @@ from __future__ import annotations
 import inspect
 import logging
 import os
-import re
 from typing import Any
 
+from metametameta.extract import extract_file, strip_dunders
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +45,7 @@ def get_meta(module_file: Any) -> dict[str, str]:
     """
     Extract metadata variables from a module file.
 
-    Searches for variables matching the pattern __key__ = "value" and
+    Searches for string assignments of the form __key__ = "value" and
     returns them as a dictionary.
 
     Args:
@@ -53,18 +54,10 @@ def get_meta(module_file: Any) -> dict[str, str]:
     Returns:
         Dictionary of metadata key-value pairs found in the file.
     """
-    metadata = {}
-    if module_file and os.path.isfile(module_file):
-        with open(module_file, encoding="utf-8") as file:
-            content = file.read()
-
-        # Define a regex pattern to match metadata variables
-        pattern = r"__(\w+)__\s*=\s*['\"]([^'\"]+)['\"]"
-        matches = re.findall(pattern, content)
-
-        for key, value in matches:
-            metadata[key] = value
-    return metadata
+    if not module_file or not os.path.isfile(module_file):
+        return {}
+    metadata = strip_dunders(extract_file(module_file))
+    return {key: value for key, value in metadata.items() if isinstance(value, str)}
 
 
 # # Usage example:
@@ -4,20 +4,50 @@ from __future__ import annotations
 
 import argparse
 import importlib
+import json
 import logging
+import mmap
 import os
-import re
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any
 
+from metametameta.extract import MMAP_THRESHOLD, extract_file, extract_metadata, strip_dunders
+
 logger = logging.getLogger(__name__)
 
+# Directories that never hold the metadata of the module being inspected.
+DEFAULT_PRUNED_DIRS = frozenset(
+    {
+        "__pycache__",
+        ".git",
+        ".hg",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "node_modules",
+        "test",
+        "tests",
+        "_vendor",
+        "vendor",
+    }
+)
+
+VERSION_MARKER = b"__version__"
+
+# Files submitted to the parser pool ahead of the results, per worker thread. Bounds
+# memory on huge trees and lets results stream while the walk is still running.
+PENDING_PER_WORKER = 4
+
 
 def find_metadata_in_file(file_path: Path) -> dict[str, Any]:
     """
     Find metadata variables in a given Python file.
 
-    Searches for variables matching the pattern __key__ = "value".
+    Searches for literal assignments of the form __key__ = value.
 
     Args:
         file_path: Path to the Python file to search.
@@ -25,18 +55,128 @@ def find_metadata_in_file(file_path: Path) -> dict[str, Any]:
     Returns:
         Dictionary of metadata key-value pairs found in the file.
     """
-    metadata = {}
-    with open(file_path, encoding="utf-8") as file:
-        content = file.read()
-        # Match all possible metadata fields, assuming they follow the format __key__ = value
-        matches = re.findall(r"__(\w+)__\s*=\s*['\"]([^'\"]+)['\"]", content)
-        for key, value in matches:
-            logger.debug(f"Found {key} : {value}")
-            metadata[key] = value
+    return strip_dunders(extract_file(file_path))
+
+
+def is_pruned_dir(name: str, pruned: frozenset[str] = DEFAULT_PRUNED_DIRS) -> bool:
+    """Return True if a directory should not be descended into."""
+    return name in pruned or name.endswith((".dist-info", ".egg-info"))
+
+
+def iter_candidate_files(module_path: Path, pruned: frozenset[str] = DEFAULT_PRUNED_DIRS) -> Iterator[Path]:
+    """
+    Walk a directory tree with ``os.scandir`` and yield ``*about*.py`` files.
+
+    Pruned directories are never opened, so caches, tests and vendored trees cost
+    a single directory entry each.
+
+    Args:
+        module_path: Root of the tree to walk.
+        pruned: Directory names to skip.
+
+    Yields:
+        Paths of candidate metadata files.
+    """
+    stack = [os.fspath(module_path)]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        if not is_pruned_dir(name, pruned):
+                            stack.append(entry.path)
+                    elif name.endswith(".py") and "about" in name:
+                        yield Path(entry.path)
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+
+
+def scan_candidate_file(file_path: Path) -> dict[str, Any] | None:
+    """
+    Parse a candidate file only if its raw bytes mention ``__version__``.
+
+    Small files are read once and reused for parsing; large files are searched
+    and then scanned through the same mmap without copying the whole file.
+
+    Args:
+        file_path: Path to the candidate file.
+
+    Returns:
+        The metadata found, or None if the file has no version metadata.
+    """
+    with open(file_path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return None
+        if size < MMAP_THRESHOLD:
+            raw = file.read()
+            if VERSION_MARKER not in raw:
+                return None
+            metadata = strip_dunders(extract_metadata(raw))
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(VERSION_MARKER) == -1:
+                    return None
+                metadata = strip_dunders(extract_metadata(mapped))
+    if "version" not in metadata:
+        return None
     return metadata
 
 
-def find_metadata_in_module(module_path: Path) -> dict[str, dict[str, Any]]:
+def _module_name(file_path: Path, module_path: Path) -> str:
+    """Convert a file path under ``module_path`` into a dotted module name."""
+    return str(file_path.relative_to(module_path).with_suffix("")).replace(os.sep, ".")
+
+
+def iter_metadata_in_module(
+    module_path: Path, workers: int | None = None, pruned: frozenset[str] = DEFAULT_PRUNED_DIRS
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Stream ``(module_name, metadata)`` pairs as candidate files finish parsing.
+
+    The directory walk feeds the parser pool through a bounded window of pending
+    files, so results are yielded while the walk is still running.
+
+    Args:
+        module_path: Path to the module or package directory to search.
+        workers: Number of parser threads. Defaults to the executor default.
+        pruned: Directory names to skip.
+
+    Yields:
+        Module name and metadata for every file with version metadata.
+    """
+    window = PENDING_PER_WORKER * (workers or min(32, (os.cpu_count() or 1) + 4))
+    pending: dict[Future[dict[str, Any] | None], Path] = {}
+
+    def finished(done: Iterable[Future[dict[str, Any] | None]]) -> Iterator[tuple[str, dict[str, Any]]]:
+        for future in done:
+            file_path = pending.pop(future)
+            try:
+                metadata = future.result()
+            except (OSError, ValueError) as e:
+                logger.debug(f"Skipping unreadable file {file_path}: {e}")
+                continue
+            if metadata is not None:
+                yield _module_name(file_path, module_path), metadata
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path in iter_candidate_files(module_path, pruned):
+            pending[executor.submit(scan_candidate_file, file_path)] = file_path
+            if len(pending) >= window:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            else:
+                done = {future for future in pending if future.done()}
+            yield from finished(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from finished(done)
+
+
+def find_metadata_in_module(
+    module_path: Path, workers: int | None = None, pruned: frozenset[str] = DEFAULT_PRUNED_DIRS
+) -> dict[str, dict[str, Any]]:
     """
     Traverse a module/package directory and find metadata in all submodules.
 
@@ -45,26 +185,21 @@ def find_metadata_in_module(module_path: Path) -> dict[str, dict[str, Any]]:
 
     Args:
         module_path: Path to the module or package directory to search.
+        workers: Number of parser threads. Defaults to the executor default.
+        pruned: Directory names to skip.
 
     Returns:
         Dictionary mapping module names to their metadata dictionaries.
     """
-    metadata_results = {}
-    for root, _dirs, files in os.walk(module_path):
-        for file in files:
-            if file.endswith(".py") and "about" in file:
-                file_path = Path(root) / file
-                metadata = find_metadata_in_file(file_path)
-                if "version" in metadata:  # Check if this file has metadata
-                    module_name = file_path.relative_to(module_path).with_suffix("")
-                    metadata_results[str(module_name).replace(os.sep, ".")] = metadata
-    return metadata_results
+    return dict(sorted(iter_metadata_in_module(module_path, workers, pruned)))
 
 
 def main(argv: list[str] | None = None) -> None:
     """Find metadata in a Python module/package."""
     parser = argparse.ArgumentParser(description="Find metadata in a Python module/package.")
     parser.add_argument("module", type=str, help="The name of the module/package to inspect.")
+    parser.add_argument("--ndjson", action="store_true", help="Stream one JSON object per result to stdout.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parser threads.")
     args = parser.parse_args(argv)
 
     module_name = args.module
@@ -73,8 +208,10 @@ def main(argv: list[str] | None = None) -> None:
         raise ValueError(f"Module {module_name} has no file attribute.")
     module_path = Path(module.__file__).parent
 
-    metadata_results = find_metadata_in_module(module_path)
-    for submodule, metadata in metadata_results.items():
+    for submodule, metadata in iter_metadata_in_module(module_path, workers=args.workers):
+        if args.ndjson:
+            print(json.dumps({"module": submodule, "metadata": metadata}, ensure_ascii=False), flush=True)
+            continue
         logger.debug(f"Metadata for {submodule}:")
         for key, value in metadata.items():
             logger.debug(f"  {key}: {value}")
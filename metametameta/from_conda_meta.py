@@ -1,18 +1,93 @@
 """
 Generate metadata from a conda recipe meta.yaml file.
+
+A recipe is read the way conda-build reads it, minus the build: the Jinja
+template is rendered first, then the YAML. Rendering is a single regex pass
+that understands the subset recipes actually use, ``{% set name = "..." %}``,
+``{{ name }}``, ``~`` concatenation, string methods and subscripts (evaluated by
+:class:`metametameta.static_eval.StaticEvaluator`) and filters such as
+``|lower``; other ``{% %}`` tags are dropped, so both sides of an ``{% if %}``
+are kept. Expressions share the evaluator's limits, so one that would build a
+huge value or loop too long is left unrendered instead of hanging the read.
+The YAML is then read by a small indentation-based parser that
+handles mappings, sequences, block scalars and flow lists. Multi-output recipes
+give one metadata record per entry under ``outputs:``.
+
+Lines guarded by a selector comment such as ``# [win]`` or ``# [not win]`` hold
+only on some platforms or Pythons, so they are dropped along with anything
+nested under them: the metadata lists what applies everywhere.
 """
 
 from __future__ import annotations
 
+import ast
 import logging
+import re
+from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.static_eval import (
+    MAX_VALUE_LENGTH,
+    SAFE_FUNCTIONS,
+    NotStaticError,
+    StaticEvaluator,
+    check_str_method,
+)
 
 logger = logging.getLogger(__name__)
 
+# Jinja tags, in one alternation: {% set %}, {{ expression }}, any other {% %} tag, and {# comments #}.
+_JINJA = re.compile(
+    r"""\{%-?\s*set\s+(?P<name>[A-Za-z_]\w*)\s*=\s*(?P<value>.*?)\s*-?%\}
+      | \{\{-?\s*(?P<expression>.*?)\s*-?\}\}
+      | \{%.*?%\}
+      | \{\#.*?\#\}""",
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def _replace(value: Any, old: str, new: str) -> str:
+    text = str(value)
+    check_str_method(text, "replace", [old, new])
+    return text.replace(old, new)
+
+
+# Jinja filters recipes apply to strings, held to the static evaluator's size limits.
+FILTERS: dict[str, Callable[..., Any]] = {
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "title": lambda value: str(value).title(),
+    "trim": lambda value: str(value).strip(),
+    "string": str,
+    "int": SAFE_FUNCTIONS["int"],
+    "replace": _replace,
+    "default": lambda value, default="": default if value in (None, "") else value,
+}
+
+# conda-build helpers whose value, for metadata, is the package they name.
+RECIPE_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "pin_subpackage": lambda name, *_args, **_kwargs: name,
+    "pin_compatible": lambda name, *_args, **_kwargs: name,
+}
+
+# Names every template can see. ``environ`` is empty so ``environ.get("X", default)`` renders reproducibly.
+_JINJA_GLOBALS: dict[str, Any] = {"true": True, "false": False, "none": None, "environ": {}}
+
+# A mapping line: ``key:`` or ``key: value``.
+_KEY_LINE = re.compile(r"^(?P<key>\"[^\"]*\"|'[^']*'|[^\s:'\"\-\[{][^:]*?|-[^\s:][^:]*?)\s*:(?:\s+(?P<value>.*))?$")
+
+_BLOCK_SCALAR_INDICATORS = frozenset({"|", "|-", "|+", ">", ">-", ">+"})
+
+# A conda-build selector: a trailing comment holding a bracketed condition, e.g. ``# [not win]``.
+_SELECTOR = re.compile(r"^#\s*\[[^\[\]]+\]\s*$")
+
+# Characters after which a quote opens a quoted scalar rather than being part of a plain one.
+_QUOTE_OPENERS = frozenset(":-[{,")
+
 
 def strip_matching_quotes(value: str) -> str:
     """Strip matching single or double quotes from a string."""
@@ -21,11 +96,39 @@ def strip_matching_quotes(value: str) -> str:
     return value
 
 
+def split_comment(line: str) -> tuple[str, str]:
+    """
+    Split a YAML line into its content and its comment.
+
+    A comment starts at a ``#`` that begins the line or follows whitespace, outside
+    quoted scalars, so ``summary: 'A "quoted" summary #1'`` has no comment.
+
+    Returns:
+        The content with trailing whitespace removed, and the comment (``""`` if there is none).
+    """
+    quote = ""
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if quote == '"' and char == "\\":
+            index += 1
+        elif quote == "'" and line.startswith("''", index):
+            index += 1
+        elif char == quote:
+            quote = ""
+        elif quote:
+            pass
+        elif char in "'\"" and (not line[:index].strip() or line[:index].rstrip()[-1] in _QUOTE_OPENERS):
+            quote = char
+        elif char == "#" and (index == 0 or line[index - 1] in " \t"):
+            return line[:index].rstrip(), line[index:]
+        index += 1
+    return line.rstrip(), ""
+
+
 def strip_comment(value: str) -> str:
-    """Strip YAML-style comments from a line."""
-    if " #" in value:
-        return value.split(" #", maxsplit=1)[0].rstrip()
-    return value.rstrip()
+    """Strip YAML-style comments from a line, leaving quoted ``#`` alone."""
+    return split_comment(value)[0]
 
 
 def infer_project_name(source_path: Path) -> str:
@@ -36,77 +139,348 @@ def infer_project_name(source_path: Path) -> str:
     return parent.name
 
 
-def read_conda_meta_metadata(source: str = "conda/meta.yaml", name: str = "") -> dict[str, Any]:
+def _split_top_level(expression: str, separator: str) -> list[str]:
+    """Split an expression on ``separator`` outside quotes and brackets."""
+    parts: list[str] = []
+    current: list[str] = []
+    depth, quote = 0, ""
+    for char in expression:
+        if quote:
+            quote = "" if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current).strip())
+    return parts
+
+
+class JinjaLite:
+    """Renders the Jinja subset conda recipes use, keeping the ``{% set %}`` variables seen so far."""
+
+    def __init__(self, source_path: Path | str = "meta.yaml") -> None:
+        """
+        Start with no variables.
+
+        Args:
+            source_path: The recipe, which file reads in expressions are resolved against.
+        """
+        self.evaluator = StaticEvaluator(source_path)
+        self.variables: dict[str, Any] = dict(_JINJA_GLOBALS)
+
+    def evaluate(self, expression: str) -> Any:
+        """
+        Evaluate a Jinja expression: ``~``-joined terms, each a Python-style expression with optional filters.
+
+        Raises:
+            NotStaticError: If the expression is outside the supported subset, or exceeds one of the
+                static evaluator's limits (value size, comprehension iterations, evaluation steps).
+        """
+        terms = [self._evaluate_term(term) for term in _split_top_level(expression, "~")]
+        if len(terms) == 1:
+            return terms[0]
+        parts = [str(term) for term in terms]
+        if sum(len(part) for part in parts) > MAX_VALUE_LENGTH:
+            raise NotStaticError("value too large")
+        return "".join(parts)
+
+    def _evaluate_term(self, term: str) -> Any:
+        base, *filters = _split_top_level(term, "|")
+        value = self._evaluate_python(base)
+        for applied in filters:
+            node = self._parse(applied)
+            if isinstance(node, ast.Name) and node.id in FILTERS:
+                function, args = FILTERS[node.id], []
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FILTERS:
+                function = FILTERS[node.func.id]
+                args = [self.evaluator.evaluate(arg, self.variables) for arg in node.args]
+            else:
+                raise NotStaticError(f"unsupported filter {applied!r}")
+            try:
+                value = function(value, *args)
+            except NotStaticError:
+                raise
+            except (ArithmeticError, TypeError, ValueError, MemoryError) as e:
+                raise NotStaticError(f"filter {applied!r} failed: {e}") from e
+        return value
+
+    def _evaluate_python(self, source: str) -> Any:
+        node = self._parse(source)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in RECIPE_FUNCTIONS:
+            args = [self.evaluator.evaluate(arg, self.variables) for arg in node.args]
+            return RECIPE_FUNCTIONS[node.func.id](*args)
+        return self.evaluator.evaluate(node, self.variables)
+
+    @staticmethod
+    def _parse(source: str) -> ast.expr:
+        try:
+            return ast.parse(source, mode="eval").body
+        except SyntaxError as e:
+            raise NotStaticError(f"not an expression: {source!r}") from e
+
+    def render(self, template: str) -> str:
+        """
+        Render a recipe in one pass, defining variables in the order their ``{% set %}`` tags appear.
+
+        Expressions that cannot be evaluated are left in place.
+        """
+
+        def replace(match: re.Match[str]) -> str:
+            if match.group("name"):
+                try:
+                    self.variables[match.group("name")] = self.evaluate(match.group("value"))
+                except NotStaticError as e:
+                    logger.debug(f"Leaving {match.group('name')} unset: {e}")
+                return ""
+            if match.group("expression") is not None:
+                try:
+                    return str(self.evaluate(match.group("expression")))
+                except NotStaticError as e:
+                    logger.debug(f"Leaving {match.group(0)} unrendered: {e}")
+                    return match.group(0)
+            return ""
+
+        return _JINJA.sub(replace, template)
+
+
+def render_recipe(template: str, source_path: Path | str = "meta.yaml") -> str:
+    """Render the Jinja in a conda recipe; see :class:`JinjaLite`."""
+    return JinjaLite(source_path).render(template)
+
+
+class _Line(NamedTuple):
+    indent: int
+    content: str
+
+
+def _scalar(value: str) -> Any:
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [strip_matching_quotes(item) for item in _split_top_level(value[1:-1], ",") if item]
+    return strip_matching_quotes(value)
+
+
+def _is_item(content: str) -> bool:
+    return content == "-" or content.startswith("- ")
+
+
+class _YamlSubsetParser:
+    """Indentation-based reader for the block YAML recipes are written in."""
+
+    def __init__(self, text: str) -> None:
+        self.lines: list[_Line] = []
+        skipped_indent: int | None = None
+        for raw_line in text.splitlines():
+            without_comment, comment = split_comment(raw_line)
+            content = without_comment.strip()
+            if not content:
+                continue
+            indent = len(without_comment) - len(without_comment.lstrip(" "))
+            if skipped_indent is not None and indent > skipped_indent:
+                continue
+            skipped_indent = None
+            if _SELECTOR.match(comment):
+                logger.debug(f"Skipping selector-guarded recipe line: {raw_line.strip()}")
+                skipped_indent = indent
+                continue
+            self.lines.append(_Line(indent, content))
+        self.index = 0
+
+    def parse(self) -> Any:
+        if not self.lines:
+            return {}
+        return self._block(self.lines[0].indent)
+
+    def _current(self, indent: int) -> _Line | None:
+        while self.index < len(self.lines):
+            line = self.lines[self.index]
+            if line.indent < indent:
+                return None
+            if line.indent == indent:
+                return line
+            logger.debug(f"Skipping over-indented recipe line: {line.content}")
+            self.index += 1
+        return None
+
+    def _block(self, indent: int) -> Any:
+        line = self._current(indent)
+        if line is None:
+            return None
+        return self._sequence(indent) if _is_item(line.content) else self._mapping(indent)
+
+    def _nested(self, indent: int) -> Any:
+        """Parse the value of a ``key:`` or ``-`` line that has nothing after it."""
+        if self.index >= len(self.lines):
+            return None
+        line = self.lines[self.index]
+        if line.indent > indent or (line.indent == indent and _is_item(line.content)):
+            return self._block(line.indent)
+        return None
+
+    def _sequence(self, indent: int) -> list[Any]:
+        items = []
+        line = self._current(indent)
+        while line is not None and _is_item(line.content):
+            rest = line.content[1:].lstrip()
+            if not rest:
+                self.index += 1
+                items.append(self._nested(indent + 1))
+            elif _KEY_LINE.match(rest):
+                child_indent = indent + len(line.content) - len(rest)
+                self.lines[self.index] = _Line(child_indent, rest)
+                items.append(self._mapping(child_indent))
+            else:
+                self.index += 1
+                items.append(_scalar(rest))
+            line = self._current(indent)
+        return items
+
+    def _mapping(self, indent: int) -> dict[str, Any]:
+        mapping: dict[str, Any] = {}
+        line = self._current(indent)
+        while line is not None and not _is_item(line.content):
+            self.index += 1
+            match = _KEY_LINE.match(line.content)
+            if match is None:
+                logger.debug(f"Skipping unrecognized recipe line: {line.content}")
+            else:
+                key = strip_matching_quotes(match.group("key").strip())
+                value = match.group("value")
+                if value in _BLOCK_SCALAR_INDICATORS:
+                    mapping[key] = self._block_scalar(indent, folded=value.startswith(">"))
+                elif value:
+                    mapping[key] = _scalar(value)
+                else:
+                    mapping[key] = self._nested(indent)
+            line = self._current(indent)
+        return mapping
+
+    def _block_scalar(self, indent: int, folded: bool) -> str:
+        parts = []
+        while self.index < len(self.lines) and self.lines[self.index].indent > indent:
+            parts.append(self.lines[self.index].content)
+            self.index += 1
+        return (" " if folded else "\n").join(parts)
+
+
+def parse_recipe_yaml(text: str) -> Any:
     """
-    Read metadata from a conda recipe.
+    Parse the block-style YAML subset conda recipes use.
+
+    Scalars stay strings (so ``version: 1.10`` is not read as a float) and comments
+    are dropped. Lines with a selector such as ``# [win]``, and the lines nested under
+    them, are dropped too, since they do not apply on every platform.
 
     Args:
-        source: Path to the conda meta.yaml file.
-        name: Optional explicit project name override.
+        text: Rendered recipe text.
 
     Returns:
-        A metadata dictionary with the supported fields extracted.
+        Nested dicts, lists and strings.
     """
-    source_path = Path(source)
-    parsed: dict[str, Any] = {"package": {}, "about": {}, "requirements": {"run": []}}
-    current_section = ""
-    current_subsection = ""
-
-    for raw_line in source_path.read_text(encoding="utf-8").splitlines():
-        without_comment = strip_comment(raw_line)
-        stripped = without_comment.strip()
-        if not stripped or stripped.startswith("{%"):
-            continue
+    return _YamlSubsetParser(text).parse()
 
-        indent = len(without_comment) - len(without_comment.lstrip(" "))
 
-        if stripped.endswith(":") and not stripped.startswith("- "):
-            section_name = stripped[:-1].strip()
-            if indent == 0:
-                current_section = section_name
-                current_subsection = ""
-            else:
-                current_subsection = section_name
-            continue
+def _as_dict(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
 
-        if stripped.startswith("- "):
-            item = strip_matching_quotes(stripped[2:].strip())
-            if current_section == "requirements" and current_subsection:
-                parsed["requirements"].setdefault(current_subsection, []).append(item)
-            continue
 
-        if ":" not in stripped:
-            continue
+def _run_requirements(requirements: Any) -> list[str]:
+    """Return run requirements; an output's plain ``requirements:`` list is its run list."""
+    run = requirements if isinstance(requirements, list) else _as_dict(requirements).get("run")
+    if not isinstance(run, list):
+        return []
+    return [item for item in run if isinstance(item, str) and item and "{{" not in item]
 
-        key, value = stripped.split(":", maxsplit=1)
-        cleaned_value = strip_matching_quotes(value.strip())
-        if current_section in {"package", "about"}:
-            parsed[current_section][key.strip()] = cleaned_value
-
-    package_data = parsed.get("package", {})
-    about_data = parsed.get("about", {})
-    run_dependencies = parsed.get("requirements", {}).get("run", [])
-
-    project_name = name or package_data.get("name") or infer_project_name(source_path)
-
-    metadata: dict[str, Any] = {"name": project_name}
-    if package_data.get("version"):
-        metadata["version"] = package_data["version"]
-    if about_data.get("summary"):
-        metadata["summary"] = about_data["summary"]
-    elif about_data.get("description"):
-        metadata["description"] = about_data["description"]
-    if about_data.get("license"):
-        metadata["license"] = about_data["license"]
-    if about_data.get("home"):
-        metadata["homepage"] = about_data["home"]
-    metadata["dependencies"] = run_dependencies
 
+def _metadata_record(package: dict[str, Any], about: dict[str, Any], requirements: Any) -> dict[str, Any]:
+    metadata: dict[str, Any] = {}
+    for key, source, field in (
+        ("name", package, "name"),
+        ("version", package, "version"),
+        ("summary", about, "summary"),
+        ("license", about, "license"),
+        ("homepage", about, "home"),
+    ):
+        value = source.get(field)
+        if isinstance(value, str) and value and "{{" not in value:
+            metadata[key] = value
+    if "summary" not in metadata and isinstance(about.get("description"), str) and about["description"]:
+        metadata["description"] = about["description"]
+    metadata["dependencies"] = _run_requirements(requirements)
     return metadata
 
 
+class CondaRecipe(NamedTuple):
+    """The metadata of a recipe's top-level package and of each of its outputs."""
+
+    package: dict[str, Any]
+    outputs: list[dict[str, Any]]
+
+
+def read_conda_recipe(source: str = "conda/meta.yaml") -> CondaRecipe:
+    """
+    Render and parse a conda recipe.
+
+    Outputs inherit the package version and any ``about`` fields they do not set.
+
+    Args:
+        source: Path to the meta.yaml file.
+
+    Returns:
+        The top-level package's metadata and one record per named output.
+    """
+    source_path = Path(source)
+    recipe = _as_dict(parse_recipe_yaml(render_recipe(source_path.read_text(encoding="utf-8"), source_path)))
+    package = _as_dict(recipe.get("package"))
+    about = _as_dict(recipe.get("about"))
+    outputs = []
+    for output in recipe.get("outputs") or []:
+        output = _as_dict(output)
+        if not isinstance(output.get("name"), str):
+            continue
+        output_package = {"name": output["name"], "version": output.get("version") or package.get("version")}
+        outputs.append(
+            _metadata_record(output_package, {**about, **_as_dict(output.get("about"))}, output.get("requirements"))
+        )
+    return CondaRecipe(_metadata_record(package, about, recipe.get("requirements")), outputs)
+
+
+def read_conda_meta_metadata(source: str = "conda/meta.yaml", name: str = "") -> dict[str, Any]:
+    """
+    Read metadata from a conda recipe.
+
+    Args:
+        source: Path to the conda meta.yaml file.
+        name: Optional explicit project name override. If it names one of the recipe's
+            outputs, that output's metadata is returned instead of the top-level package's.
+
+    Returns:
+        A metadata dictionary with the supported fields extracted.
+    """
+    source_path = Path(source)
+    recipe = read_conda_recipe(source)
+    for output in recipe.outputs:
+        if name and output["name"] == name:
+            return output
+    metadata = dict(recipe.package)
+    metadata["name"] = name or metadata.get("name") or infer_project_name(source_path)
+    return {"name": metadata.pop("name"), **metadata}
+
+
 def generate_from_conda_meta(
-    name: str = "", source: str = "conda/meta.yaml", output: str = "__about__.py", validate: bool = False
+    name: str = "",
+    source: str = "conda/meta.yaml",
+    output: str = "__about__.py",
+    validate: bool = False,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the metadata file from conda/meta.yaml.
@@ -116,6 +490,7 @@ def generate_from_conda_meta(
         source: Path to the conda recipe.
         output: Name of the file to write to.
         validate: Validate file after writing.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written.
@@ -130,9 +505,10 @@ def generate_from_conda_meta(
     else:
         dir_path = f"./{project_name}"
 
-    about_content, names = any_metadict(metadata)
+    record = ProjectMetadata(metadata)
+    about_content, names = any_metadict(record, precompute=precompute)
     about_content = merge_sections(names, project_name, about_content)
     file_path = write_to_file(dir_path, about_content, output)
     if validate:
-        validate_about_file(file_path, metadata)
+        validate_about_file(file_path, record)
     return file_path
@@ -10,6 +10,7 @@ from typing import Any, cast
 
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +50,9 @@ def get_package_metadata(package_name: str) -> dict[str, Any]:
 
 
 # pylint: disable=unused-argument
-def generate_from_importlib(name: str, source: str = "", output: str = "__about__.py", validate: bool = False) -> str:
+def generate_from_importlib(
+    name: str, source: str = "", output: str = "__about__.py", validate: bool = False, *, precompute: bool = False
+) -> str:
     """
     Write package metadata to an __about__.py file.
 
@@ -58,6 +61,7 @@ def generate_from_importlib(name: str, source: str = "", output: str = "__about_
         source: Ignored (present for API compatibility).
         output: Name of the file to write to.
         validate: Validate file after writing.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written, or a message if no metadata was found.
@@ -66,12 +70,13 @@ def generate_from_importlib(name: str, source: str = "", output: str = "__about_
     if pkg_metadata:
         dir_path = "./"
 
-        about_content, names = any_metadict(pkg_metadata)
+        record = ProjectMetadata(pkg_metadata)
+        about_content, names = any_metadict(record, precompute=precompute)
 
         about_content = merge_sections(names, name, about_content)
         file_path = write_to_file(dir_path, about_content, output)
         if validate:
-            validate_about_file(file_path, pkg_metadata)
+            validate_about_file(file_path, record)
         return file_path
     message = f"No metadata found for package '{name}' via importlib."
     logger.debug(message)
@@ -6,12 +6,13 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Any, cast
-
-import toml
+from typing import Any
 
+from metametameta.dynamic_version import apply_dynamic_version
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.toml_sections import read_toml_table
 
 logger = logging.getLogger(__name__)
 
@@ -24,21 +25,21 @@ def read_pep621_metadata(source: str = "pyproject.toml") -> dict[str, Any]:
         source: Path to the pyproject.toml file.
 
     Returns:
-        The [project] section of the pyproject.toml file.
+        The [project] section of the pyproject.toml file, with a dynamic version
+        resolved from the build backend's configuration where possible.
     """
-    # Read the pyproject.toml file
-    with open(source, encoding="utf-8") as file:
-        data = toml.load(file)
-
-    # Extract the [project] section
-    project_data = data.get("project", {})
-    # must be dict for 3.8 support
-    return cast(dict, project_data)  # type: ignore[type-arg]
+    # Only the [project] table is parsed; [tool.*] configuration is read only for a dynamic version.
+    return apply_dynamic_version(read_toml_table(source, "project"), Path(source))
 
 
 # pylint: disable=unused-argument
 def generate_from_pep621(
-    name: str = "", source: str = "pyproject.toml", output: str = "__about__.py", validate: bool = False
+    name: str = "",
+    source: str = "pyproject.toml",
+    output: str = "__about__.py",
+    validate: bool = False,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the __about__.py file from the pyproject.toml file.
@@ -48,6 +49,7 @@ def generate_from_pep621(
         source: Path to the pyproject.toml file.
         output: Name of the file to write to.
         validate: Validate file after writing.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written.
@@ -72,9 +74,10 @@ def generate_from_pep621(
             project_name = project_name.replace("_", "-")
             dir_path = f"./{project_name}"
 
+        record = ProjectMetadata(project_data)
         result_tuple = None
         try:
-            result_tuple = any_metadict(project_data)
+            result_tuple = any_metadict(record, precompute=precompute)
             about_content, names = result_tuple
         except Exception:
             print(result_tuple)
@@ -83,7 +86,7 @@ def generate_from_pep621(
         file_path = write_to_file(dir_path, about_content, output)
 
         if validate:
-            validate_about_file(file_path, project_data)
+            validate_about_file(file_path, record)
 
         return file_path
     logger.debug("No [project] section found in pyproject.toml.")
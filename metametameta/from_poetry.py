@@ -6,16 +6,20 @@ pyproject.toml file.
 from __future__ import annotations
 
 import logging
-from pathlib import Path
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-import toml
-
 from metametameta import filesystem
-from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.general import about_body, about_docstring, any_metadict, validate_about_content
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.toml_sections import read_toml_table
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on threads used to write the __about__.py files of one project.
+MAX_WRITE_WORKERS = 8
+
 
 def format_poetry_dependency(name: str, spec: Any) -> str | None:
     """Convert a poetry dependency entry into a string requirement."""
@@ -53,12 +57,20 @@ def read_poetry_metadata(
     Returns:
         The [tool.poetry] section of the pyproject.toml file.
     """
-    # Read the pyproject.toml file
-    with open(source, encoding="utf-8") as file:
-        data = toml.load(file)
+    # Only [tool.poetry] and its sub-tables are parsed; other [tool.*] configuration is skipped.
+    return normalize_poetry_metadata(read_toml_table(source, "tool.poetry"))
+
+
+def normalize_poetry_metadata(poetry_data: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert a parsed [tool.poetry] table into reader output.
 
-    # Extract the [tool.poetry] section
-    poetry_data = data.get("tool", {}).get("poetry", {})
+    Args:
+        poetry_data: The [tool.poetry] table.
+
+    Returns:
+        A copy of the table with ``dependencies`` as a list of requirement strings.
+    """
     normalized_data = dict(poetry_data)
     dependencies = poetry_data.get("dependencies")
     if isinstance(dependencies, dict):
@@ -71,9 +83,42 @@ def read_poetry_metadata(
     return normalized_data
 
 
+def find_candidate_packages(packages_data_list: list[dict[str, Any]] | None) -> list[str]:
+    """
+    Resolve the ``packages`` entries of [tool.poetry] to existing directories.
+
+    Each path is checked once, and a package listed twice is returned once.
+
+    Args:
+        packages_data_list: The raw ``packages`` array.
+
+    Returns:
+        Existing package paths, in declaration order.
+    """
+    candidates: dict[str, None] = {}
+    for package_data in packages_data_list or []:
+        include_part = package_data.get("include")
+        if not include_part:
+            continue
+        from_part = package_data.get("from")  # subfolder(s)
+        if from_part:
+            candidate_from_path = os.path.join(include_part, from_part)
+            if os.path.exists(candidate_from_path):
+                candidates[candidate_from_path] = None
+                continue
+        if os.path.exists(include_part):
+            candidates[include_part] = None
+    return list(candidates)
+
+
 # pylint: disable=unused-argument
 def generate_from_poetry(
-    name: str = "", source: str = "pyproject.toml", output: str = "__about__.py", validate: bool = True
+    name: str = "",
+    source: str = "pyproject.toml",
+    output: str = "__about__.py",
+    validate: bool = True,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the __about__.py file from the pyproject.toml file.
@@ -83,57 +128,46 @@ def generate_from_poetry(
         source: Path to the pyproject.toml file.
         output: Name of the file to write to.
         validate: Check if top level values are in about file after written.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written.
     """
     poetry_data = read_poetry_metadata(source)
     if poetry_data:
-        candidate_packages: list[str] = []
-        packages_data_list = poetry_data.get("packages")
-        if packages_data_list:
-            for package_data in packages_data_list:
-                include_part = None
-                from_part = None  # subfolder(s)
-
-                for key, value in package_data.items():
-                    if key == "include":
-                        include_part = value
-                    elif key == "from":
-                        from_part = value
-                    elif key == "format":
-                        pass
-                candidate_path = ""
-                if include_part:
-                    candidate_path = include_part
-                if include_part and from_part:
-                    candidate_from_path = Path(candidate_path) / from_part
-                    if candidate_from_path.exists():
-                        candidate_path = candidate_from_path
-                if Path(candidate_path).exists():
-                    candidate_packages.append(candidate_path)
+        candidate_packages = find_candidate_packages(poetry_data.get("packages"))
 
         project_name = poetry_data.get("name")
         if not candidate_packages:
             if not isinstance(project_name, str) or not project_name:
                 raise ValueError("Project name not found in [tool.poetry] section of pyproject.toml.")
             candidate_packages.append(project_name)
-        written = []
+
+        # Render and validate the shared body once; only the docstring names the package.
+        record = ProjectMetadata(poetry_data)
+        about_content, names = any_metadict(record, precompute=precompute)
+        body = about_body(names, about_content)
+        if validate:
+            validate_about_content(body, record, source)
+
+        # A full output path sends every candidate to the same file; the last one wins, as before.
+        targets: dict[str, str] = {}
         for candidate in candidate_packages:
             if output != "__about__.py" and "/" in output or "\\" in output:
                 dir_path = "./"
             else:
                 dir_path = f"./{candidate}"
-            result_tuple = any_metadict(poetry_data)
-            about_content, names = result_tuple
-            about_content = merge_sections(names, candidate or "", about_content)
-            # Define the content to write to the __about__.py file
-            file_path = filesystem.write_to_file(dir_path, about_content, output)
+            targets.pop(dir_path, None)
+            targets[dir_path] = candidate
 
-            if validate:
-                validate_about_file(file_path, poetry_data)
+        def write_target(dir_path: str) -> str:
+            return filesystem.write_to_file(dir_path, about_docstring(targets[dir_path]) + body, output)
 
-            written.append(file_path)
+        if len(targets) == 1:
+            written = [write_target(next(iter(targets)))]
+        else:
+            with ThreadPoolExecutor(max_workers=min(len(targets), MAX_WRITE_WORKERS)) as executor:
+                written = list(executor.map(write_target, targets))
         if len(written) == 1:
             return written[0]
         return ", ".join(written)
@@ -1,15 +1,29 @@
 """
 Generate metadata from a requirements.txt file.
+
+``-r``/``--requirement`` includes are followed, relative to the including file.
+Each file is parsed once per :class:`RequirementsCache`, so when many projects
+include a shared ``base.txt`` a batch run parses it once; include cycles are
+reported and broken.
+
+Files are streamed line by line, so pip-compile outputs with tens of thousands
+of backslash-continued ``--hash`` lines are never held in memory whole; hash
+lines are dropped before they are joined onto their requirement.
 """
 
 from __future__ import annotations
 
 import logging
+import os
+import re
+import threading
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +38,17 @@ SKIPPED_PREFIXES = (
     "-f",
     "--find-links",
     "--trusted-host",
+    "--hash",
 )
 
 
+# An include line: -r FILE, -rFILE, --requirement FILE or --requirement=FILE.
+_INCLUDE_LINE = re.compile(r"^\s*(?:--requirement(?:\s*=\s*|\s+)|-r\s*)(?P<path>[^\s#]+)")
+
+# Per-requirement options that follow the specifier and carry no metadata.
+_REQUIREMENT_OPTION = re.compile(r"\s+--(?:hash|global-option|install-option|config-settings)(?:\s*=\s*|\s+)\S+")
+
+
 def strip_matching_quotes(value: str) -> str:
     """Strip matching single or double quotes from a string."""
     if len(value) >= 2 and value[0] == value[-1] and value[0] in {'"', "'"}:
@@ -55,6 +77,8 @@ def parse_requirement_line(line: str) -> str | None:
         stripped = parts[1].strip() if len(parts) == 2 else ""
 
     stripped = strip_inline_comment(stripped)
+    if " --" in stripped:
+        stripped = _REQUIREMENT_OPTION.sub("", stripped)
     if not stripped:
         return None
 
@@ -64,28 +88,178 @@ def parse_requirement_line(line: str) -> str | None:
     return strip_matching_quotes(stripped)
 
 
+def iter_logical_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Join backslash-continued lines as pip does, yielding one logical line at a time.
+
+    Continuation lines holding only a ``--hash`` option are dropped rather than
+    joined, which keeps the hash blocks pip-compile writes from building up.
+
+    Args:
+        lines: Physical lines, e.g. an open file.
+
+    Yields:
+        Logical lines without their line endings.
+    """
+    pending: list[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        continued = line.endswith("\\")
+        if pending and line.lstrip().startswith("--hash"):
+            if not continued:
+                yield "".join(pending)
+                pending = []
+            continue
+        if continued and not line.lstrip().startswith("#"):
+            pending.append(line[:-1])
+            continue
+        if pending:
+            pending.append(line)
+            line = "".join(pending)
+            pending = []
+        yield line
+    if pending:
+        yield "".join(pending)
+
+
+def iter_requirement_entries(lines: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Parse requirements lines incrementally.
+
+    Args:
+        lines: Physical lines, e.g. an open file.
+
+    Yields:
+        ``("requirement", spec)`` for each requirement and ``("include", path)`` for each
+        ``-r`` line, with the path as written.
+    """
+    for line in iter_logical_lines(lines):
+        include = parse_include_line(line)
+        if include is not None:
+            yield "include", include
+            continue
+        parsed = parse_requirement_line(line)
+        if parsed:
+            yield "requirement", parsed
+
+
+def parse_include_line(line: str) -> str | None:
+    """Return the file named by a ``-r``/``--requirement`` line, or None for any other line."""
+    match = _INCLUDE_LINE.match(line)
+    return strip_matching_quotes(match.group("path")) if match else None
+
+
+class RequirementsCache:
+    """
+    Parsed requirements files for one run, keyed by resolved path.
+
+    Share one instance across projects (as batch runs do) so that a file
+    included by many projects is read and parsed once. Threads reading
+    different files parse them concurrently; threads asking for the same
+    file wait for the one parsing it.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty cache."""
+        self._files: dict[str, tuple[tuple[str, str], ...]] = {}
+        self._path_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def entries(self, path: str) -> tuple[tuple[str, str], ...]:
+        """
+        Return a file's entries in order: ``("requirement", spec)`` or ``("include", resolved_path)``.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is not None:
+                return cached
+            path_lock = self._path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            with self._lock:
+                cached = self._files.get(path)
+            if cached is None:
+                cached = self._parse(path)
+                with self._lock:
+                    self._files[path] = cached
+            return cached
+
+    @staticmethod
+    def _parse(path: str) -> tuple[tuple[str, str], ...]:
+        base = os.path.dirname(path)
+        with open(path, encoding="utf-8") as file:
+            return tuple(
+                (kind, os.path.realpath(os.path.join(base, value)) if kind == "include" else value)
+                for kind, value in iter_requirement_entries(file)
+            )
+
+
+def collect_requirements(source: Path, cache: RequirementsCache | None = None) -> list[str]:
+    """
+    Collect the requirements of a file and everything it includes, in order and without repeats.
+
+    Args:
+        source: The requirements file.
+        cache: Parsed files to reuse; a fresh cache is used if omitted.
+
+    Returns:
+        The requirement strings.
+
+    Raises:
+        OSError: If ``source`` itself cannot be read. Unreadable includes are skipped with a warning.
+    """
+    cache = cache or RequirementsCache()
+    requirements: dict[str, None] = {}
+    expanded: set[str] = set()
+
+    def visit(path: str, chain: tuple[str, ...]) -> None:
+        if path in chain:
+            cycle = " -> ".join(os.path.basename(item) for item in (*chain[chain.index(path) :], path))
+            logger.warning(f"Skipping requirements include cycle: {cycle}")
+            return
+        if path in expanded:
+            return
+        expanded.add(path)
+        try:
+            entries = cache.entries(path)
+        except OSError as e:
+            if not chain:
+                raise
+            logger.warning(f"Could not read {path} included from {chain[-1]}: {e}")
+            return
+        for kind, value in entries:
+            if kind == "include":
+                visit(value, (*chain, path))
+            else:
+                requirements.setdefault(value)
+
+    visit(os.path.realpath(source), ())
+    return list(requirements)
+
+
 def infer_project_name(source_path: Path) -> str:
     """Infer a project name from the requirements file location."""
     return source_path.resolve().parent.name
 
 
-def read_requirements_txt_metadata(source: str = "requirements.txt", name: str = "") -> dict[str, Any]:
+def read_requirements_txt_metadata(
+    source: str = "requirements.txt", name: str = "", cache: RequirementsCache | None = None
+) -> dict[str, Any]:
     """
-    Read dependency metadata from a requirements.txt file.
+    Read dependency metadata from a requirements.txt file, following ``-r`` includes.
 
     Args:
         source: Path to the requirements file.
         name: Optional explicit project name override.
+        cache: Parsed files shared with other reads in the same run.
 
     Returns:
         Minimal metadata containing the project name and dependencies.
     """
     source_path = Path(source)
-    requirements = []
-    for line in source_path.read_text(encoding="utf-8").splitlines():
-        parsed = parse_requirement_line(line)
-        if parsed:
-            requirements.append(parsed)
+    requirements = collect_requirements(source_path, cache)
 
     project_name = name or infer_project_name(source_path)
     metadata: dict[str, Any] = {"name": project_name, "dependencies": requirements}
@@ -93,7 +267,12 @@ def read_requirements_txt_metadata(source: str = "requirements.txt", name: str =
 
 
 def generate_from_requirements_txt(
-    name: str = "", source: str = "requirements.txt", output: str = "__about__.py", validate: bool = False
+    name: str = "",
+    source: str = "requirements.txt",
+    output: str = "__about__.py",
+    validate: bool = False,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the metadata file from requirements.txt.
@@ -103,6 +282,7 @@ def generate_from_requirements_txt(
         source: Path to the requirements.txt file.
         output: Name of the file to write to.
         validate: Validate file after writing.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written.
@@ -117,9 +297,10 @@ def generate_from_requirements_txt(
     else:
         dir_path = f"./{project_name}"
 
-    about_content, names = any_metadict(metadata)
+    record = ProjectMetadata(metadata)
+    about_content, names = any_metadict(record, precompute=precompute)
     about_content = merge_sections(names, project_name, about_content)
     file_path = write_to_file(dir_path, about_content, output)
     if validate:
-        validate_about_file(file_path, metadata)
+        validate_about_file(file_path, record)
     return file_path
@@ -9,21 +9,46 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from metametameta.directives import DirectiveError, parse_package_dir, resolve_directive
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
 
 logger = logging.getLogger(__name__)
 
 
 def parse_cfg_list(value: str) -> list[str]:
-    """Parse a setup.cfg multiline list value."""
-    return [line.strip() for line in value.splitlines() if line.strip()]
+    """Parse a setup.cfg multiline list value, skipping comment lines (e.g. from a ``file:`` requirements list)."""
+    return [line.strip() for line in value.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def resolve_cfg_value(key: str, value: str, root: Path, package_dir: dict[str, str]) -> Any:
+    """
+    Resolve an ``attr:``/``file:`` directive statically, keeping the raw value if that is impossible.
+
+    Args:
+        key: The option name, for the warning.
+        value: The raw option value.
+        root: Directory holding setup.cfg.
+        package_dir: The ``[options] package_dir`` mapping.
+
+    Returns:
+        The resolved value, or ``value`` unchanged.
+    """
+    try:
+        return resolve_directive(value, root, package_dir)
+    except DirectiveError as e:
+        logger.warning(f"Could not resolve {key} = {value.strip()} without importing the package: {e}")
+        return value
 
 
 def read_setup_cfg_metadata(setup_cfg_path: Path | None = None) -> dict[str, Any]:
     """
     Read the setup.cfg file and extract the [metadata] section.
 
+    ``attr:`` and ``file:`` directives are resolved the setuptools way, but by
+    reading the module's source with ``ast`` instead of importing it.
+
     Args:
         setup_cfg_path: Path to the setup.cfg file. Defaults to "setup.cfg".
 
@@ -44,16 +69,32 @@ def read_setup_cfg_metadata(setup_cfg_path: Path | None = None) -> dict[str, Any
     else:
         config.read(setup_cfg_path, encoding="utf-8")
 
+    root = setup_cfg_path.parent
+    package_dir = {}
+    if config.has_option("options", "package_dir"):
+        package_dir = parse_package_dir(config.get("options", "package_dir"))
+
     # Extract the [metadata] section
-    metadata: dict[str, Any] = dict(config.items("metadata")) if config.has_section("metadata") else {}
-    if config.has_section("options") and config.has_option("options", "install_requires"):
-        metadata["dependencies"] = parse_cfg_list(config.get("options", "install_requires"))
+    metadata: dict[str, Any] = {}
+    if config.has_section("metadata"):
+        for key, value in config.items("metadata"):
+            metadata[key] = resolve_cfg_value(key, value, root, package_dir)
+    if config.has_option("options", "install_requires"):
+        install_requires = resolve_cfg_value(
+            "install_requires", config.get("options", "install_requires"), root, package_dir
+        )
+        metadata["dependencies"] = parse_cfg_list(str(install_requires))
     return metadata
 
 
 # pylint: disable=unused-argument
 def generate_from_setup_cfg(
-    name: str = "", source: str = "setup.cfg", output: str = "__about__.py", validate: bool = True
+    name: str = "",
+    source: str = "setup.cfg",
+    output: str = "__about__.py",
+    validate: bool = True,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the __about__.py file from the setup.cfg file.
@@ -63,6 +104,7 @@ def generate_from_setup_cfg(
         source: Path to the setup.cfg file.
         output: Name of the file to write to.
         validate: Check if top level values are in about file after written.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written.
@@ -77,9 +119,10 @@ def generate_from_setup_cfg(
             dir_path = f"./{project_name}"
 
         # Define the content to write to the __about__.py file
+        record = ProjectMetadata(metadata)
         result_tuple = None
         try:
-            result_tuple = any_metadict(metadata)
+            result_tuple = any_metadict(record, precompute=precompute)
             about_content, names = result_tuple
         except Exception:
             logger.warning("Can't parse metadata")
@@ -89,7 +132,7 @@ def generate_from_setup_cfg(
         file_path = write_to_file(dir_path, about_content, output)
 
         if validate:
-            validate_about_file(file_path, metadata)
+            validate_about_file(file_path, record)
 
         return file_path
     logger.debug("No [metadata] section found in setup.cfg.")
@@ -7,22 +7,195 @@ from __future__ import annotations
 
 import ast
 import logging
+import re
 from pathlib import Path
 from typing import Any
 
 from metametameta.filesystem import write_to_file
 from metametameta.general import any_metadict, merge_sections, validate_about_file
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.setup_py_runner import SetupPyRunError, SetupPyRunner
+from metametameta.static_eval import NotStaticError, StaticEvaluator
 
 logger = logging.getLogger(__name__)
 
 
+# Strings and comments, matched whole so that nothing inside them is mistaken for code.
+_SKIP = r"""
+    [rRbBuUfF]{0,2}\"\"\"(?:\\.|[^\\])*?\"\"\"
+  | [rRbBuUfF]{0,2}'''(?:\\.|[^\\])*?'''
+  | [rRbBuUfF]{0,2}"(?:\\.|[^"\\\n])*"
+  | [rRbBuUfF]{0,2}'(?:\\.|[^'\\\n])*'
+  | \#[^\n]*
+"""
+
+# Finds the first ``setup(`` call in the source text (a ``def setup(`` is not a call).
+_SETUP_CALL_SCANNER = re.compile(
+    rf"(?P<skip>{_SKIP} | \bdef[ \t]+setup\b) | (?P<call>\bsetup[ \t]*\()",
+    re.VERBOSE,
+)
+
+# Finds where the top-level statement around the call ends: brackets are tracked, and
+# the statement ends at the first line that starts in column zero outside any bracket.
+_STATEMENT_END_SCANNER = re.compile(
+    rf"(?P<skip>{_SKIP}) | (?P<open>[([{{]) | (?P<close>[)\]}}]) | (?P<line>\n(?=[^\s\#)\]}}]))",
+    re.VERBOSE,
+)
+
+
+def setup_source_prefix(source_code: str) -> str:
+    """
+    Cut setup.py source after the top-level statement holding the first ``setup(`` call.
+
+    Everything after that statement is irrelevant to the call, so it is never
+    parsed. The cut is a guess made from the text: callers must fall back to
+    the full source if the prefix does not parse or holds no setup() call.
+
+    Args:
+        source_code: The full setup.py source.
+
+    Returns:
+        The prefix to parse, or the full source if no cut point was found.
+    """
+    call = next((token for token in _SETUP_CALL_SCANNER.finditer(source_code) if token.lastgroup == "call"), None)
+    if call is None:
+        return source_code
+
+    depth = 1  # the call's own opening parenthesis
+    for token in _STATEMENT_END_SCANNER.finditer(source_code, call.end()):
+        kind = token.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth -= 1
+        elif kind == "line" and depth <= 0:
+            return source_code[: token.end()]
+    return source_code
+
+
+def is_setup_call(node: ast.AST) -> bool:
+    """Return True for ``setup(...)`` and ``setuptools.setup(...)`` style calls."""
+    if not isinstance(node, ast.Call):
+        return False
+    if isinstance(node.func, ast.Name):
+        return node.func.id == "setup"
+    # This covers `setuptools.setup()`
+    return isinstance(node.func, ast.Attribute) and node.func.attr == "setup"
+
+
+def _contains_setup_call(node: ast.AST) -> bool:
+    return any(is_setup_call(child) for child in ast.walk(node))
+
+
+def setup_call_kwargs(
+    call: ast.Call, evaluator: StaticEvaluator, scope: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """
+    Evaluate the keyword arguments of a setup() call.
+
+    Args:
+        call: The setup() call.
+        evaluator: Evaluates keyword values against the module's symbol table.
+        scope: Local names visible at the call, e.g. inside a ``main()`` function.
+
+    Returns:
+        The keywords whose values could be computed statically, ``**dict`` arguments merged in.
+    """
+    kwargs: dict[str, Any] = {}
+    for keyword in call.keywords:
+        try:
+            # Evaluate statically: literals, known names, **dicts and safe file reads
+            value = evaluator.evaluate(keyword.value, scope)
+        except NotStaticError as e:
+            # This happens if the value is computed by code we will not run
+            logger.warning(
+                f"Could not statically parse value for '{keyword.arg or '**'}' in setup.py ({e}). Only values computable from literals, module constants and project files are supported."
+            )
+            continue
+        if keyword.arg:
+            kwargs[keyword.arg] = value
+        elif isinstance(value, dict):
+            kwargs.update((key, item) for key, item in value.items() if isinstance(key, str))
+    return kwargs
+
+
+def find_setup_call(
+    statements: list[ast.stmt], evaluator: StaticEvaluator, scope: dict[str, Any] | None = None
+) -> tuple[ast.Call, dict[str, Any] | None] | None:
+    """
+    Run statements in order until the first setup() call and return it.
+
+    Besides top-level calls, the call is found inside the usual wrappers:
+    ``if __name__ == "__main__":`` (or any other ``if``), ``with`` and ``try``
+    blocks, and the body of a ``def main():`` style function. Statements after
+    the call are never evaluated, so the symbol table holds exactly what was
+    bound when setup() ran.
+
+    Args:
+        statements: The statements to scan.
+        evaluator: Records module-level values as statements are passed.
+        scope: The namespace statements bind into. Defaults to the module symbol table.
+
+    Returns:
+        The call and the scope its arguments should be evaluated in, or None if there is no call.
+    """
+    for statement in statements:
+        value = getattr(statement, "value", None)
+        if isinstance(statement, (ast.Expr, ast.Assign, ast.AnnAssign, ast.Return)) and isinstance(value, ast.Call):
+            if is_setup_call(value):
+                return value, scope
+        if _contains_setup_call(statement):
+            found = _find_in_wrapper(statement, evaluator, scope)
+            if found is not None:
+                return found
+        evaluator.run([statement], scope)
+    return None
+
+
+def _find_in_wrapper(
+    statement: ast.stmt, evaluator: StaticEvaluator, scope: dict[str, Any] | None
+) -> tuple[ast.Call, dict[str, Any] | None] | None:
+    """Look for the setup() call inside a compound statement."""
+    if isinstance(statement, ast.If):
+        try:
+            branches = [statement.body if evaluator.evaluate(statement.test, scope) else statement.orelse]
+        except NotStaticError:
+            branches = [statement.body, statement.orelse]
+        for branch in branches:
+            found = find_setup_call(branch, evaluator, scope)
+            if found is not None:
+                return found
+    elif isinstance(statement, ast.With):
+        evaluator.enter_with(statement, scope)
+        return find_setup_call(statement.body, evaluator, scope)
+    elif isinstance(statement, ast.Try):
+        return find_setup_call([*statement.body, *statement.orelse, *statement.finalbody], evaluator, scope)
+    elif isinstance(statement, ast.FunctionDef):
+        # Module names remain visible; the function's own assignments go to a local scope.
+        evaluator.run([statement], scope)
+        return find_setup_call(statement.body, evaluator, {} if scope is None else dict(scope))
+    return None
+
+
 class SetupKwargsVisitor(ast.NodeVisitor):
     """An AST visitor to find keyword arguments in a setup() call."""
 
-    def __init__(self) -> None:
-        """Initialize the AST visitor to find keyword arguments in a setup() call."""
+    def __init__(self, evaluator: StaticEvaluator | None = None) -> None:
+        """
+        Initialize the AST visitor to find keyword arguments in a setup() call.
+
+        Args:
+            evaluator: Evaluates keyword values against the module's symbol table.
+                Without one, only literals and whitelisted calls are understood.
+        """
         self.kwargs: dict[str, Any] = {}
         self.found = False
+        self.evaluator = evaluator or StaticEvaluator()
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Stop descending into the tree once the setup() call has been found."""
+        if not self.found:
+            super().generic_visit(node)
 
     def visit_Call(self, node: ast.Call) -> None:
         """
@@ -31,30 +204,12 @@ class SetupKwargsVisitor(ast.NodeVisitor):
         Looks for setup() function calls and extracts keyword arguments.
         Only captures the first valid setup() call found.
         """
-        # Only capture the first valid setup() call we find.
         if self.found:
             return
-
-        func_is_setup = False
-        if isinstance(node.func, ast.Name) and node.func.id == "setup":
-            func_is_setup = True
-        elif isinstance(node.func, ast.Attribute) and node.func.attr == "setup":
-            # This covers `setuptools.setup()`
-            func_is_setup = True
-
-        if func_is_setup:
-            for keyword in node.keywords:
-                if keyword.arg:  # Ensure there is an argument name
-                    try:
-                        # Safely evaluate the value of the keyword argument
-                        self.kwargs[keyword.arg] = ast.literal_eval(keyword.value)
-                    except (ValueError, TypeError, SyntaxError):
-                        # This happens if the value is not a literal (e.g., a variable)
-                        logger.warning(
-                            f"Could not statically parse value for '{keyword.arg}' in setup.py. Only literals (strings, numbers, lists, etc.) are supported."
-                        )
+        if is_setup_call(node):
+            self.kwargs = setup_call_kwargs(node, self.evaluator)
             self.found = True
-
+            return
         # Continue traversing to find the call if it's nested
         self.generic_visit(node)
 
@@ -63,7 +218,11 @@ def read_setup_py_metadata(source: str = "setup.py") -> dict[str, Any]:
     """
     Read a setup.py file and extract metadata from the setup() call using AST.
 
-    This method does not execute the file, it only parses it statically.
+    This method does not execute the file. Statements before the setup() call
+    are evaluated symbolically (see :mod:`metametameta.static_eval`) so values
+    such as ``version=VERSION``, ``setup(**metadata)`` or a version read from
+    ``pkg/_version.py`` are resolved. Only the source up to the statement
+    holding the call is parsed; whatever follows it is skipped.
 
     Args:
         source: Path to the setup.py file.
@@ -78,17 +237,61 @@ def read_setup_py_metadata(source: str = "setup.py") -> dict[str, Any]:
 
     try:
         source_code = source_path.read_text(encoding="utf-8")
-        tree = ast.parse(source_code)
-        visitor = SetupKwargsVisitor()
-        visitor.visit(tree)
-        return visitor.kwargs
+        prefix = setup_source_prefix(source_code)
+        found = None
+        if len(prefix) < len(source_code):
+            try:
+                evaluator = StaticEvaluator(source_path)
+                found = find_setup_call(ast.parse(prefix).body, evaluator)
+            except SyntaxError:
+                found = None
+        if found is None:
+            logger.debug(f"Parsing all of {source} to find the setup() call")
+            evaluator = StaticEvaluator(source_path)
+            tree = ast.parse(source_code)
+            found = find_setup_call(tree.body, evaluator)
+            if found is None:
+                # The call sits somewhere unusual (a loop, a class body): search the whole tree.
+                visitor = SetupKwargsVisitor(evaluator)
+                visitor.visit(tree)
+                return visitor.kwargs
+        call, scope = found
+        return setup_call_kwargs(call, evaluator, scope)
     except (SyntaxError, UnicodeDecodeError) as e:
         logger.error(f"Failed to parse {source}: {e}")
         return {}
 
 
+def read_setup_py_metadata_with_fallback(source: str, runner: SetupPyRunner) -> dict[str, Any]:
+    """
+    Read setup.py statically, executing it if the name or version is missing.
+
+    Args:
+        source: Path to the setup.py file.
+        runner: Executes setup.py files.
+
+    Returns:
+        The statically read metadata, overlaid with the executed setup() arguments when needed.
+    """
+    metadata = read_setup_py_metadata(source)
+    if metadata.get("name") and metadata.get("version"):
+        return metadata
+    try:
+        executed = runner.read(source)
+    except SetupPyRunError as e:
+        logger.warning(f"Executing {source} did not help: {e}")
+        return metadata
+    return {**metadata, **executed}
+
+
 def generate_from_setup_py(
-    name: str = "", source: str = "setup.py", output: str = "__about__.py", validate: bool = False
+    name: str = "",
+    source: str = "setup.py",
+    output: str = "__about__.py",
+    validate: bool = False,
+    execute: bool = False,
+    *,
+    precompute: bool = False,
 ) -> str:
     """
     Generate the __about__.py file from a setup.py file.
@@ -98,11 +301,18 @@ def generate_from_setup_py(
         source: Path to the setup.py file.
         output: Name of the file to write to.
         validate: Validate file after writing.
+        execute: Execute setup.py (project code, unsandboxed) in a worker process if static parsing misses the
+            name or version.
+        precompute: Also emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
 
     Returns:
         Path to the file that was written, or a message if no metadata was found.
     """
-    metadata = read_setup_py_metadata(source)
+    if execute:
+        with SetupPyRunner(workers=1) as runner:
+            metadata = read_setup_py_metadata_with_fallback(source, runner)
+    else:
+        metadata = read_setup_py_metadata(source)
     if not metadata:
         message = "No setup() call with static metadata found in setup.py."
         logger.debug(message)
@@ -113,10 +323,11 @@ def generate_from_setup_py(
     if not project_name:
         raise ValueError("Project 'name' not found in setup.py and not provided via arguments.")
 
-    about_content, names = any_metadict(metadata)
+    record = ProjectMetadata(metadata)
+    about_content, names = any_metadict(record, precompute=precompute)
     about_content = merge_sections(names, project_name, about_content)
 
     file_path = write_to_file(project_name, about_content, output)
     if validate:
-        validate_about_file(file_path, metadata)
+        validate_about_file(file_path, record)
     return file_path
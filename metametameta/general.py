@@ -7,13 +7,38 @@ from __future__ import annotations
 import json
 import logging
 import re
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from pathlib import Path
 from typing import Any
 
+from metametameta.lockfiles import pin_requirements
+from metametameta.project_metadata import ProjectMetadata
+
 logger = logging.getLogger(__name__)
 preferred_line_length = 120
 
+# Keys that undergo complex transformations during generation, so their raw
+# values are not expected verbatim in the generated file.
+VALIDATION_SKIPPED_KEYS = frozenset({"classifiers", "authors", "name"})  # 'name' is transformed to '__title__'
+
+# A PEP 440 version, split into the parts __version_info__ is built from.
+_PEP440_VERSION = re.compile(
+    r"""^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?:[-_.]?(?P<pre_label>alpha|beta|preview|pre|rc|a|b|c)[-_.]?(?P<pre_number>[0-9]+)?)?
+    (?P<post>-(?P<post_implicit>[0-9]+)|[-_.]?(?:post|rev|r)[-_.]?(?P<post_number>[0-9]+)?)?
+    (?P<dev>[-_.]?dev[-_.]?(?P<dev_number>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$""",
+    re.VERBOSE | re.IGNORECASE,
+)
+_PRE_RELEASE_LABELS = {"alpha": "a", "beta": "b", "c": "rc", "pre": "rc", "preview": "rc"}
+
+# The phase at index 3 of __version_info__, ranked so tuples sort the way PEP 440 versions do.
+VERSION_PHASES = {"dev": 0, "a": 1, "b": 2, "rc": 3, "final": 4, "post": 5}
+VERSION_RELEASE_LENGTH = 3
+
 
 def indent_multiline_value(value: str, indent: str) -> str:
     """Indent each line in a multiline rendered value."""
@@ -30,6 +55,8 @@ def render_python_value(value: Any, indent: int = 0) -> str:
         return "None"
     if isinstance(value, (int, float)):
         return str(value)
+    if isinstance(value, tuple):
+        return render_tuple(value, indent)
     if isinstance(value, list):
         inline = "[" + ", ".join(render_python_value(item) for item in value) + "]"
         if len(inline) <= preferred_line_length - indent:
@@ -66,7 +93,15 @@ def render_python_value(value: Any, indent: int = 0) -> str:
     return repr(value)
 
 
-def render_collection_assignment(variable_name: str, value: list[Any] | dict[str, Any]) -> str:
+def render_tuple(value: tuple[Any, ...], indent: int = 0) -> str:
+    """Render a tuple literal in the same layout as a list, with the trailing comma a single item needs."""
+    if len(value) == 1:
+        return f"({render_python_value(value[0], indent)},)"
+    rendered = render_python_value(list(value), indent)
+    return f"({rendered[1:-1]})"
+
+
+def render_collection_assignment(variable_name: str, value: list[Any] | tuple[Any, ...] | dict[str, Any]) -> str:
     """Render a collection assignment in a formatter-stable layout."""
     inline_assignment = f"__{variable_name}__ = {render_python_value(value)}"
     if len(inline_assignment) <= preferred_line_length:
@@ -82,6 +117,68 @@ def render_string_list(variable_name: str, values: list[str]) -> str:
     return f"__{variable_name}__: list[str] = []"
 
 
+def render_string_tuple(variable_name: str, values: list[str]) -> str:
+    """Render a string list as an immutable tuple assignment, annotating empty tuples for static typing."""
+    if values:
+        return render_collection_assignment(variable_name, tuple(values))
+    return f"__{variable_name}__: tuple[str, ...] = ()"
+
+
+def version_info(version: str) -> tuple[int, int, int, int, int] | None:
+    """
+    Split a PEP 440 version into a ``sys.version_info`` style tuple that sorts like the version.
+
+    The layout is ``(major, minor, micro, phase, serial)``, all integers. The release is
+    padded with zeros to three numbers. ``phase`` ranks the kind of release, see
+    :data:`VERSION_PHASES`: dev 0 < alpha 1 < beta 2 < candidate 3 < final 4 < post 5,
+    and ``serial`` is the number that goes with it (0 for a final release). So
+    ``1.0.dev1 < 1.0a1 < 1.0rc1 < 1.0 < 1.0.post1`` holds for the tuples too. As with
+    ``sys.version_info``, comparing against a release prefix such as ``(1, 0)`` looks at the
+    release only; compare against ``(1, 0, 0, 4, 0)`` to exclude pre-releases. A local
+    version is left out.
+
+    Versions that do not fit the layout have no tuple: those with an epoch, more than
+    three non-zero release numbers, or more than one of the pre, post and dev parts
+    (``1.0a1.dev2``, ``1.0.post1.dev1``).
+
+    Examples:
+        >>> version_info("1.2")
+        (1, 2, 0, 4, 0)
+        >>> version_info("2.0.0RC1+g1a2b3c4")
+        (2, 0, 0, 3, 1)
+        >>> version_info("2.0.0rc1") < version_info("2.0.0") < version_info("2.0.0.post1")
+        True
+
+    Args:
+        version: The version string.
+
+    Returns:
+        The tuple, or None for versions that are not PEP 440 or do not fit the layout.
+    """
+    match = _PEP440_VERSION.match(version)
+    if match is None or match.group("epoch"):
+        return None
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > VERSION_RELEASE_LENGTH and release[-1] == 0:
+        release.pop()
+    if len(release) > VERSION_RELEASE_LENGTH:
+        return None
+    release += [0] * (VERSION_RELEASE_LENGTH - len(release))
+
+    phases = []
+    if match.group("pre_label"):
+        label = match.group("pre_label").lower()
+        phases.append((VERSION_PHASES[_PRE_RELEASE_LABELS.get(label, label)], int(match.group("pre_number") or 0)))
+    if match.group("post") is not None:
+        phases.append((VERSION_PHASES["post"], int(match.group("post_implicit") or match.group("post_number") or 0)))
+    if match.group("dev") is not None:
+        phases.append((VERSION_PHASES["dev"], int(match.group("dev_number") or 0)))
+    if len(phases) > 1:
+        return None
+    phase, serial = phases[0] if phases else (VERSION_PHASES["final"], 0)
+    return release[0], release[1], release[2], phase, serial
+
+
 def get_all_primitive_values(data: Any) -> Iterable[str]:
     """Finds all top level primitive values (str, int, float) in a nested structure."""
     if isinstance(data, str):
@@ -93,7 +190,7 @@ def get_all_primitive_values(data: Any) -> Iterable[str]:
             yield from get_all_primitive_values(item)
 
 
-def validate_about_file(file_path: str, metadata: dict[str, Any]) -> None:
+def validate_about_file(file_path: str, metadata: Mapping[str, Any]) -> None:
     """
     Validates the generated __about__.py file.
 
@@ -104,7 +201,7 @@ def validate_about_file(file_path: str, metadata: dict[str, Any]) -> None:
 
     Args:
         file_path: The path to the generated __about__.py file.
-        metadata: The source metadata dictionary used for generation.
+        metadata: The source metadata (a dict or a ProjectMetadata record) used for generation.
 
     Raises:
         FileNotFoundError: If the file does not exist.
@@ -115,45 +212,55 @@ def validate_about_file(file_path: str, metadata: dict[str, Any]) -> None:
     if not path.is_file():
         raise FileNotFoundError(f"Validation failed: Output file not found at {file_path}")
 
-    content = path.read_text(encoding="utf-8")
+    validate_about_content(path.read_text(encoding="utf-8"), metadata, file_path)
+
+
+def validate_about_content(content: str, metadata: Mapping[str, Any], label: str = "generated content") -> None:
+    """
+    Validates rendered __about__.py content without reading it back from disk.
+
+    Args:
+        content: The rendered file content.
+        metadata: The source metadata (a dict or a ProjectMetadata record) used for generation.
+        label: How to refer to the content in error messages, usually its file path.
 
-    # Create a copy and remove keys that undergo complex transformations
-    # to avoid brittle checks.
-    metadata_to_validate = metadata.copy()
-    metadata_to_validate.pop("classifiers", None)
-    metadata_to_validate.pop("authors", None)
-    metadata_to_validate.pop("name", None)  # 'name' is transformed to '__title__'
+    Raises:
+        ValueError: If a metadata value is not found in the content.
+    """
+    # Leave out keys that undergo complex transformations to avoid brittle checks.
+    record = ProjectMetadata.from_mapping(metadata)
+    metadata_to_validate = {key: value for key, value in record.items() if key not in VALIDATION_SKIPPED_KEYS}
 
     primitive_values = set(get_all_primitive_values(metadata_to_validate))
 
     for value in primitive_values:
         if value not in content:
             raise ValueError(
-                f"Validation failed: Value '{value}' not found in {file_path}. The file may be incomplete or missing critical metadata."
+                f"Validation failed: Value '{value}' not found in {label}. The file may be incomplete or missing critical metadata."
             )
 
     logger.info("Validation successful.")
 
 
-def any_metadict(metadata: dict[str, str | int | float | list[str]]) -> tuple[str, list[str]]:
+def any_metadict(
+    metadata: Mapping[str, Any], pins: Mapping[str, str] | None = None, precompute: bool = False
+) -> tuple[str, list[str]]:
     """
     Generate __about__.py content from a metadata dictionary.
 
     Args:
-        metadata: Dictionary containing project metadata.
+        metadata: Project metadata, either a raw reader dict or a ProjectMetadata record.
+        pins: A lockfile index (see :mod:`metametameta.lockfiles`). When given,
+            ``__dependencies__`` lists the locked versions instead of the declared ranges.
+        precompute: Also emit ``__version_info__`` (see :func:`version_info`) and make
+            ``__dependencies__`` a tuple, so importers need neither ``packaging`` nor a copy.
 
     Returns:
         A tuple containing the file content and list of variable names.
     """
-    # Normalize keys to lowercase for consistent processing from different sources.
-    processed_meta = {k.lower().replace("-", "_"): v for k, v in metadata.items()}
-    if "install_requires" in processed_meta and "dependencies" not in processed_meta:
-        processed_meta["dependencies"] = processed_meta.pop("install_requires")
-
-    # Prioritize 'summary' (from importlib.metadata) for the short description.
-    # If 'summary' exists, use it for 'description', overwriting the long one.
-    if "summary" in processed_meta:
-        processed_meta["description"] = processed_meta.pop("summary")
+    # Normalize keys for consistent processing from different sources. Records
+    # are already normalized and pass through untouched.
+    processed_meta = ProjectMetadata.from_mapping(metadata)
 
     lines = []
     names = []
@@ -202,7 +309,10 @@ def any_metadict(metadata: dict[str, str | int | float | list[str]]) -> tuple[st
             lines.append(render_collection_assignment("keywords", value))
             names.append("__keywords__")
         elif key == "dependencies" and isinstance(value, list):
-            lines.append(render_string_list("dependencies", value))
+            if pins is not None:
+                value = pin_requirements(value, pins)
+            render = render_string_tuple if precompute else render_string_list
+            lines.append(render("dependencies", value))
             names.append("__dependencies__")
 
         # elif key in meta:
@@ -211,10 +321,13 @@ def any_metadict(metadata: dict[str, str | int | float | list[str]]) -> tuple[st
             if not isinstance(value, (str, int, float)):
                 logger.debug(f"Skipping: {str(key)}")
                 continue
-            variable_name = key.lower().replace("-", "_")
             quoted_value = safe_quote(value)
-            lines.append(f"__{variable_name}__ = {quoted_value}")
-            names.append(f"__{variable_name}__")
+            lines.append(f"__{key}__ = {quoted_value}")
+            names.append(f"__{key}__")
+            info = version_info(str(value)) if precompute and key == "version" else None
+            if info is not None:
+                lines.append(f"__version_info__ = {render_python_value(info)}")
+                names.append("__version_info__")
     about_content = "\n".join(lines)
     if logger.isEnabledFor(logging.DEBUG):
         for line in lines:
@@ -234,6 +347,38 @@ def merge_sections(names: list[str] | None, project_name: str, about_content: st
     Returns:
         The complete __about__.py file content.
     """
+    return about_docstring(project_name) + about_body(names, about_content)
+
+
+def about_docstring(project_name: str) -> str:
+    """
+    Render the module docstring that opens an __about__.py file.
+
+    Args:
+        project_name: Name of the project (or package) for the docstring.
+
+    Returns:
+        The docstring followed by a blank line.
+    """
+    if project_name:
+        return f"""\"\"\"Metadata for {project_name}.\"\"\"\n\n"""
+    return """\"\"\"Metadata.\"\"\"\n\n"""
+
+
+def about_body(names: list[str] | None, about_content: str) -> str:
+    """
+    Render everything after the docstring: ``__all__`` and the assignments.
+
+    The body depends only on the metadata, so callers writing several files
+    from one source can render it once and vary only the docstring.
+
+    Args:
+        names: Names of the variables to include in __all__.
+        about_content: Content of the __about__.py file.
+
+    Returns:
+        The __all__ header and assignments.
+    """
     if names is None:
         names = []
     names = sorted(dict.fromkeys(names))
@@ -241,11 +386,7 @@ def merge_sections(names: list[str] | None, project_name: str, about_content: st
     all_header = f"__all__ = {exported_names}"
     if len(all_header) > preferred_line_length:
         all_header = f"__all__ = {render_python_value(names)}"
-    if project_name:
-        docstring = f"""\"\"\"Metadata for {project_name}.\"\"\"\n\n"""
-    else:
-        docstring = """\"\"\"Metadata.\"\"\"\n\n"""
-    return f"{docstring}{all_header}\n\n{about_content}\n"
+    return f"{all_header}\n\n{about_content}\n"
 
 
 def safe_quote(value: int | float | str) -> str:
@@ -0,0 +1,169 @@
+"""
+Resolved dependency versions from lockfiles (uv.lock, poetry.lock, pdm.lock).
+
+All three formats list packages as ``[[package]]`` tables that open with
+``name = "..."`` and ``version = "..."`` lines. Rather than parsing a
+multi-megabyte lockfile as TOML to look up a handful of direct dependencies,
+one regex pass collects just those two keys per package into a name-to-version
+index. Indexes are cached per file signature, so every project sharing a
+workspace lockfile reuses one pass.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from pathlib import Path
+
+from metametameta.directives import file_signature
+from metametameta.pep508 import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Lockfile names in order of preference.
+LOCKFILE_NAMES = ("uv.lock", "poetry.lock", "pdm.lock")
+
+# The lines that matter, at the start of a line: package table headers, any
+# other header (which ends the package's own keys), and the name/version keys.
+_LOCK_LINE = re.compile(
+    rb"""^(?:
+        (?P<package>\[\[package\]\])
+      | (?P<header>\[)
+      | name[ \t]*=[ \t]*"(?P<name>[^"\n]+)"
+      | version[ \t]*=[ \t]*"(?P<version>[^"\n]+)"
+    )""",
+    re.MULTILINE | re.VERBOSE,
+)
+
+# The distribution name and extras at the start of a PEP 508 requirement.
+_REQUIREMENT_NAME = re.compile(r"^\s*(?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)\s*(?P<extras>\[[^\]]*\])?")
+
+
+def parse_lock_index(data: bytes) -> dict[str, str]:
+    """
+    Build a name-to-version index from lockfile contents in one pass.
+
+    Packages locked at more than one version (forked resolutions) are left out,
+    since no single pin is right for them.
+
+    Args:
+        data: The lockfile's bytes.
+
+    Returns:
+        Normalized package names mapped to their locked versions.
+    """
+    index: dict[str, str] = {}
+    ambiguous: set[str] = set()
+    in_package = False
+    name = version = None
+
+    def record() -> None:
+        if name is None or version is None:
+            return
+        key = normalize_name(name)
+        if index.get(key, version) != version:
+            ambiguous.add(key)
+        index[key] = version
+
+    for match in _LOCK_LINE.finditer(data):
+        kind = match.lastgroup
+        if kind == "package":
+            record()
+            in_package, name, version = True, None, None
+        elif kind == "header":
+            in_package = False
+        elif in_package and kind == "name" and name is None:
+            name = match.group("name").decode("utf-8")
+        elif in_package and kind == "version" and version is None:
+            version = match.group("version").decode("utf-8")
+    record()
+    for key in ambiguous:
+        del index[key]
+    return index
+
+
+@lru_cache(maxsize=32)
+def _cached_index(path: str, mtime_ns: int, size: int) -> dict[str, str]:  # pylint: disable=unused-argument
+    with open(path, "rb") as file:
+        return parse_lock_index(file.read())
+
+
+def read_lock_index(path: Path) -> dict[str, str]:
+    """
+    Return the name-to-version index of a lockfile, cached per file signature.
+
+    Args:
+        path: The lockfile.
+
+    Returns:
+        Normalized package names mapped to their locked versions.
+    """
+    return _cached_index(*file_signature(path))
+
+
+def find_lockfile(project_root: Path) -> Path | None:
+    """
+    Find the lockfile for a project: in its root, or in a parent (a uv or pdm workspace root).
+
+    The search stops at the repository root (a directory holding ``.git``).
+
+    Args:
+        project_root: The project's root directory.
+
+    Returns:
+        The lockfile, or None if there is none.
+    """
+    for directory in (project_root, *project_root.resolve().parents):
+        for name in LOCKFILE_NAMES:
+            candidate = directory / name
+            if candidate.is_file():
+                return candidate
+        if (directory / ".git").exists():
+            break
+    return None
+
+
+def pin_requirements(requirements: Iterable[str], pins: Mapping[str, str]) -> list[str]:
+    """
+    Replace the version range of each requirement with its locked version.
+
+    Extras and environment markers are kept; requirements that are not in the
+    lockfile (or are URLs) are returned unchanged.
+
+    Args:
+        requirements: PEP 508 requirement strings.
+        pins: A lockfile index from :func:`read_lock_index`.
+
+    Returns:
+        The pinned requirement strings, e.g. ``requests[socks]==2.32.3; python_version >= "3.9"``.
+    """
+    pinned = []
+    for requirement in requirements:
+        match = _REQUIREMENT_NAME.match(requirement)
+        version = pins.get(normalize_name(match.group("name"))) if match else None
+        if match is None or version is None or "@" in requirement.split(";", 1)[0]:
+            pinned.append(requirement)
+            continue
+        _, semicolon, marker = requirement.partition(";")
+        pin = f"{match.group('name')}{match.group('extras') or ''}=={version}"
+        pinned.append(f"{pin}; {marker.strip()}" if semicolon else pin)
+    return pinned
+
+
+def lock_pins(project_root: Path) -> dict[str, str] | None:
+    """
+    Return the lockfile index for a project, or None if it has no readable lockfile.
+
+    Args:
+        project_root: The project's root directory.
+    """
+    lockfile = find_lockfile(project_root)
+    if lockfile is None:
+        return None
+    try:
+        return read_lock_index(lockfile)
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Could not read lockfile {lockfile}: {e}")
+        return None
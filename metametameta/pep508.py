@@ -0,0 +1,145 @@
+"""
+PEP 508 requirement parsing and normalization.
+
+Every reader hands dependencies on as raw strings, spelled however the source
+spelled them (``Requests >= 2.0``, ``requests>=2.0``, ``requests (>=2.0)``).
+:func:`parse_requirement` turns one into a compact :class:`Requirement` record
+with a canonical name, sorted extras and specifiers, and a whitespace-normalized
+marker, so two spellings of the same requirement compare equal. Parses are
+memoized on the raw string: a batch run over hundreds of projects that share
+``requests>=2`` parses it once.
+
+This is deliberately a subset of PEP 508, enough for normalization rather than
+validation; strings it cannot read are left as they are.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
+
+_REQUIREMENT = re.compile(
+    r"""^\s*
+    (?P<name>[A-Za-z0-9](?:[A-Za-z0-9._-]*[A-Za-z0-9])?)
+    \s*(?:\[(?P<extras>[^\]]*)\])?
+    \s*(?:
+        @\s*(?P<url>[^\s;]+(?:;\S+)*)
+      | \(\s*(?P<parenthesized>[^;()]*?)\s*\)
+      | (?P<specifier>[^;()@]*?)
+    )
+    \s*(?:;\s*(?P<marker>.*?))?\s*$""",
+    re.VERBOSE,
+)
+
+_SPECIFIER_CLAUSE = re.compile(r"^\s*(?P<operator>~=|===|==|!=|<=|>=|<|>)\s*(?P<version>[A-Za-z0-9.*+!_-]+)\s*$")
+
+_MARKER_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'[^']*'|"[^"]*")
+      | (?P<operator>===|==|!=|<=|>=|~=|<|>|\(|\))
+      | (?P<word>[A-Za-z0-9_.]+)
+    )""",
+    re.VERBOSE,
+)
+
+
+class Requirement(NamedTuple):
+    """A parsed requirement in canonical form."""
+
+    name: str
+    extras: tuple[str, ...] = ()
+    specifier: str = ""
+    marker: str = ""
+    url: str = ""
+
+    def __str__(self) -> str:
+        text = self.name
+        if self.extras:
+            text += f"[{','.join(self.extras)}]"
+        if self.url:
+            text += f" @ {self.url}"
+            return f"{text} ; {self.marker}" if self.marker else text
+        text += self.specifier
+        return f"{text}; {self.marker}" if self.marker else text
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as PEP 503 does, so ``Foo_Bar`` finds ``foo-bar``."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def normalize_specifier(specifier: str) -> str | None:
+    """
+    Normalize a specifier set: clauses without whitespace, sorted, comma-separated.
+
+    Returns:
+        The normalized specifier (empty for no specifier), or None if a clause is not a valid specifier.
+    """
+    if not specifier.strip():
+        return ""
+    clauses = []
+    for clause in specifier.split(","):
+        match = _SPECIFIER_CLAUSE.match(clause)
+        if match is None:
+            return None
+        clauses.append(match.group("operator") + match.group("version"))
+    return ",".join(sorted(clauses))
+
+
+def normalize_marker(marker: str) -> str | None:
+    """
+    Normalize an environment marker's whitespace and quoting.
+
+    Returns:
+        The normalized marker, or None if it contains something that is not a marker token.
+    """
+    tokens = []
+    position = 0
+    marker = marker.strip()
+    while position < len(marker):
+        match = _MARKER_TOKEN.match(marker, position)
+        if match is None:
+            return None
+        position = match.end()
+        token = match.group(match.lastgroup or "")
+        if match.lastgroup == "string" and '"' not in token[1:-1]:
+            token = f'"{token[1:-1]}"'
+        tokens.append(token)
+    return " ".join(tokens).replace("( ", "(").replace(" )", ")")
+
+
+@lru_cache(maxsize=4096)
+def parse_requirement(raw: str) -> Requirement | None:
+    """
+    Parse a requirement string, memoized on the raw string.
+
+    Args:
+        raw: A PEP 508 requirement, e.g. ``requests[socks] >= 2 ; python_version < '3.11'``.
+
+    Returns:
+        The canonical record, or None if the string is not a requirement this parser understands.
+    """
+    match = _REQUIREMENT.match(raw)
+    if match is None:
+        return None
+    specifier = normalize_specifier(match.group("parenthesized") or match.group("specifier") or "")
+    marker = normalize_marker(match.group("marker") or "")
+    if specifier is None or marker is None:
+        return None
+    extras = tuple(
+        sorted({normalize_name(extra.strip()) for extra in (match.group("extras") or "").split(",") if extra.strip()})
+    )
+    return Requirement(normalize_name(match.group("name")), extras, specifier, marker, match.group("url") or "")
+
+
+def canonical_requirement(raw: str) -> str:
+    """Return the canonical spelling of a requirement, or the stripped string if it cannot be parsed."""
+    parsed = parse_requirement(raw)
+    return str(parsed) if parsed is not None else raw.strip()
+
+
+def canonical_requirements(requirements: Iterable[str]) -> list[str]:
+    """Return the canonical spelling of each requirement, in order."""
+    return [canonical_requirement(requirement) for requirement in requirements]
@@ -0,0 +1,486 @@
+"""
+Streaming batch pipeline for generating or sync-checking many projects at once.
+
+Projects flow through ``discover -> detect -> read -> render -> write/check/diff``.
+Every stage after discovery runs on its own small thread pool and hands work to
+the next stage through a bounded queue, so memory stays flat however many
+projects a monorepo holds, I/O for one project overlaps with parsing of the
+next, and the first results are reported while discovery is still walking.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from metametameta.autodetect import SourceDetection, detect
+from metametameta.dynamic_version import apply_dynamic_version
+from metametameta.filesystem import compile_files, diff_output, find_existing_package_dir, sync_files, write_output
+from metametameta.find_it import DEFAULT_PRUNED_DIRS, is_pruned_dir
+from metametameta.from_conda_meta import CondaRecipe, read_conda_meta_metadata, read_conda_recipe
+from metametameta.from_pep621 import read_pep621_metadata
+from metametameta.from_poetry import normalize_poetry_metadata, read_poetry_metadata
+from metametameta.from_requirements_txt import RequirementsCache, read_requirements_txt_metadata
+from metametameta.from_setup_cfg import read_setup_cfg_metadata
+from metametameta.from_setup_py import read_setup_py_metadata, read_setup_py_metadata_with_fallback
+from metametameta.general import any_metadict, merge_sections
+from metametameta.lockfiles import lock_pins
+from metametameta.project_metadata import ProjectMetadata
+from metametameta.reports import select_shard
+from metametameta.setup_py_runner import SetupPyRunner
+from metametameta.validate_sync import check_sync
+
+logger = logging.getLogger(__name__)
+
+# Files that make a nested directory a project of its own. requirements.txt is
+# deliberately absent: docs/ and CI folders carry one without being projects.
+PROJECT_MARKERS = ("pyproject.toml", "setup.cfg", "setup.py")
+
+# The batch root also counts as a project if it only has a fallback source.
+ROOT_MARKERS = (*PROJECT_MARKERS, "requirements.txt", "conda/meta.yaml")
+
+# Directories discovery never descends into, on top of find_it's defaults.
+DISCOVERY_PRUNED_DIRS = DEFAULT_PRUNED_DIRS | {"build", "dist", "site-packages"}
+
+DEFAULT_QUEUE_SIZE = 64
+
+# Directories conda recipes live in: feedstocks use recipe/, projects conda/ or conda.recipe/.
+CONDA_RECIPE_DIRS = frozenset({"recipe", "conda", "conda.recipe"})
+
+# Source name -> reader taking the detected source file.
+READERS: dict[str, Callable[[Path], dict[str, Any]]] = {
+    "pep621": lambda path: read_pep621_metadata(source=str(path)),
+    "poetry": lambda path: read_poetry_metadata(source=str(path)),
+    "setup_cfg": lambda path: read_setup_cfg_metadata(setup_cfg_path=path),
+    "setup_py": lambda path: read_setup_py_metadata(source=str(path)),
+    "requirements_txt": lambda path: read_requirements_txt_metadata(source=str(path)),
+    "conda_meta": lambda path: read_conda_meta_metadata(source=str(path)),
+}
+
+
+def read_detected(
+    detection: SourceDetection,
+    runner: SetupPyRunner | None = None,
+    requirements_cache: RequirementsCache | None = None,
+) -> dict[str, Any]:
+    """
+    Read a project's metadata, reusing the table autodetection already parsed.
+
+    Args:
+        detection: The result of :func:`metametameta.autodetect.detect`.
+        runner: Executes setup.py files whose metadata static parsing cannot see.
+        requirements_cache: Requirements files already parsed for other projects in this run.
+
+    Returns:
+        The raw metadata, as the source's reader would return it.
+    """
+    if runner is not None and detection.source == "setup_py":
+        return read_setup_py_metadata_with_fallback(str(detection.path), runner)
+    if requirements_cache is not None and detection.source == "requirements_txt":
+        return read_requirements_txt_metadata(source=str(detection.path), cache=requirements_cache)
+    if detection.table is not None:
+        if detection.source == "poetry":
+            return normalize_poetry_metadata(detection.table)
+        if detection.source == "pep621":
+            return apply_dynamic_version(detection.table, detection.path)
+        return detection.table
+    return READERS[detection.source](detection.path)
+
+
+class ProjectJob:
+    """A project moving through the pipeline, accumulating what each stage learned."""
+
+    __slots__ = ("root", "source", "detection", "metadata", "about_path", "content", "status", "message")
+
+    def __init__(self, root: Path) -> None:
+        """
+        Start a job for one project directory.
+
+        Args:
+            root: The project's root directory.
+        """
+        self.root = root
+        self.source = ""
+        self.detection: SourceDetection | None = None
+        self.metadata: ProjectMetadata | None = None
+        self.about_path: Path | None = None
+        self.content = ""
+        self.status = "pending"
+        self.message = ""
+
+    @property
+    def failed(self) -> bool:
+        """True if the project failed, is out of sync, or would change."""
+        return self.status in {"failed", "out-of-sync", "would-change"}
+
+    def fail(self, message: str) -> ProjectJob:
+        """Mark the job as failed and return it so later stages pass it through."""
+        self.status = "failed"
+        self.message = message
+        return self
+
+    def __repr__(self) -> str:
+        return f"ProjectJob({str(self.root)!r}, status={self.status!r})"
+
+
+def discover_projects(root: Path, pruned: frozenset[str] = DISCOVERY_PRUNED_DIRS) -> Iterator[Path]:
+    """
+    Lazily walk ``root`` and yield every directory that holds a project.
+
+    The root itself is yielded when it has any metadata source, so single-project
+    runs behave like ``auto``. Nested directories are yielded when they contain
+    one of ``PROJECT_MARKERS``. Directories are visited in sorted order so runs
+    are reproducible.
+
+    Args:
+        root: Directory to search.
+        pruned: Directory names never descended into.
+
+    Yields:
+        Project root directories.
+    """
+    if any((root / marker).is_file() for marker in ROOT_MARKERS):
+        yield root
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                subdirs = sorted(
+                    entry.name
+                    for entry in entries
+                    if entry.is_dir(follow_symlinks=False)
+                    and not entry.name.startswith(".")
+                    and not is_pruned_dir(entry.name, pruned)
+                )
+        except OSError as e:
+            logger.debug(f"Skipping unreadable directory {current}: {e}")
+            continue
+        for name in subdirs:
+            candidate = current / name
+            if any((candidate / marker).is_file() for marker in PROJECT_MARKERS):
+                yield candidate
+        stack.extend(current / name for name in reversed(subdirs))
+
+
+def resolve_about_path(project_root: Path, project_name: str, output: str) -> Path | None:
+    """
+    Locate the metadata file for a project, mirroring the CLI's ``--output`` rules.
+
+    Args:
+        project_root: The project's root directory.
+        project_name: The project name from its metadata.
+        output: A bare file name, or a path relative to the project root.
+
+    Returns:
+        The metadata file path, or None if no package directory could be found.
+    """
+    if output != "__about__.py" and ("/" in output or "\\" in output):
+        return project_root / output
+    package_dir = find_existing_package_dir(project_root, project_name)
+    if package_dir is None:
+        return None
+    return package_dir / output
+
+
+def detect_stage(job: ProjectJob) -> ProjectJob:
+    """Detect the metadata source of a project."""
+    try:
+        job.detection = detect(job.root)
+    except (OSError, ValueError) as e:
+        return job.fail(str(e))
+    job.source = job.detection.source
+    return job
+
+
+def read_stage(
+    job: ProjectJob,
+    runner: SetupPyRunner | None = None,
+    requirements_cache: RequirementsCache | None = None,
+) -> ProjectJob:
+    """Read and normalize a project's metadata."""
+    if job.status == "failed" or job.detection is None:
+        return job
+    try:
+        job.metadata = ProjectMetadata(read_detected(job.detection, runner, requirements_cache))
+    except (OSError, ValueError) as e:
+        return job.fail(f"Could not read {job.source} metadata: {e}")
+    return job
+
+
+def make_read_stage(
+    runner: SetupPyRunner | None, requirements_cache: RequirementsCache | None = None
+) -> Callable[[ProjectJob], ProjectJob]:
+    """Build the read stage, optionally falling back to executing setup.py files and sharing parsed requirements."""
+    if runner is None and requirements_cache is None:
+        return read_stage
+
+    def read_stage_with_context(job: ProjectJob) -> ProjectJob:
+        return read_stage(job, runner, requirements_cache)
+
+    return read_stage_with_context
+
+
+def make_render_stage(
+    output: str, pin_dependencies: bool = False, precompute: bool = False
+) -> Callable[[ProjectJob], ProjectJob]:
+    """Build the render stage for an output file name, optionally pinning dependencies and precomputing constants."""
+
+    def render_stage(job: ProjectJob) -> ProjectJob:
+        if job.status == "failed" or job.metadata is None:
+            return job
+        project_name = job.metadata.get("name")
+        if not isinstance(project_name, str) or not project_name:
+            return job.fail("Could not determine project name from metadata source.")
+        about_path = resolve_about_path(job.root, project_name, output)
+        if about_path is None:
+            return job.fail(f"Could not find package directory for '{project_name}'.")
+        job.about_path = about_path
+        pins = lock_pins(job.root) if pin_dependencies else None
+        about_content, names = any_metadict(job.metadata, pins, precompute)
+        job.content = merge_sections(names, project_name, about_content)
+        return job
+
+    return render_stage
+
+
+def write_stage(job: ProjectJob) -> ProjectJob:
+    """Atomically write rendered content to the metadata file, leaving fsync to the end of the run."""
+    if job.status == "failed" or job.about_path is None:
+        return job
+    try:
+        write_output(job.about_path, job.content, fsync=False)
+    except OSError as e:
+        return job.fail(f"Failed to write {job.about_path}: {e}")
+    job.status = "written"
+    return job
+
+
+def check_stage(job: ProjectJob) -> ProjectJob:
+    """Sync-check the existing metadata file against the source."""
+    if job.status == "failed" or job.about_path is None or job.metadata is None:
+        return job
+    mismatches = check_sync(job.metadata, job.about_path)
+    if mismatches:
+        job.status = "out-of-sync"
+        job.message = "; ".join(mismatches)
+    else:
+        job.status = "in-sync"
+    return job
+
+
+def diff_stage(job: ProjectJob) -> ProjectJob:
+    """Compare rendered content with the existing metadata file, recording a unified diff instead of writing."""
+    if job.status == "failed" or job.about_path is None:
+        return job
+    try:
+        diff = diff_output(job.about_path, job.content)
+    except (OSError, UnicodeDecodeError) as e:
+        return job.fail(f"Failed to read {job.about_path}: {e}")
+    if diff:
+        job.status = "would-change"
+        job.message = diff
+    else:
+        job.status = "unchanged"
+    return job
+
+
+_DONE = object()
+
+
+def run_stage(
+    func: Callable[[Any], Any], items: Iterable[Any], workers: int = 1, maxsize: int = DEFAULT_QUEUE_SIZE
+) -> Iterator[Any]:
+    """
+    Apply ``func`` to ``items`` on worker threads, streaming results through bounded queues.
+
+    At most ``maxsize`` items wait on either side of the workers, so a slow
+    consumer applies back-pressure all the way up the pipeline. Results are
+    yielded in completion order. Closing the generator early stops the stage.
+
+    Args:
+        func: The stage function. It should report failures in its result rather than raise.
+        items: The upstream iterable, consumed on a feeder thread.
+        workers: Number of worker threads.
+        maxsize: Capacity of the input and output queues.
+
+    Yields:
+        ``func(item)`` for every item.
+    """
+    inbox: queue.Queue[Any] = queue.Queue(maxsize)
+    outbox: queue.Queue[Any] = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(target: queue.Queue[Any], item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def feed() -> None:
+        try:
+            for item in items:
+                if not put(inbox, item):
+                    return
+        finally:
+            for _ in range(workers):
+                put(inbox, _DONE)
+
+    def work() -> None:
+        while not stop.is_set():
+            try:
+                item = inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                break
+            try:
+                result = func(item)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f"Pipeline stage {getattr(func, '__name__', func)} failed on {item!r}: {e}")
+                result = item.fail(str(e)) if isinstance(item, ProjectJob) else item
+            if not put(outbox, result):
+                return
+        put(outbox, _DONE)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    threads.extend(threading.Thread(target=work, daemon=True) for _ in range(workers))
+    for thread in threads:
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < workers:
+            result = outbox.get()
+            if result is _DONE:
+                finished += 1
+                continue
+            yield result
+    finally:
+        stop.set()
+
+
+def run_batch(
+    root: Path,
+    *,
+    output: str = "__about__.py",
+    sync_check: bool = False,
+    workers: int = 4,
+    maxsize: int = DEFAULT_QUEUE_SIZE,
+    projects: Iterable[Path] | None = None,
+    shard: tuple[int, int] | None = None,
+    fsync: bool = True,
+    check: bool = False,
+    execute_setup_py: bool = False,
+    pin_dependencies: bool = False,
+    compile_bytecode: bool = False,
+    invalidation_mode: str | None = None,
+    precompute: bool = False,
+) -> Iterator[ProjectJob]:
+    """
+    Generate (or sync-check) metadata files for every project under ``root``.
+
+    Args:
+        root: Directory to search for projects.
+        output: Metadata file name, or a path relative to each project root.
+        sync_check: Compare against existing files instead of writing them.
+        workers: Worker threads per I/O-bound stage.
+        maxsize: Capacity of each inter-stage queue.
+        projects: Project directories to process instead of discovering them.
+        shard: ``(index, count)`` to process only this node's slice of the projects.
+        fsync: Flush every written file to disk in one pass once all projects are done.
+        check: Diff the rendered content against existing files instead of writing them.
+        execute_setup_py: Execute setup.py files (project code, unsandboxed) in a warm worker pool when static
+            parsing misses the name or version.
+        pin_dependencies: List the versions locked in uv.lock, poetry.lock or pdm.lock instead of declared ranges.
+        compile_bytecode: Byte-compile every written file once all projects are done.
+        invalidation_mode: How the compiled files are validated; see :func:`compile_files`.
+        precompute: Emit ``__version_info__`` and a tuple ``__dependencies__``; see :func:`any_metadict`.
+
+    Yields:
+        One finished job per project, as soon as it is done.
+    """
+    discovered = discover_projects(root) if projects is None else projects
+    if shard is not None:
+        discovered = select_shard(discovered, root, shard)
+    jobs = (ProjectJob(project_root) for project_root in discovered)
+    runner = SetupPyRunner() if execute_setup_py else None
+    try:
+        detected = run_stage(detect_stage, jobs, workers, maxsize)
+        read = run_stage(make_read_stage(runner, RequirementsCache()), detected, workers, maxsize)
+        rendered = run_stage(make_render_stage(output, pin_dependencies, precompute), read, 1, maxsize)
+        if sync_check:
+            yield from run_stage(check_stage, rendered, workers, maxsize)
+            return
+        if check:
+            yield from run_stage(diff_stage, rendered, workers, maxsize)
+            return
+
+        written: list[Path] = []
+        for job in run_stage(write_stage, rendered, workers, maxsize):
+            if job.status == "written" and job.about_path is not None:
+                written.append(job.about_path)
+            yield job
+        if compile_bytecode:
+            written.extend(compile_files(written, invalidation_mode, workers))
+        if fsync:
+            sync_files(written)
+    finally:
+        if runner is not None:
+            runner.close()
+
+
+def find_conda_recipes(root: Path, pruned: frozenset[str] = DISCOVERY_PRUNED_DIRS) -> Iterator[Path]:
+    """
+    Lazily walk ``root`` and yield every conda recipe (a ``meta.yaml`` in one of ``CONDA_RECIPE_DIRS``).
+
+    Args:
+        root: Directory to search, e.g. a checkout of many feedstocks.
+        pruned: Directory names never descended into.
+
+    Yields:
+        Recipe paths, in sorted directory order.
+    """
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(name for name in dirs if not name.startswith(".") and not is_pruned_dir(name, pruned))
+        if "meta.yaml" in files and os.path.basename(current) in CONDA_RECIPE_DIRS:
+            yield Path(current) / "meta.yaml"
+
+
+def index_conda_recipes(
+    root: Path, workers: int = 4, maxsize: int = DEFAULT_QUEUE_SIZE
+) -> Iterator[tuple[Path, CondaRecipe]]:
+    """
+    Read every conda recipe under ``root`` in parallel; ``mmm conda-index`` prints the result.
+
+    Recipes that cannot be read are logged and left out. The workers are threads:
+    they overlap file reads, but rendering and parsing hold the GIL, so past a few
+    workers a large index is bound by one core.
+
+    Args:
+        root: Directory to search, e.g. a checkout of many feedstocks.
+        workers: Worker threads reading recipes.
+        maxsize: Capacity of the reader's queues.
+
+    Yields:
+        ``(recipe path, recipe metadata)`` pairs, in completion order.
+    """
+
+    def read(path: Path) -> tuple[Path, CondaRecipe | None]:
+        try:
+            return path, read_conda_recipe(str(path))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read conda recipe {path}: {e}")
+            return path, None
+
+    for path, recipe in run_stage(read, find_conda_recipes(root), workers, maxsize):
+        if recipe is not None:
+            yield path, recipe
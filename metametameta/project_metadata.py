@@ -0,0 +1,101 @@
+"""
+Canonical, compact metadata record passed between readers, renderer and checkers.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from metametameta.known import meta
+
+# Keys readers commonly produce beyond the known fields, pre-interned so their
+# canonical spelling is shared by every record in a batch run.
+_COMMON_KEYS = ("dependencies", "classifiers", "requires_python", "readme", "urls", "summary", "install_requires")
+
+# Raw key -> canonical interned key. Each distinct spelling is lowercased and
+# de-hyphenated once per process, not once per project.
+_KEY_CACHE: dict[str, str] = {key: sys.intern(key) for key in (*meta, *_COMMON_KEYS)}
+
+# Key layout -> position index. Records from the same kind of source share one
+# index dict, the way CPython's key-sharing dicts share their keys table.
+_LAYOUT_CACHE: dict[tuple[str, ...], dict[str, int]] = {}
+_LAYOUT_CACHE_LIMIT = 1024
+
+
+def canonical_key(key: str) -> str:
+    """Return the canonical, interned form of a metadata key (lowercase, ``-`` replaced by ``_``)."""
+    canonical = _KEY_CACHE.get(key)
+    if canonical is None:
+        canonical = sys.intern(key.lower().replace("-", "_"))
+        _KEY_CACHE[key] = canonical
+    return canonical
+
+
+def _layout_index(keys: tuple[str, ...]) -> dict[str, int]:
+    """Return the shared position index for a key layout."""
+    index = _LAYOUT_CACHE.get(keys)
+    if index is None:
+        index = {key: position for position, key in enumerate(keys)}
+        if len(_LAYOUT_CACHE) < _LAYOUT_CACHE_LIMIT:
+            _LAYOUT_CACHE[keys] = index
+    return index
+
+
+class ProjectMetadata(Mapping[str, Any]):
+    """
+    Read-only project metadata with normalized keys.
+
+    Normalization happens exactly once, when the record is built:
+
+    - keys are lowercased and ``-`` becomes ``_``,
+    - ``install_requires`` becomes ``dependencies`` unless both are present,
+    - ``summary`` (importlib.metadata's short description) replaces ``description``.
+
+    The record stores its values in a tuple next to a position index shared by
+    every record with the same key layout, and compares equal to any mapping with
+    the same items, so it can be handed to code that expects a plain dict.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, metadata: Mapping[str, Any] | None = None) -> None:
+        """
+        Build a record from a raw metadata mapping.
+
+        Args:
+            metadata: Raw metadata as produced by a reader.
+        """
+        normalized: dict[str, Any] = {}
+        if metadata:
+            for key, value in metadata.items():
+                normalized[canonical_key(key)] = value
+        if "install_requires" in normalized and "dependencies" not in normalized:
+            normalized[_KEY_CACHE["dependencies"]] = normalized.pop("install_requires")
+        if "summary" in normalized:
+            normalized[_KEY_CACHE["description"]] = normalized.pop("summary")
+        self._index = _layout_index(tuple(normalized))
+        self._values = tuple(normalized.values())
+
+    @classmethod
+    def from_mapping(cls, metadata: Mapping[str, Any]) -> ProjectMetadata:
+        """Return ``metadata`` unchanged if it is already a record, otherwise normalize it into one."""
+        if isinstance(metadata, cls):
+            return metadata
+        return cls(metadata)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
@@ -0,0 +1,197 @@
+"""
+Fast, single-field metadata queries for shell scripts: ``mmm version`` and ``mmm get``.
+
+Release scripts ask for a project's version many times per pipeline, so these
+commands skip everything the full CLI loads (argparse with rich help, totalhelp,
+toml, the readers). Each path is answered by a bounded regex scan: first the
+``[project]`` table of ``pyproject.toml``, then a generated ``__about__.py`` in
+the project root, one directory down, or one directory under ``src``. Only
+plain string values are read; anything else counts as not found.
+
+The ``mmm`` console script (:mod:`metametameta.console`) answers these before
+importing ``metametameta.__main__``, so a query costs little more than starting
+the interpreter.
+
+Examples:
+    mmm version
+    mmm version packages/*/
+    mmm get requires-python
+    mmm get description path/to/pyproject.toml
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+QUERY_COMMANDS = ("version", "get")
+
+USAGE = """usage: mmm version [PATH ...]
+       mmm get KEY [PATH ...]
+
+Print one metadata field per PATH (a project directory, pyproject.toml or __about__.py; default: .),
+one line each, in order. KEY is a [project] key such as version, requires-python or description.
+A PATH without the field prints an empty line and makes the exit code 1."""
+
+# Files larger than this are not metadata files; only their start is scanned.
+MAX_SCAN_BYTES = 256 * 1024
+
+_PROJECT_HEADER = re.compile(r"^[ \t]*\[[ \t]*project[ \t]*\][ \t]*(?:#.*)?$", re.MULTILINE)
+# What can hide a table header: strings (multi-line ones first) and comments. Scanned together so a ``[`` line
+# inside a triple-quoted description does not end the table.
+_TOML_TOKEN = re.compile(
+    r"(?P<multiline>\"\"\"(?:[^\"\\]|\\.|\"(?!\"\"))*\"\"\"\"{0,2}|'''.*?''''{0,2})"
+    r"|\"(?:[^\"\\\n]|\\.)*\"|'[^'\n]*'|#[^\n]*"
+    r"|^[ \t]*(?P<header>\[)",
+    re.MULTILINE | re.DOTALL,
+)
+_STRING_VALUE = r"""(?:"(?P<double>[^"\\\n]*)"|'(?P<single>[^'\n]*)')"""
+
+_SKIPPED_DIRECTORIES = frozenset({"tests", "test", "docs", "build", "dist", "node_modules", "__pycache__"})
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as file:
+            return file.read(MAX_SCAN_BYTES)
+    except OSError:
+        return None
+
+
+def _string(match: re.Match[str] | None) -> str | None:
+    if match is None:
+        return None
+    double = match.group("double")
+    return double if double is not None else match.group("single")
+
+
+def scan_pyproject(text: str, key: str) -> str | None:
+    """
+    Return a string value from the ``[project]`` table of pyproject text.
+
+    Args:
+        text: The contents of a ``pyproject.toml``.
+        key: The key in ``[project]``, e.g. ``version``.
+
+    Returns:
+        The value, or None if the table has no such string key.
+    """
+    header = _PROJECT_HEADER.search(text)
+    if header is None:
+        return None
+    end = len(text)
+    multiline_strings = []
+    for token in _TOML_TOKEN.finditer(text, header.end()):
+        if token.group("header") is not None:
+            end = token.start()
+            break
+        if token.group("multiline") is not None:
+            multiline_strings.append(token.span())
+    pattern = re.compile(rf"^[ \t]*(?:{re.escape(key)}|\"{re.escape(key)}\")[ \t]*=[ \t]*{_STRING_VALUE}", re.MULTILINE)
+    for match in pattern.finditer(text, header.end(), end):
+        if not any(start < match.start() < stop for start, stop in multiline_strings):
+            return _string(match)
+    return None
+
+
+def scan_about(text: str, key: str) -> str | None:
+    """
+    Return a string constant from the text of a generated ``__about__.py``.
+
+    Args:
+        text: The contents of the module.
+        key: The metadata key; ``name`` reads ``__title__`` and ``requires-python`` reads ``__requires_python__``.
+
+    Returns:
+        The value, or None if the module assigns no such string constant.
+    """
+    variable = "title" if key == "name" else key.replace("-", "_")
+    pattern = rf"^__{re.escape(variable)}__[ \t]*(?::[^=\n]*)?=[ \t]*{_STRING_VALUE}"
+    return _string(re.search(pattern, text, re.MULTILINE))
+
+
+def _about_candidates(root: str) -> list[str]:
+    """List the __about__.py files in root, its package directories and those under src, in that order."""
+    candidates = [os.path.join(root, "__about__.py")]
+    for parent in (root, os.path.join(root, "src")):
+        try:
+            entries = sorted(os.scandir(parent), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name in _SKIPPED_DIRECTORIES or not entry.is_dir():
+                continue
+            candidates.append(os.path.join(entry.path, "__about__.py"))
+    return candidates
+
+
+def query(path: str, key: str) -> str | None:
+    """
+    Find one metadata value for a project.
+
+    Args:
+        path: A project directory, a ``pyproject.toml`` or a ``.py`` metadata module.
+        key: The metadata key, e.g. ``version``.
+
+    Returns:
+        The value, or None if it cannot be found.
+    """
+    if not os.path.isdir(path):
+        text = _read(path)
+        if text is None:
+            return None
+        return scan_about(text, key) if path.endswith(".py") else scan_pyproject(text, key)
+    text = _read(os.path.join(path, "pyproject.toml"))
+    value = scan_pyproject(text, key) if text is not None else None
+    if value is not None:
+        return value
+    for candidate in _about_candidates(path):
+        text = _read(candidate)
+        if text is not None:
+            value = scan_about(text, key)
+            if value is not None:
+                return value
+    return None
+
+
+def main(argv: Sequence[str]) -> int:
+    """
+    Run ``version [PATH...]`` or ``get KEY [PATH...]``.
+
+    Args:
+        argv: The arguments, starting with the command name.
+
+    Returns:
+        0 if every path had the field, 1 if any did not, 2 for a usage error.
+    """
+    arguments = list(argv)
+    if "-h" in arguments or "--help" in arguments:
+        print(USAGE)
+        return 0
+    if not arguments or arguments[0] not in QUERY_COMMANDS:
+        print(USAGE, file=sys.stderr)
+        return 2
+    command, rest = arguments[0], arguments[1:]
+    if command == "get":
+        if not rest:
+            print(USAGE, file=sys.stderr)
+            return 2
+        key, paths = rest[0], rest[1:]
+    else:
+        key, paths = "version", rest
+
+    exit_code = 0
+    lines = []
+    for path in paths or ["."]:
+        value = query(path, key)
+        if value is None:
+            print(f"{path}: no {key} found", file=sys.stderr)
+            exit_code = 1
+        lines.append(value or "")
+    sys.stdout.write("\n".join(lines) + "\n")
+    return exit_code
@@ -0,0 +1,160 @@
+"""
+Deterministic sharding of batch runs and JSON reports that merge across shards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from metametameta.pipeline import ProjectJob
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMAT_VERSION = 1
+
+
+class ReportMergeError(ValueError):
+    """Raised when shard reports cannot be merged into one consistent report."""
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """
+    Parse a ``--shard`` value of the form ``i/N`` (1-based, like CI node indexes).
+
+    Args:
+        value: The raw command-line value.
+
+    Returns:
+        The ``(index, count)`` pair.
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is malformed or out of range.
+    """
+    index_text, sep, count_text = value.partition("/")
+    try:
+        if not sep:
+            raise ValueError(value)
+        index, count = int(index_text), int(count_text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard must look like i/N (e.g. 3/16), got {value!r}.") from None
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"Shard index must be between 1 and N, got {value!r}.")
+    return index, count
+
+
+def project_key(project_root: Path, batch_root: Path) -> str:
+    """Return a checkout-independent key for a project: its POSIX path relative to the batch root."""
+    try:
+        relative = project_root.relative_to(batch_root)
+    except ValueError:
+        relative = project_root
+    return relative.as_posix()
+
+
+def shard_of(key: str, count: int) -> int:
+    """
+    Return the 1-based shard a project key belongs to.
+
+    Uses a cryptographic digest rather than ``hash()``, which is salted per
+    process, so every CI node computes the same partition.
+    """
+    digest = hashlib.sha1(key.encode("utf-8"), usedforsecurity=False).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(projects: Iterable[Path], batch_root: Path, shard: tuple[int, int]) -> Iterator[Path]:
+    """Yield only the projects that belong to ``shard``."""
+    index, count = shard
+    for project_root in projects:
+        if shard_of(project_key(project_root, batch_root), count) == index:
+            yield project_root
+
+
+def job_record(job: ProjectJob, batch_root: Path) -> dict[str, Any]:
+    """Convert a finished job into a JSON-friendly report record."""
+    return {
+        "project": project_key(job.root, batch_root),
+        "source": job.source,
+        "status": job.status,
+        "failed": job.failed,
+        "about_path": project_key(job.about_path, batch_root) if job.about_path else None,
+        "message": job.message,
+    }
+
+
+def build_report(records: Iterable[dict[str, Any]], shard: tuple[int, int] | None = None) -> dict[str, Any]:
+    """Assemble report records into a report document with a stable ordering."""
+    results = sorted(records, key=lambda record: record["project"])
+    return {
+        "version": REPORT_FORMAT_VERSION,
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+        "failed": sum(1 for record in results if record["failed"]),
+        "results": results,
+    }
+
+
+def write_report(path: Path, report: dict[str, Any]) -> None:
+    """Write a report document as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def merge_reports(paths: Iterable[Path]) -> dict[str, Any]:
+    """
+    Merge per-shard reports into one report.
+
+    Args:
+        paths: Report files written by ``mmm batch --report``.
+
+    Returns:
+        The merged report, with ``shard`` set to None and a ``missing_shards`` list.
+
+    Raises:
+        ReportMergeError: If a report is not shaped like one ``mmm batch --report``
+            writes, the reports disagree on the shard count, repeat a shard, or
+            list the same project twice.
+    """
+    records: dict[str, dict[str, Any]] = {}
+    seen_shards: set[int] = set()
+    shard_count: int | None = None
+    for path in paths:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(report, dict):
+            raise ReportMergeError(f"{path}: not a batch report.")
+        if report.get("version") != REPORT_FORMAT_VERSION:
+            raise ReportMergeError(f"{path}: unsupported report version {report.get('version')!r}.")
+        if report.get("shard"):
+            index, count = parse_shard(report["shard"])
+            if shard_count is not None and count != shard_count:
+                raise ReportMergeError(f"{path}: shard count {count} does not match {shard_count}.")
+            if index in seen_shards:
+                raise ReportMergeError(f"{path}: shard {index}/{count} appears more than once.")
+            shard_count = count
+            seen_shards.add(index)
+        results = report.get("results", [])
+        if not isinstance(results, list):
+            raise ReportMergeError(f"{path}: 'results' is not a list.")
+        for record in results:
+            if not isinstance(record, dict) or not isinstance(record.get("project"), str) or "failed" not in record:
+                raise ReportMergeError(f"{path}: malformed result record {record!r}.")
+            if record["project"] in records:
+                raise ReportMergeError(f"{path}: project {record['project']!r} appears in more than one report.")
+            records[record["project"]] = record
+
+    merged = build_report(records.values())
+    merged["missing_shards"] = (
+        [index for index in range(1, shard_count + 1) if index not in seen_shards] if shard_count else []
+    )
+    return merged
+
+
+def report_passed(report: dict[str, Any]) -> bool:
+    """Return True if a (merged) report has no failures and no missing shards."""
+    return not report["failed"] and not report.get("missing_shards")
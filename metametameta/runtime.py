@@ -0,0 +1,181 @@
+"""
+Cheap runtime access to a package's generated metadata.
+
+``importlib.metadata.version("pkg")`` scans every ``sys.path`` entry on each
+call, and libraries that check versions at import time pay for it again and
+again. :func:`metadata` returns the constants of a package's generated
+``__about__`` module and :func:`version` its ``__version__``; both are cached.
+Packages without an ``__about__`` fall back to an index of installed
+distributions, built from one listing of each ``sys.path`` entry and shared by
+every later lookup.
+
+The module imports only ``os``, ``sys``, ``functools`` and ``types`` (not even
+``re`` or ``typing``), so a package can call it from its ``__init__``.
+
+Examples:
+    >>> from metametameta import runtime
+    >>> runtime.version("metametameta") == runtime.metadata("metametameta")["__version__"]
+    True
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from functools import cache, lru_cache
+from types import MappingProxyType
+
+# Type checkers treat this as True; at runtime it spares importing typing.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from typing import Any
+
+# Suffixes of installed distributions' metadata directories (or, for old eggs, files).
+DISTRIBUTION_SUFFIXES = (".dist-info", ".egg-info")
+
+# Module attributes that are not metadata, for __about__ modules without __all__.
+_MODULE_ATTRIBUTES = frozenset(
+    {
+        "__all__",
+        "__builtins__",
+        "__cached__",
+        "__doc__",
+        "__file__",
+        "__loader__",
+        "__name__",
+        "__package__",
+        "__spec__",
+    }
+)
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name as PEP 503's ``re.sub(r"[-_.]+", "-", name).lower()`` does, without re."""
+    normalized = name.lower().replace("_", "-").replace(".", "-")
+    while "--" in normalized:
+        normalized = normalized.replace("--", "-")
+    return normalized
+
+
+class Distribution:
+    """An installed distribution, known from its metadata directory's name."""
+
+    __slots__ = ("name", "path", "_version")
+
+    def __init__(self, path: str) -> None:
+        """
+        Describe the distribution whose metadata is at ``path``.
+
+        Args:
+            path: A ``name-version.dist-info`` directory, or an ``.egg-info`` directory or file.
+        """
+        self.path = path
+        stem = os.path.basename(path).rsplit(".", 1)[0]
+        name, separator, rest = stem.partition("-")
+        self.name = name
+        self._version: str | None = rest.split("-")[0] if separator else None
+
+    @property
+    def version(self) -> str | None:
+        """The version from the directory name, else from the ``Version`` header of its metadata."""
+        if self._version is None:
+            self._version = self._read_version()
+        return self._version
+
+    def _read_version(self) -> str | None:
+        candidates = [self.path]
+        if os.path.isdir(self.path):
+            candidates = [os.path.join(self.path, "METADATA"), os.path.join(self.path, "PKG-INFO")]
+        for candidate in candidates:
+            try:
+                with open(candidate, encoding="utf-8") as file:
+                    for line in file:
+                        if not line.strip():
+                            break
+                        if line.startswith("Version:"):
+                            return line[len("Version:") :].strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+        return None
+
+    def __repr__(self) -> str:
+        return f"Distribution({self.path!r})"
+
+
+@lru_cache(maxsize=1)
+def distribution_index() -> dict[str, Distribution]:
+    """
+    Index the installed distributions with one directory listing per ``sys.path`` entry.
+
+    Returns:
+        Normalized distribution names mapped to their distributions. As with
+        imports, the earliest ``sys.path`` entry wins.
+    """
+    index: dict[str, Distribution] = {}
+    for entry in sys.path:
+        directory = entry or "."
+        try:
+            filenames = os.listdir(directory)
+        except OSError:
+            continue
+        for filename in filenames:
+            if filename.endswith(DISTRIBUTION_SUFFIXES):
+                distribution = Distribution(os.path.join(directory, filename))
+                index.setdefault(normalize_name(distribution.name), distribution)
+    return index
+
+
+@cache
+def metadata(package: str, module: str = "__about__") -> Mapping[str, Any]:
+    """
+    Return a package's generated metadata constants.
+
+    Args:
+        package: The package's import name.
+        module: The metadata module inside the package.
+
+    Returns:
+        A read-only mapping of the module's ``__all__`` names (``"__version__"``,
+        ``"__title__"``, ...) to their values. If the package has no such module,
+        ``__title__`` and ``__version__`` of the installed distribution of the same
+        name; empty if there is neither.
+
+    Raises:
+        ImportError: If the metadata module exists but fails to import.
+    """
+    qualified = f"{package}.{module}"
+    try:
+        __import__(qualified)
+    except ModuleNotFoundError as e:
+        # Only a missing package or metadata module means "no __about__"; a module it imports must not be missing.
+        if e.name is None or not (qualified == e.name or qualified.startswith(f"{e.name}.")):
+            raise
+        distribution = distribution_index().get(normalize_name(package))
+        if distribution is None:
+            return MappingProxyType({})
+        return MappingProxyType({"__title__": distribution.name, "__version__": distribution.version})
+    about = sys.modules[qualified]
+    names = getattr(about, "__all__", None) or [
+        name for name in vars(about) if name.startswith("__") and name.endswith("__") and name not in _MODULE_ATTRIBUTES
+    ]
+    return MappingProxyType({name: getattr(about, name) for name in names if hasattr(about, name)})
+
+
+def version(package: str) -> str | None:
+    """
+    Return a package's version; see :func:`metadata`.
+
+    Args:
+        package: The package's import name.
+
+    Returns:
+        The version, or None if it cannot be found.
+    """
+    return metadata(package).get("__version__")
+
+
+def clear_cache() -> None:
+    """Forget cached lookups, e.g. after installing packages or changing ``sys.path``."""
+    metadata.cache_clear()
+    distribution_index.cache_clear()
@@ -0,0 +1,409 @@
+"""
+Opt-in fallback that runs setup.py to capture metadata static parsing cannot see.
+
+Some legacy setup.py files really compute their metadata (classes, loops,
+imports of the package itself). For those, the file is executed with
+``setuptools.setup`` (and ``distutils.core.setup``) replaced by a function that
+records its keyword arguments and stops the script (a minimal stand-in module
+is provided if setuptools is not installed). Execution happens in a
+pool of long-lived worker processes that import setuptools once at start-up,
+so a batch over hundreds of projects pays the interpreter and setuptools import
+per worker rather than per project.
+
+This is not a sandbox. setup.py runs as ordinary Python with the caller's
+permissions: full filesystem, network and environment access. The only limit
+is a per-run timeout. Only use it on checkouts you trust.
+
+Results are cached by setup.py path and content. A run also records, through an
+audit hook, the project files the script opens (``version.py``, the README,
+...); a cached result is only reused while those files are unchanged. Runs that
+start subprocesses or open sockets depend on more than files, so their results
+are kept in memory for the current runner only, never written to the cache
+directory.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import multiprocessing.pool
+import os
+import runpy
+import signal
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import FrameType, ModuleType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+
+DEFAULT_RUNNER_WORKERS = min(4, os.cpu_count() or 1)
+
+# Workers are replaced after this many runs, so state leaked by one setup.py cannot pile up.
+MAX_RUNS_PER_WORKER = 50
+
+# Extra time the parent waits beyond the in-worker timeout before recycling the whole pool.
+_TIMEOUT_GRACE = 5.0
+
+_SETUP_MODULES = ("setuptools", "distutils.core")
+
+# Audit events after which a run's result may depend on more than the files it read.
+_UNTRACKED_EVENTS = frozenset(
+    {"subprocess.Popen", "os.system", "os.exec", "os.posix_spawn", "os.spawn", "os.startfile", "socket.connect"}
+)
+
+
+class SetupPyRunError(ValueError):
+    """Raised when setup.py could not be executed or never called setup()."""
+
+
+class _SetupCalled(Exception):
+    """Raised by the replacement setup() to stop the script once its arguments are captured."""
+
+    def __init__(self, kwargs: dict[str, Any]) -> None:
+        super().__init__("setup() called")
+        self.kwargs = kwargs
+
+
+def _setup_modules() -> list[ModuleType]:
+    """Import the modules that provide setup(); those that are not installed are skipped."""
+    modules = []
+    for name in _SETUP_MODULES:
+        try:
+            modules.append(__import__(name, fromlist=["setup"]))
+        except ImportError:
+            continue
+    return modules
+
+
+def _stand_in_setuptools(fake_setup: Callable[..., None]) -> ModuleType:
+    """Build a minimal ``setuptools`` for interpreters that lack it: enough for a script to reach setup()."""
+    module = ModuleType("setuptools")
+    module.setup = fake_setup  # type: ignore[attr-defined]
+
+    # Package lists are not metadata, so an empty list is an acceptable answer.
+    def find_packages(*args: Any, **kwargs: Any) -> list[str]:  # pylint: disable=unused-argument
+        return []
+
+    module.find_packages = find_packages  # type: ignore[attr-defined]
+    module.find_namespace_packages = find_packages  # type: ignore[attr-defined]
+    return module
+
+
+class _InputRecorder:
+    """Collects the files a setup.py run opens, through an audit hook installed once per process."""
+
+    def __init__(self) -> None:
+        self.reads: set[str] | None = None
+        self.untracked = False
+        self._installed = False
+
+    def _audit(self, event: str, args: tuple[Any, ...]) -> None:
+        if self.reads is None:
+            return
+        if event == "open":
+            try:
+                self.reads.add(os.path.abspath(os.fsdecode(os.fspath(args[0]))))
+            except TypeError:
+                pass  # an open file descriptor
+        elif event in _UNTRACKED_EVENTS:
+            self.untracked = True
+
+    @contextlib.contextmanager
+    def recording(self) -> Iterator[None]:
+        """Record opened files and untracked side effects until the block exits."""
+        if not self._installed:
+            # Audit hooks cannot be removed; outside recording() this one returns at once.
+            sys.addaudithook(self._audit)
+            self._installed = True
+        self.reads, self.untracked = set(), False
+        try:
+            yield
+        finally:
+            self.reads = None
+
+    def inputs(self, project_dir: str, setup_py: str) -> list[str] | None:
+        """Return the project files the run opened (relative, sorted), or None if it had untracked effects."""
+        if self.untracked:
+            return None
+        inputs = set()
+        for read in self.reads or ():
+            relative = os.path.relpath(read, project_dir)
+            if read == setup_py or relative.startswith(os.pardir) or "__pycache__" in Path(relative).parts:
+                continue
+            inputs.add(Path(relative).as_posix())
+        return sorted(inputs)
+
+
+_RECORDER = _InputRecorder()
+
+
+def _digest(path: Path) -> str | None:
+    """Hash a file's contents; None for a file that does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _warm_worker() -> None:
+    """Pool initializer: pay for the setuptools import once per worker process."""
+    _setup_modules()
+
+
+def _plain(value: Any) -> Any:
+    """Convert captured values to plain data; anything else (classes, commands) raises TypeError."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    raise TypeError(type(value).__name__)
+
+
+def _on_timeout(signum: int, frame: FrameType | None) -> None:  # pylint: disable=unused-argument
+    raise TimeoutError
+
+
+def execute_setup_py(path: str, timeout: float = DEFAULT_TIMEOUT) -> dict[str, Any]:
+    """
+    Run a setup.py file and return the keyword arguments it passes to setup().
+
+    Meant to run inside a worker process: it changes the working directory and
+    ``sys.argv`` for the duration of the run and restores them afterwards.
+
+    Args:
+        path: Path to the setup.py file.
+        timeout: Seconds the script may run (enforced with a timer signal where available).
+
+    Returns:
+        The setup() keyword arguments that are plain data.
+
+    Raises:
+        SetupPyRunError: If the script fails, times out, or never calls setup().
+    """
+
+    def fake_setup(*args: Any, **kwargs: Any) -> None:  # pylint: disable=unused-argument
+        raise _SetupCalled(kwargs)
+
+    path = os.path.abspath(path)
+    project_dir = os.path.dirname(path)
+    originals = [(module, getattr(module, "setup", None)) for module in _setup_modules()]
+    saved_cwd, saved_argv, saved_path = os.getcwd(), sys.argv, list(sys.path)
+    saved_modules = set(sys.modules)
+    if "setuptools" not in sys.modules:
+        sys.modules["setuptools"] = _stand_in_setuptools(fake_setup)
+    use_timer = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    previous_handler = signal.signal(signal.SIGALRM, _on_timeout) if use_timer else None
+    try:
+        for module, _ in originals:
+            module.setup = fake_setup  # type: ignore[attr-defined]
+        os.chdir(project_dir)
+        sys.argv = [path, "--name"]
+        sys.path.insert(0, project_dir)
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            runpy.run_path(path, run_name="__main__")
+    except _SetupCalled as called:
+        captured = {}
+        for key, value in called.kwargs.items():
+            try:
+                captured[key] = _plain(value)
+            except TypeError as e:
+                logger.debug(f"Dropping setup() argument {key!r} of type {e} from {path}")
+        return captured
+    except TimeoutError:
+        raise SetupPyRunError(f"{path} did not call setup() within {timeout:g}s.") from None
+    except BaseException as e:  # pylint: disable=broad-exception-caught
+        # SystemExit and KeyboardInterrupt from the script are failures too, never the worker's own.
+        raise SetupPyRunError(f"Running {path} failed: {type(e).__name__}: {e}") from None
+    finally:
+        if use_timer:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+        for module, original in originals:
+            module.setup = original  # type: ignore[attr-defined]
+        os.chdir(saved_cwd)
+        sys.argv, sys.path[:] = saved_argv, saved_path
+        # Forget the project's own modules so the next project in this worker imports its own.
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+    raise SetupPyRunError(f"{path} finished without calling setup().")
+
+
+def run_setup_py(path: str, timeout: float = DEFAULT_TIMEOUT) -> tuple[dict[str, Any], list[str] | None]:
+    """
+    Run a setup.py file like :func:`execute_setup_py`, also reporting what the result depends on.
+
+    Args:
+        path: Path to the setup.py file.
+        timeout: Seconds the script may run.
+
+    Returns:
+        The setup() keyword arguments, and the project files (relative to the setup.py's
+        directory) the run opened, or None if it also started processes or opened sockets.
+
+    Raises:
+        SetupPyRunError: If the script fails, times out, or never calls setup().
+    """
+    path = os.path.abspath(path)
+    with _RECORDER.recording():
+        result = execute_setup_py(path, timeout)
+        inputs = _RECORDER.inputs(os.path.dirname(path), path)
+    return result, inputs
+
+
+def _start_method() -> str:
+    """Prefer a fork server (cheap, thread-safe worker starts); fall back to spawn elsewhere."""
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class SetupPyRunner:
+    """A warm pool of worker processes that execute setup.py files, with a result cache.
+
+    Cache entries hold the captured arguments and a digest of every project file the
+    run opened; an entry whose inputs changed is a miss.
+    """
+
+    def __init__(
+        self, workers: int = DEFAULT_RUNNER_WORKERS, timeout: float = DEFAULT_TIMEOUT, cache_dir: Path | None = None
+    ) -> None:
+        """
+        Create a runner. Worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes.
+            timeout: Seconds each setup.py may run.
+            cache_dir: Directory to persist results in across runs, or None for an in-memory cache only.
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self._cache: dict[str, dict[str, Any]] = {}  # key -> {"result": ..., "inputs": {file: digest} | None}
+        self._lock = threading.Lock()
+        self._pool: multiprocessing.pool.Pool | None = None
+        self._generation = 0
+
+    def __enter__(self) -> SetupPyRunner:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+    def _current_pool(self) -> tuple[multiprocessing.pool.Pool, int]:
+        with self._lock:
+            if self._pool is None:
+                context = multiprocessing.get_context(_start_method())
+                self._pool = context.Pool(self.workers, initializer=_warm_worker, maxtasksperchild=MAX_RUNS_PER_WORKER)
+                self._generation += 1
+            return self._pool, self._generation
+
+    def _run_in_pool(self, path: str) -> tuple[dict[str, Any], list[str] | None]:
+        # A second attempt only happens when another file's timeout recycled the pool under us.
+        for _attempt in range(2):
+            pool, generation = self._current_pool()
+            pending = pool.apply_async(run_setup_py, (path, self.timeout))
+            try:
+                result: tuple[dict[str, Any], list[str] | None] = pending.get(self.timeout + _TIMEOUT_GRACE)
+                return result
+            except multiprocessing.TimeoutError:
+                with self._lock:
+                    if generation != self._generation or self._pool is None:
+                        continue
+                    # The worker ignored its own timer (or has none); replace every worker.
+                    self._pool.terminate()
+                    self._pool = None
+                raise SetupPyRunError(f"{path} did not call setup() within {self.timeout:g}s.") from None
+        raise SetupPyRunError(f"{path} could not be run: the runner was restarted twice.")
+
+    @staticmethod
+    def cache_key(path: Path) -> str:
+        """Return the cache key for a setup.py: a digest of its resolved path and contents.
+
+        The files the script reads are checked separately, against the entry's recorded inputs.
+        """
+        digest = hashlib.sha256(os.path.realpath(path).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _fresh(entry: Any, project_dir: Path, persisted: bool) -> bool:
+        """Tell whether a cache entry is well-formed and none of the files it was computed from changed."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("result"), dict):
+            return False
+        inputs = entry.get("inputs")
+        if inputs is None:
+            return not persisted  # untracked effects: good for this runner's lifetime only
+        return isinstance(inputs, dict) and all(
+            _digest(project_dir / name) == digest for name, digest in inputs.items()
+        )
+
+    def read(self, path: Path | str) -> dict[str, Any]:
+        """
+        Return the setup() keyword arguments of a setup.py, running it only on a cache miss.
+
+        Args:
+            path: Path to the setup.py file.
+
+        Returns:
+            The captured keyword arguments.
+
+        Raises:
+            SetupPyRunError: If the file cannot be read or run, times out, or never calls setup().
+        """
+        path = Path(path)
+        project_dir = path.resolve().parent
+        try:
+            key = self.cache_key(path)
+        except OSError as e:
+            raise SetupPyRunError(f"Could not read {path}: {e}") from e
+        with self._lock:
+            entry = self._cache.get(key)
+        if self._fresh(entry, project_dir, persisted=False):
+            return dict(entry["result"])  # type: ignore[index]
+        cache_file = self.cache_dir / f"{key}.json" if self.cache_dir is not None else None
+        if cache_file is not None and cache_file.is_file():
+            try:
+                entry = json.loads(cache_file.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable runner cache entry {cache_file}: {e}")
+            else:
+                if self._fresh(entry, project_dir, persisted=True):
+                    with self._lock:
+                        self._cache[key] = entry
+                    return dict(entry["result"])
+
+        logger.info(f"Executing {path} (runs project code)")
+        result, inputs = self._run_in_pool(str(path))
+        entry = {
+            "result": result,
+            "inputs": None if inputs is None else {name: _digest(project_dir / name) for name in inputs},
+        }
+        with self._lock:
+            self._cache[key] = entry
+        if cache_file is not None and inputs is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(json.dumps(entry, sort_keys=True), encoding="utf-8")
+            except OSError as e:
+                logger.debug(f"Could not write runner cache entry {cache_file}: {e}")
+        return dict(result)
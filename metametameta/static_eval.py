@@ -0,0 +1,842 @@
+"""
+Evaluate the metadata expressions of a setup.py without executing it.
+
+Real setup.py files rarely pass plain literals to ``setup()``. They write
+``version=VERSION``, ``setup(**metadata)``, ``long_description=read("README.rst")``
+or pull the version out of ``pkg/_version.py`` with a regex. This module walks
+the module's statements in order, keeping a symbol table of everything that can
+be computed from literals, and evaluates expressions against it. Only a fixed
+whitelist of operations is understood: literals and containers, ``**``/``*``
+unpacking, string and path helpers, ``re.compile``/``re.escape``, reads of files inside the
+project (``open``, ``io.open``, ``codecs.open``, ``Path.read_text``), ``exec`` of
+a version file into a dict (itself evaluated, not executed), small helper
+functions such as ``def read(*parts)``, and attributes of project modules read
+through :mod:`metametameta.directives`. Anything else raises
+:class:`NotStaticError` and simply leaves that name unknown.
+
+The evaluator reads untrusted files, so everything it does is bounded: values
+have size limits, comprehensions an iteration limit, and each evaluator a
+budget of evaluation steps. Regex matching is not evaluated, because a
+backtracking pattern can run for hours on a few dozen characters.
+"""
+
+from __future__ import annotations
+
+import ast
+import logging
+import operator
+import os
+import pathlib
+import re
+import string
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path, PurePath
+from typing import Any
+
+from metametameta.directives import DirectiveError, find_module_file, read_project_file, read_static_attribute
+
+logger = logging.getLogger(__name__)
+
+# Guards against runaway recursion through helper functions.
+MAX_CALL_DEPTH = 16
+
+# Longest string a `"=" * n` style repetition, or a format width or precision, may produce.
+MAX_REPEAT_LENGTH = 10_000
+
+# Longest str, bytes, list or tuple any expression may produce, so repeated
+# concatenation, str.replace and str.join cannot build values without bound.
+MAX_VALUE_LENGTH = 10_000_000
+
+# Largest int any expression may produce, in bits, so repeated squaring cannot grow numbers without bound.
+MAX_INT_BITS = 1024
+
+# Most items a comprehension may iterate over, counting every level of nesting.
+MAX_COMPREHENSION_ITERATIONS = 100_000
+
+# Most expressions one evaluator evaluates over its lifetime (one setup.py or recipe).
+MAX_EVALUATION_STEPS = 1_000_000
+
+# Module-level functions that are pure, given static arguments.
+SAFE_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "dict": dict,
+    "list": list,
+    "tuple": tuple,
+    "set": set,
+    "frozenset": frozenset,
+    "sorted": sorted,
+    "reversed": lambda value: list(reversed(value)),
+    "str": str,
+    "int": lambda *args, **kwargs: _bounded_int(*args, **kwargs),  # defined below
+    "len": len,
+    "os.path.join": os.path.join,
+    "os.path.dirname": os.path.dirname,
+    "os.path.abspath": os.path.abspath,
+    "os.path.realpath": os.path.realpath,
+    "os.path.normpath": os.path.normpath,
+    "os.path.basename": os.path.basename,
+    "os.path.splitext": os.path.splitext,
+    "pathlib.Path": pathlib.Path,
+    "pathlib.PurePath": pathlib.PurePath,
+    "re.compile": re.compile,
+    "re.escape": re.escape,
+}
+
+# Module-level constants.
+SAFE_CONSTANTS: dict[str, Any] = {
+    "os.sep": os.sep,
+    "os.linesep": os.linesep,
+    "re.I": re.I,
+    "re.IGNORECASE": re.IGNORECASE,
+    "re.M": re.M,
+    "re.MULTILINE": re.MULTILINE,
+    "re.S": re.S,
+    "re.DOTALL": re.DOTALL,
+    "re.X": re.X,
+    "re.VERBOSE": re.VERBOSE,
+}
+
+# Functions that open a file; evaluated as a read of a file inside the project.
+OPEN_FUNCTIONS = frozenset({"open", "io.open", "codecs.open"})
+
+_STR_METHODS = frozenset(
+    {
+        "capitalize",
+        "decode",
+        "endswith",
+        "format",
+        "join",
+        "lower",
+        "lstrip",
+        "partition",
+        "replace",
+        "rpartition",
+        "rsplit",
+        "rstrip",
+        "split",
+        "splitlines",
+        "startswith",
+        "strip",
+        "title",
+        "upper",
+    }
+)
+_PATH_METHODS = frozenset({"absolute", "joinpath", "resolve", "with_name", "with_suffix", "as_posix"})
+_PATH_ATTRIBUTES = frozenset({"name", "parent", "stem", "suffix"})
+_METHODS: tuple[tuple[Any, frozenset[str]], ...] = (
+    ((str, bytes), _STR_METHODS),
+    (dict, frozenset({"copy", "get", "items", "keys", "values"})),
+    (list, frozenset({"copy", "count", "index"})),
+    (PurePath, _PATH_METHODS),
+)
+
+_BINARY_OPERATORS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mod: operator.mod,
+    ast.Div: operator.truediv,
+    ast.Mult: operator.mul,
+}
+# Width and precision of a format spec (``"{:>10.3}"``, ``f"{x:10}"``).
+_FORMAT_SPEC = re.compile(r"(?:.?[<>=^])?[-+ ]?z?#?0?(?P<width>\d*)[,_]?(?:\.(?P<precision>\d*))?")
+# Width and precision of a printf-style conversion (``"%10.3s"``); ``*`` takes them from the arguments.
+_PRINTF_SPEC = re.compile(r"%%|%(?:\([^)]*\))?[-#0 +]*(?P<width>\*|\d*)(?:\.(?P<precision>\*|\d*))?")
+_SEQUENCE_TYPES = (str, bytes, list, tuple)
+
+_COMPARISONS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+
+class NotStaticError(ValueError):
+    """Raised when an expression cannot be evaluated without running code."""
+
+
+# What a whitelisted operation may raise on unexpected (but static) input.
+_EVALUATION_ERRORS = (
+    NotStaticError,
+    ArithmeticError,
+    AttributeError,
+    IndexError,
+    KeyError,
+    TypeError,
+    ValueError,
+    RecursionError,
+    MemoryError,
+    re.error,
+)
+
+
+def _check_int(value: Any) -> Any:
+    """Reject an int too large to keep computing with; pass anything else through."""
+    if isinstance(value, int) and value.bit_length() > MAX_INT_BITS:
+        raise NotStaticError("number too large")
+    return value
+
+
+def _bounded_int(*args: Any, **kwargs: Any) -> int:
+    """``int()``, refusing digit strings too long to convert quickly (Python < 3.11 has no limit of its own)."""
+    if args and isinstance(args[0], (str, bytes)) and len(args[0]) > MAX_INT_BITS:
+        raise NotStaticError("number too large")
+    return _check_int(int(*args, **kwargs))
+
+
+def _check_width(width: str | None, precision: str | None) -> None:
+    for number in (width, precision):
+        if number and int(number) > MAX_REPEAT_LENGTH:
+            raise NotStaticError("format width too large")
+
+
+def _check_format_spec(spec: str) -> None:
+    """Reject a format spec whose width or precision would pad the result without bound."""
+    if "{" in spec:
+        raise NotStaticError("nested format fields are not supported")
+    match = _FORMAT_SPEC.match(spec)
+    if match is not None:
+        _check_width(match.group("width"), match.group("precision"))
+
+
+def _check_printf_format(template: str) -> None:
+    """Reject a ``%`` format whose widths or precisions would pad the result without bound."""
+    for match in _PRINTF_SPEC.finditer(template):
+        if "*" in (match.group("width"), match.group("precision")):
+            raise NotStaticError("format widths from arguments are not supported")
+        _check_width(match.group("width"), match.group("precision"))
+
+
+def check_str_method(target: str, name: str, args: list[Any]) -> None:
+    """
+    Reject str.format, str.replace and str.join calls whose results would be too large to build.
+
+    Args:
+        target: The string the method is called on.
+        name: The method name; other methods are not checked.
+        args: The positional arguments of the call.
+
+    Raises:
+        NotStaticError: If the result would exceed :data:`MAX_VALUE_LENGTH` or pad without bound.
+    """
+    if name == "format":
+        for _literal, _field, spec, _conversion in string.Formatter().parse(target):
+            _check_format_spec(spec or "")
+    elif name == "replace" and len(args) >= 2 and isinstance(args[0], str) and isinstance(args[1], str):
+        growth = target.count(args[0]) * (len(args[1]) - len(args[0]))
+        if len(target) + growth > MAX_VALUE_LENGTH:
+            raise NotStaticError("value too large")
+    elif name == "join" and args and isinstance(args[0], (list, tuple)):
+        parts = args[0]
+        length = len(target) * max(len(parts) - 1, 0)
+        length += sum(len(part) for part in parts if isinstance(part, str))
+        if length > MAX_VALUE_LENGTH:
+            raise NotStaticError("value too large")
+
+
+class StaticFile:
+    """The contents of a file opened by setup.py, standing in for the file object."""
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: str | bytes) -> None:
+        """
+        Wrap file contents.
+
+        Args:
+            content: The text (or bytes, for binary mode) of the file.
+        """
+        self.content = content
+
+    def read(self) -> str | bytes:
+        """Return the whole file."""
+        return self.content
+
+    def readlines(self) -> list[Any]:
+        """Return the file's lines, keeping line endings."""
+        return self.content.splitlines(keepends=True)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.readlines())
+
+
+class _ImportedName:
+    """A name bound by ``from module import name``."""
+
+    __slots__ = ("module", "level", "name")
+
+    def __init__(self, module: str, level: int, name: str) -> None:
+        self.module = module
+        self.level = level
+        self.name = name
+
+    @property
+    def qualified(self) -> str:
+        return f"{self.module}.{self.name}" if self.module else self.name
+
+
+class _ImportedModule:
+    """A name bound by ``import module`` or ``import module as alias``."""
+
+    __slots__ = ("module",)
+
+    def __init__(self, module: str) -> None:
+        self.module = module
+
+
+class _Return(Exception):
+    """Carries a helper function's return value out of its body."""
+
+    def __init__(self, value: Any) -> None:
+        super().__init__()
+        self.value = value
+
+
+def _as_load(target: ast.Name | ast.Subscript) -> ast.expr:
+    """Return a copy of an assignment target that reads the current value instead."""
+    if isinstance(target, ast.Name):
+        return ast.Name(id=target.id, ctx=ast.Load())
+    return ast.Subscript(value=target.value, slice=target.slice, ctx=ast.Load())
+
+
+def _assigned_names(nodes: Iterable[ast.AST]) -> set[str]:
+    """Return every name a group of statements may assign or mutate through ``name[...] =`` / ``name.x =``."""
+    names = set()
+    for node in nodes:
+        for child in ast.walk(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                names.add(child.name)
+            elif isinstance(getattr(child, "ctx", None), ast.Store):
+                while isinstance(child, (ast.Subscript, ast.Attribute)):
+                    child = child.value
+                if isinstance(child, ast.Name):
+                    names.add(child.id)
+    return names
+
+
+class StaticEvaluator:
+    """
+    A symbol table for one setup.py, and the whitelisted evaluator that fills and reads it.
+
+    Attributes:
+        source_path: The setup.py being evaluated.
+        root: The directory relative paths (and file reads) are resolved against.
+        symbols: Module-level names whose values are known statically.
+    """
+
+    def __init__(self, source_path: Path | str = "setup.py") -> None:
+        """
+        Start with an empty symbol table for a setup.py.
+
+        Args:
+            source_path: Path to the setup.py file.
+        """
+        self.source_path = Path(source_path).absolute()
+        self.root = self.source_path.parent
+        self.symbols: dict[str, Any] = {"__file__": str(self.source_path), "__name__": "__main__"}
+        self._depth = 0
+        self._steps = 0
+
+    # --- statements ---
+
+    def run(self, statements: Iterable[ast.stmt], scope: dict[str, Any] | None = None) -> None:
+        """
+        Execute statements symbolically, recording every value that can be computed statically.
+
+        Names whose value cannot be computed are removed from the scope, so later
+        lookups fail rather than see a stale value.
+
+        Args:
+            statements: The statements, in order.
+            scope: The namespace to bind into. Defaults to the module symbol table.
+        """
+        scope = self.symbols if scope is None else scope
+        for statement in statements:
+            try:
+                self._run_statement(statement, scope)
+            except _EVALUATION_ERRORS as e:
+                logger.debug(f"Not evaluating line {getattr(statement, 'lineno', '?')} of {self.source_path}: {e}")
+                for name in _assigned_names([statement]):
+                    scope.pop(name, None)
+
+    def _run_statement(self, statement: ast.stmt, scope: dict[str, Any]) -> None:
+        if isinstance(statement, ast.Assign):
+            value = self.evaluate(statement.value, scope)
+            for target in statement.targets:
+                self._assign(target, value, scope)
+        elif isinstance(statement, ast.AnnAssign):
+            if statement.value is not None:
+                self._assign(statement.target, self.evaluate(statement.value, scope), scope)
+        elif isinstance(statement, ast.AugAssign):
+            operation = _BINARY_OPERATORS.get(type(statement.op))
+            if operation is None or not isinstance(statement.target, (ast.Name, ast.Subscript)):
+                raise NotStaticError("unsupported augmented assignment")
+            current = self.evaluate(_as_load(statement.target), scope)
+            self._assign(
+                statement.target, self._binary(operation, current, self.evaluate(statement.value, scope)), scope
+            )
+        elif isinstance(statement, ast.Import):
+            for alias in statement.names:
+                if alias.asname:
+                    scope[alias.asname] = _ImportedModule(alias.name)
+                else:
+                    top = alias.name.split(".")[0]
+                    scope[top] = _ImportedModule(top)
+        elif isinstance(statement, ast.ImportFrom):
+            for alias in statement.names:
+                if alias.name != "*":
+                    scope[alias.asname or alias.name] = _ImportedName(
+                        statement.module or "", statement.level, alias.name
+                    )
+        elif isinstance(statement, ast.FunctionDef):
+            scope[statement.name] = statement
+        elif isinstance(statement, ast.With):
+            self._run_with(statement, scope)
+        elif isinstance(statement, ast.Try):
+            self.run([*statement.body, *statement.orelse, *statement.finalbody], scope)
+        elif isinstance(statement, ast.If):
+            self._run_if(statement, scope)
+        elif isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call):
+            self._run_call_statement(statement.value, scope)
+        elif isinstance(statement, ast.Return):
+            raise _Return(None if statement.value is None else self.evaluate(statement.value, scope))
+        elif isinstance(statement, (ast.For, ast.While, ast.AsyncFunctionDef, ast.ClassDef, ast.Delete)):
+            for name in _assigned_names([statement]):
+                scope.pop(name, None)
+            if isinstance(statement, ast.Delete):
+                for target in statement.targets:
+                    if isinstance(target, ast.Name):
+                        scope.pop(target.id, None)
+
+    def _assign(self, target: ast.expr, value: Any, scope: dict[str, Any]) -> None:
+        if isinstance(target, ast.Name):
+            scope[target.id] = value
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            values = list(value)
+            if len(values) != len(target.elts) or any(isinstance(elt, ast.Starred) for elt in target.elts):
+                raise NotStaticError("unsupported unpacking")
+            for element, item in zip(target.elts, values):  # noqa: B905
+                self._assign(element, item, scope)
+        elif isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name):
+            container = self._lookup(target.value.id, scope)
+            if not isinstance(container, (dict, list)):
+                raise NotStaticError("subscript assignment to a non-container")
+            container[self.evaluate(target.slice, scope)] = value
+        else:
+            raise NotStaticError(f"unsupported assignment target {type(target).__name__}")
+
+    def _run_with(self, statement: ast.With, scope: dict[str, Any]) -> None:
+        self.enter_with(statement, scope)
+        self.run(statement.body, scope)
+
+    def enter_with(self, statement: ast.With, scope: dict[str, Any] | None = None) -> None:
+        """Bind the ``as`` targets of a ``with`` statement without running its body."""
+        scope = self.symbols if scope is None else scope
+        for item in statement.items:
+            if isinstance(item.optional_vars, ast.Name):
+                try:
+                    scope[item.optional_vars.id] = self.evaluate(item.context_expr, scope)
+                except NotStaticError:
+                    scope.pop(item.optional_vars.id, None)
+
+    def _run_if(self, statement: ast.If, scope: dict[str, Any]) -> None:
+        try:
+            branch = statement.body if self.evaluate(statement.test, scope) else statement.orelse
+        except NotStaticError:
+            # Either branch may run, so nothing either of them assigns can be trusted.
+            for name in _assigned_names([*statement.body, *statement.orelse]):
+                scope.pop(name, None)
+            return
+        self.run(branch, scope)
+
+    def _run_call_statement(self, call: ast.Call, scope: dict[str, Any]) -> None:
+        """Handle the calls that mutate state: ``exec(code, ns)`` and in-place dict/list updates."""
+        func = call.func
+        if isinstance(func, ast.Name) and func.id == "exec" and "exec" not in scope:
+            code = self.evaluate(call.args[0], scope) if call.args else None
+            if isinstance(code, bytes):
+                code = code.decode("utf-8")
+            if not isinstance(code, str):
+                raise NotStaticError("exec of a non-string")
+            namespace = self.evaluate(call.args[1], scope) if len(call.args) > 1 else scope
+            if not isinstance(namespace, dict):
+                raise NotStaticError("exec into a non-dict namespace")
+            try:
+                tree = ast.parse(code)
+            except SyntaxError as e:
+                raise NotStaticError(f"exec of invalid code: {e}") from e
+            self.run(tree.body, namespace)
+            return
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name):
+            target = scope.get(func.value.id, self.symbols.get(func.value.id))
+            if isinstance(target, dict) and func.attr in {"update", "setdefault"}:
+                args, kwargs = self._arguments(call, scope)
+                getattr(target, func.attr)(*args, **kwargs)
+            elif isinstance(target, list) and func.attr in {"append", "extend", "insert"}:
+                args, kwargs = self._arguments(call, scope)
+                getattr(target, func.attr)(*args, **kwargs)
+
+    # --- expressions ---
+
+    def evaluate(self, node: ast.AST, scope: dict[str, Any] | None = None) -> Any:
+        """
+        Evaluate an expression against the symbol table.
+
+        Args:
+            node: The expression.
+            scope: Local names (e.g. a helper function's arguments), consulted before module symbols.
+
+        Returns:
+            The expression's value.
+
+        Raises:
+            NotStaticError: If the expression needs anything outside the whitelist, or the
+                evaluator has used up its :data:`MAX_EVALUATION_STEPS`.
+        """
+        scope = self.symbols if scope is None else scope
+        self._steps += 1
+        if self._steps > MAX_EVALUATION_STEPS:
+            raise NotStaticError("evaluation step budget exhausted")
+        handler = getattr(self, f"_eval_{type(node).__name__}", None)
+        if handler is None:
+            raise NotStaticError(f"unsupported expression {type(node).__name__}")
+        try:
+            value = handler(node, scope)
+        except NotStaticError:
+            raise
+        except _EVALUATION_ERRORS as e:
+            raise NotStaticError(f"{type(e).__name__}: {e}") from e
+        if isinstance(value, _SEQUENCE_TYPES) and len(value) > MAX_VALUE_LENGTH:
+            raise NotStaticError("value too large")
+        return _check_int(value)
+
+    def _eval_Constant(self, node: ast.Constant, scope: dict[str, Any]) -> Any:  # pylint: disable=unused-argument
+        return node.value
+
+    def _eval_JoinedStr(self, node: ast.JoinedStr, scope: dict[str, Any]) -> str:
+        return "".join(str(self.evaluate(value, scope)) for value in node.values)
+
+    def _eval_FormattedValue(self, node: ast.FormattedValue, scope: dict[str, Any]) -> str:
+        value = self.evaluate(node.value, scope)
+        if node.conversion == ord("r"):
+            value = repr(value)
+        elif node.conversion == ord("s"):
+            value = str(value)
+        spec = self.evaluate(node.format_spec, scope) if node.format_spec is not None else ""
+        _check_format_spec(spec)
+        return format(value, spec)
+
+    def _elements(self, nodes: Iterable[ast.expr], scope: dict[str, Any]) -> list[Any]:
+        values: list[Any] = []
+        for element in nodes:
+            if isinstance(element, ast.Starred):
+                values.extend(self.evaluate(element.value, scope))
+            else:
+                values.append(self.evaluate(element, scope))
+        return values
+
+    def _eval_List(self, node: ast.List, scope: dict[str, Any]) -> list[Any]:
+        return self._elements(node.elts, scope)
+
+    def _eval_Tuple(self, node: ast.Tuple, scope: dict[str, Any]) -> tuple[Any, ...]:
+        return tuple(self._elements(node.elts, scope))
+
+    def _eval_Set(self, node: ast.Set, scope: dict[str, Any]) -> set[Any]:
+        return set(self._elements(node.elts, scope))
+
+    def _eval_Dict(self, node: ast.Dict, scope: dict[str, Any]) -> dict[Any, Any]:
+        result: dict[Any, Any] = {}
+        for key, value in zip(node.keys, node.values):  # noqa: B905
+            if key is None:
+                result.update(self.evaluate(value, scope))
+            else:
+                result[self.evaluate(key, scope)] = self.evaluate(value, scope)
+        return result
+
+    def _lookup(self, name: str, scope: dict[str, Any]) -> Any:
+        for namespace in (scope, self.symbols):
+            if name in namespace:
+                value = namespace[name]
+                if isinstance(value, _ImportedName):
+                    return self._imported_value(value)
+                if isinstance(value, (_ImportedModule, ast.FunctionDef)):
+                    raise NotStaticError(f"{name!r} is not a value")
+                return value
+        raise NotStaticError(f"{name!r} is not known statically")
+
+    def _eval_Name(self, node: ast.Name, scope: dict[str, Any]) -> Any:
+        return self._lookup(node.id, scope)
+
+    def _imported_value(self, imported: _ImportedName) -> Any:
+        """Read ``from module import name`` from the project's own source."""
+        if imported.qualified in SAFE_CONSTANTS:
+            return SAFE_CONSTANTS[imported.qualified]
+        module_file = None if imported.level else find_module_file(imported.module, self.root)
+        if module_file is None:
+            raise NotStaticError(f"{imported.module!r} is not a project module")
+        try:
+            return read_static_attribute(module_file, imported.name, self.root)
+        except DirectiveError as e:
+            raise NotStaticError(str(e)) from e
+
+    def _qualified_name(self, node: ast.expr, scope: dict[str, Any]) -> str | None:
+        """Return the dotted name an expression like ``os.path.join`` refers to, if it names a module member."""
+        parts: list[str] = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        binding = scope.get(node.id, self.symbols.get(node.id))
+        if isinstance(binding, _ImportedModule):
+            head = binding.module
+        elif isinstance(binding, _ImportedName):
+            head = binding.qualified
+        elif binding is None and node.id not in scope and node.id not in self.symbols:
+            head = node.id
+        else:
+            return None
+        return ".".join([head, *reversed(parts)])
+
+    def _eval_Attribute(self, node: ast.Attribute, scope: dict[str, Any]) -> Any:
+        qualified = self._qualified_name(node, scope)
+        if qualified is not None:
+            if qualified in SAFE_CONSTANTS:
+                return SAFE_CONSTANTS[qualified]
+            module, _, name = qualified.rpartition(".")
+            module_file = find_module_file(module, self.root) if module else None
+            if module_file is None:
+                raise NotStaticError(f"{qualified!r} is not known statically")
+            try:
+                return read_static_attribute(module_file, name, self.root)
+            except DirectiveError as e:
+                raise NotStaticError(str(e)) from e
+        value = self.evaluate(node.value, scope)
+        if isinstance(value, PurePath) and node.attr in _PATH_ATTRIBUTES:
+            return getattr(value, node.attr)
+        raise NotStaticError(f"attribute {node.attr!r} is not whitelisted")
+
+    def _eval_Subscript(self, node: ast.Subscript, scope: dict[str, Any]) -> Any:
+        return self.evaluate(node.value, scope)[self.evaluate(node.slice, scope)]
+
+    def _eval_Slice(self, node: ast.Slice, scope: dict[str, Any]) -> slice:
+        return slice(
+            *(self.evaluate(part, scope) if part is not None else None for part in (node.lower, node.upper, node.step))
+        )
+
+    def _binary(self, operation: Callable[[Any, Any], Any], left: Any, right: Any) -> Any:
+        if operation is operator.mul:
+            for sequence, count in ((left, right), (right, left)):
+                if (
+                    isinstance(sequence, _SEQUENCE_TYPES)
+                    and isinstance(count, int)
+                    and len(sequence) * count > MAX_REPEAT_LENGTH
+                ):
+                    raise NotStaticError("repetition too large")
+            if (
+                isinstance(left, int)
+                and isinstance(right, int)
+                and left.bit_length() + right.bit_length() > MAX_INT_BITS
+            ):
+                raise NotStaticError("number too large")
+        if operation is operator.mod and isinstance(left, (str, bytes)):
+            _check_printf_format(left.decode("latin-1") if isinstance(left, bytes) else left)
+        if operation is operator.truediv and not isinstance(left, PurePath):
+            raise NotStaticError("division is only supported for paths")
+        return _check_int(operation(left, right))
+
+    def _eval_BinOp(self, node: ast.BinOp, scope: dict[str, Any]) -> Any:
+        operation = _BINARY_OPERATORS.get(type(node.op))
+        if operation is None:
+            raise NotStaticError(f"unsupported operator {type(node.op).__name__}")
+        return self._binary(operation, self.evaluate(node.left, scope), self.evaluate(node.right, scope))
+
+    def _eval_BoolOp(self, node: ast.BoolOp, scope: dict[str, Any]) -> Any:
+        value = None
+        for operand in node.values:
+            value = self.evaluate(operand, scope)
+            if isinstance(node.op, ast.And) and not value:
+                return value
+            if isinstance(node.op, ast.Or) and value:
+                return value
+        return value
+
+    def _eval_UnaryOp(self, node: ast.UnaryOp, scope: dict[str, Any]) -> Any:
+        operand = self.evaluate(node.operand, scope)
+        if isinstance(node.op, ast.Not):
+            return not operand
+        if isinstance(node.op, ast.USub):
+            return -operand
+        raise NotStaticError(f"unsupported operator {type(node.op).__name__}")
+
+    def _eval_Compare(self, node: ast.Compare, scope: dict[str, Any]) -> bool:
+        left = self.evaluate(node.left, scope)
+        for op, comparator in zip(node.ops, node.comparators):  # noqa: B905
+            compare = _COMPARISONS.get(type(op))
+            if compare is None:
+                raise NotStaticError(f"unsupported comparison {type(op).__name__}")
+            right = self.evaluate(comparator, scope)
+            if not compare(left, right):
+                return False
+            left = right
+        return True
+
+    def _eval_IfExp(self, node: ast.IfExp, scope: dict[str, Any]) -> Any:
+        return self.evaluate(node.body if self.evaluate(node.test, scope) else node.orelse, scope)
+
+    def _comprehension(self, node: ast.ListComp | ast.GeneratorExp | ast.SetComp, scope: dict[str, Any]) -> list[Any]:
+        results: list[Any] = []
+        iterations = 0
+
+        def expand(generators: list[ast.comprehension], local: dict[str, Any]) -> None:
+            nonlocal iterations
+            if not generators:
+                results.append(self.evaluate(node.elt, local))
+                return
+            generator, rest = generators[0], generators[1:]
+            for item in self.evaluate(generator.iter, local):
+                iterations += 1
+                if iterations > MAX_COMPREHENSION_ITERATIONS:
+                    raise NotStaticError("comprehension iterates too often")
+                inner = dict(local)
+                self._assign(generator.target, item, inner)
+                if all(self.evaluate(condition, inner) for condition in generator.ifs):
+                    expand(rest, inner)
+
+        expand(node.generators, dict(scope))
+        return results
+
+    def _eval_ListComp(self, node: ast.ListComp, scope: dict[str, Any]) -> list[Any]:
+        return self._comprehension(node, scope)
+
+    def _eval_GeneratorExp(self, node: ast.GeneratorExp, scope: dict[str, Any]) -> list[Any]:
+        return self._comprehension(node, scope)
+
+    def _eval_SetComp(self, node: ast.SetComp, scope: dict[str, Any]) -> set[Any]:
+        return set(self._comprehension(node, scope))
+
+    # --- calls ---
+
+    def _arguments(self, call: ast.Call, scope: dict[str, Any]) -> tuple[list[Any], dict[str, Any]]:
+        args = self._elements(call.args, scope)
+        kwargs: dict[str, Any] = {}
+        for keyword in call.keywords:
+            if keyword.arg is None:
+                kwargs.update(self.evaluate(keyword.value, scope))
+            else:
+                kwargs[keyword.arg] = self.evaluate(keyword.value, scope)
+        return args, kwargs
+
+    def _eval_Call(self, node: ast.Call, scope: dict[str, Any]) -> Any:
+        func = node.func
+        if isinstance(func, ast.Name):
+            binding = scope.get(func.id, self.symbols.get(func.id))
+            if isinstance(binding, ast.FunctionDef):
+                args, kwargs = self._arguments(node, scope)
+                return self._call_function(binding, args, kwargs)
+        qualified = self._qualified_name(func, scope)
+        if qualified in OPEN_FUNCTIONS:
+            args, kwargs = self._arguments(node, scope)
+            return self._open(*args, **kwargs)
+        if qualified is not None:
+            function = SAFE_FUNCTIONS.get(qualified)
+            if function is None:
+                raise NotStaticError(f"call to {qualified!r} is not whitelisted")
+            args, kwargs = self._arguments(node, scope)
+            return function(*args, **kwargs)
+        if not isinstance(func, ast.Attribute):
+            raise NotStaticError("call of a computed function")
+        target = self.evaluate(func.value, scope)
+        args, kwargs = self._arguments(node, scope)
+        return self._call_method(target, func.attr, args, kwargs)
+
+    def _call_method(self, target: Any, name: str, args: list[Any], kwargs: dict[str, Any]) -> Any:
+        if isinstance(target, StaticFile) and name in {"read", "readlines"}:
+            return getattr(target, name)()
+        if isinstance(target, PurePath) and name in {"read_text", "read_bytes", "open"}:
+            static_file = self._open(target, "rb" if name == "read_bytes" else "r")
+            return static_file if name == "open" else static_file.read()
+        for types, methods in _METHODS:
+            if isinstance(target, types) and name in methods:
+                if isinstance(target, str):
+                    check_str_method(target, name, args)
+                return getattr(target, name)(*args, **kwargs)
+        raise NotStaticError(f"method {type(target).__name__}.{name} is not whitelisted")
+
+    def _open(  # pylint: disable=keyword-arg-before-vararg
+        self, file: Any, mode: str = "r", *_args: Any, **_kwargs: Any
+    ) -> StaticFile:
+        """Stand in for ``open()``: read-only, and only for files inside the project."""
+        if not isinstance(file, (str, PurePath)) or any(flag in mode for flag in "wax+"):
+            raise NotStaticError("only reading files by path is supported")
+        path = Path(file)
+        if not path.is_absolute():
+            path = self.root / path
+        try:
+            content = read_project_file(path, self.root)
+        except DirectiveError as e:
+            raise NotStaticError(str(e)) from e
+        return StaticFile(content.encode("utf-8") if "b" in mode else content)
+
+    def _call_function(self, function: ast.FunctionDef, args: list[Any], kwargs: dict[str, Any]) -> Any:
+        """Evaluate a helper function defined in setup.py, such as ``def read(*parts)``."""
+        if self._depth >= MAX_CALL_DEPTH:
+            raise NotStaticError("helper functions nest too deeply")
+        spec = function.args
+        positional = [*spec.posonlyargs, *spec.args]
+        local: dict[str, Any] = {}
+        defaulted = positional[len(positional) - len(spec.defaults) :]
+        defaults = {arg.arg: default for arg, default in zip(defaulted, spec.defaults)}  # noqa: B905
+        for arg, default in zip(spec.kwonlyargs, spec.kw_defaults):  # noqa: B905
+            if default is not None:
+                defaults[arg.arg] = default
+        for parameter, value in zip(positional, args):  # noqa: B905
+            local[parameter.arg] = value
+        extra_args = args[len(positional) :]
+        if extra_args and spec.vararg is None:
+            raise NotStaticError("too many arguments to helper function")
+        if spec.vararg is not None:
+            local[spec.vararg.arg] = tuple(extra_args)
+        extra_kwargs = {}
+        for key, value in kwargs.items():
+            if any(parameter.arg == key for parameter in [*positional, *spec.kwonlyargs]):
+                local[key] = value
+            else:
+                extra_kwargs[key] = value
+        if extra_kwargs and spec.kwarg is None:
+            raise NotStaticError("unexpected keyword arguments to helper function")
+        if spec.kwarg is not None:
+            local[spec.kwarg.arg] = extra_kwargs
+        for parameter in [*positional, *spec.kwonlyargs]:
+            if parameter.arg not in local:
+                if parameter.arg not in defaults:
+                    raise NotStaticError(f"missing argument {parameter.arg!r} to helper function")
+                local[parameter.arg] = self.evaluate(defaults[parameter.arg])
+
+        self._depth += 1
+        try:
+            self._run_body(function.body, local)
+        except _Return as result:
+            return result.value
+        finally:
+            self._depth -= 1
+        return None
+
+    def _run_body(self, statements: list[ast.stmt], scope: dict[str, Any]) -> None:
+        """Run a helper function's body, failing (rather than skipping) on anything not static."""
+        for statement in statements:
+            if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+                continue  # docstring
+            if isinstance(statement, ast.With):
+                for item in statement.items:
+                    value = self.evaluate(item.context_expr, scope)
+                    if isinstance(item.optional_vars, ast.Name):
+                        scope[item.optional_vars.id] = value
+                self._run_body(statement.body, scope)
+            else:
+                self._run_statement(statement, scope)
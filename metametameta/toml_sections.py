@@ -0,0 +1,161 @@
+"""
+Read a single table out of a TOML document without parsing the rest of it.
+
+``pyproject.toml`` files often carry far more tool configuration (ruff, mypy,
+pytest, coverage) than packaging metadata. A single regex pass over the text
+finds the table headers while stepping over strings, comments and multi-line
+arrays; only the lines of the wanted table and its sub-tables are then handed
+to ``toml``. Documents that could define the table some other way (dotted keys
+or inline tables in a parent table, quoted header names) fall back to a full
+parse, so the result always matches ``toml.loads(text)`` navigated to the table.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, NamedTuple
+
+import toml
+
+logger = logging.getLogger(__name__)
+
+# Hops between the tokens that matter for finding headers: strings and comments
+# are matched whole (and ignored) so brackets inside them never count, and
+# brackets outside them track the nesting depth of arrays and inline tables.
+_STRUCTURE_SCANNER = re.compile(
+    r"""
+    (?P<skip>
+        \"\"\"(?:\\.|[^\\])*?\"\"\"
+      | '''[\s\S]*?'''
+      | "(?:\\.|[^"\\\n])*"
+      | '[^'\n]*'
+      | \#[^\n]*
+    )
+    | (?P<open>[\[{])
+    | (?P<close>[\]}])
+    """,
+    re.VERBOSE,
+)
+
+# A table or array-of-tables header, matched at the position of its first bracket.
+_HEADER = re.compile(r"\[\[?[ \t]*(?P<name>[^\]\n#]*?)[ \t]*\]\]?[ \t]*(?:#[^\n]*)?\r?(?:\n|$)")
+
+# Anything other than blank lines and comments.
+_CONTENT_LINE = re.compile(r"^[ \t]*[^\s#]", re.MULTILINE)
+
+
+class _Section(NamedTuple):
+    """A header name and the span of the text it owns, header line included."""
+
+    name: str
+    start: int
+    end: int
+
+
+def _scan_sections(text: str) -> list[_Section] | None:
+    """
+    Split a TOML document into top-level sections.
+
+    Returns:
+        The sections in document order, the first being the unnamed root table,
+        or None if the layout is too unusual to split safely.
+    """
+    headers: list[tuple[str, int]] = []
+    depth = 0
+    pos = 0
+    while True:
+        token = _STRUCTURE_SCANNER.search(text, pos)
+        if token is None:
+            break
+        pos = token.end()
+        kind = token.lastgroup
+        if kind == "close":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif kind == "open":
+            line_start = text.rfind("\n", 0, token.start()) + 1
+            if depth == 0 and token.group() == "[" and not text[line_start : token.start()].strip():
+                header = _HEADER.match(text, token.start())
+                if header is None or "'" in header.group("name") or '"' in header.group("name"):
+                    return None
+                headers.append((re.sub(r"[ \t]*\.[ \t]*", ".", header.group("name")), line_start))
+                pos = header.end()
+            else:
+                depth += 1
+    if depth != 0:
+        return None
+
+    sections = [_Section("", 0, headers[0][1] if headers else len(text))]
+    for index, (name, start) in enumerate(headers):
+        end = headers[index + 1][1] if index + 1 < len(headers) else len(text)
+        sections.append(_Section(name, start, end))
+    return sections
+
+
+def _navigate(data: dict[str, Any], path: list[str]) -> dict[str, Any] | None:
+    """Follow a dotted table path through parsed TOML, returning None if it is missing or not a table."""
+    for part in path:
+        value = data.get(part)
+        if not isinstance(value, dict):
+            return None
+        data = value
+    return data
+
+
+def load_toml_table(text: str, table: str) -> dict[str, Any] | None:
+    """
+    Parse one table (with its sub-tables) out of TOML text.
+
+    Args:
+        text: The TOML document.
+        table: Dotted table name, e.g. ``"project"`` or ``"tool.poetry"``.
+
+    Returns:
+        The table's contents, or None if the document has no such table. An
+        empty table (a bare header) is an empty dict.
+
+    Raises:
+        toml.TomlDecodeError: If the parts of the document that were parsed are invalid.
+    """
+    path = table.split(".")
+    sections = _scan_sections(text)
+    if sections is None:
+        logger.debug(f"Falling back to a full TOML parse to read [{table}]")
+        return _navigate(toml.loads(text), path)
+
+    # Root and parent tables ([tool] for tool.poetry) could define the table with
+    # dotted keys or an inline table, so any content there means a full parse.
+    ancestors = {".".join(path[:length]) for length in range(len(path))}
+    wanted: list[str] = []
+    for section in sections:
+        if section.name in ancestors:
+            body_start = section.start
+            if section.name:
+                newline = text.find("\n", section.start, section.end)
+                body_start = section.end if newline < 0 else newline + 1
+            if _CONTENT_LINE.search(text, body_start, section.end):
+                logger.debug(f"Falling back to a full TOML parse to read [{table}]")
+                return _navigate(toml.loads(text), path)
+        elif section.name == table or section.name.startswith(f"{table}."):
+            wanted.append(text[section.start : section.end])
+
+    if not wanted:
+        return None
+    return _navigate(toml.loads("\n".join(wanted)), path)
+
+
+def read_toml_table(source: str, table: str) -> dict[str, Any]:
+    """
+    Read one table (with its sub-tables) from a TOML file.
+
+    Args:
+        source: Path to the TOML file.
+        table: Dotted table name, e.g. ``"project"`` or ``"tool.poetry"``.
+
+    Returns:
+        The table's contents, or an empty dict if the file has no such table.
+    """
+    with open(source, encoding="utf-8") as file:
+        return load_toml_table(file.read(), table) or {}
@@ -6,11 +6,15 @@ Validation logic to check if __about__.py is in sync with source metadata.
 
 from __future__ import annotations
 
-import ast
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
+from metametameta.extract import extract_file
+from metametameta.pep508 import canonical_requirements
+from metametameta.project_metadata import ProjectMetadata
+
 logger = logging.getLogger(__name__)
 
 # Mapping from source metadata keys to the expected dunder names in __about__.py
@@ -29,18 +33,25 @@ def is_supported_sync_value(value: Any) -> bool:
     """Return True for metadata values that can be compared for sync."""
     if isinstance(value, str):
         return True
-    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+    return isinstance(value, (list, tuple)) and all(isinstance(item, str) for item in value)
 
 
 def normalize_sync_value(value: Any) -> Any:
     """Normalize supported metadata values for comparison."""
     if isinstance(value, str):
         return value.strip()
-    if isinstance(value, list):
+    if isinstance(value, (list, tuple)):
         return [item.strip() if isinstance(item, str) else item for item in value]
     return value
 
 
+def normalize_sync_value_for_key(key: str, value: Any) -> Any:
+    """Normalize a value for comparison, comparing dependencies by their canonical PEP 508 form."""
+    if key == "dependencies" and isinstance(value, (list, tuple)):
+        return canonical_requirements(value)
+    return normalize_sync_value(value)
+
+
 def is_empty_sync_value(value: Any) -> bool:
     """Return True when a supported sync value carries no metadata."""
     normalized_value = normalize_sync_value(value)
@@ -53,7 +64,7 @@ def is_empty_sync_value(value: Any) -> bool:
 
 def read_about_file_ast(file_path: Path) -> dict[str, Any]:
     """
-    Safely reads an __about__.py file using AST to extract metadata.
+    Safely reads an __about__.py file to extract metadata.
 
     This avoids executing the file and is resilient to formatting changes.
 
@@ -69,41 +80,16 @@ def read_about_file_ast(file_path: Path) -> dict[str, Any]:
     if not file_path.is_file():
         raise FileNotFoundError(f"Metadata file not found at: {file_path}")
 
-    logger.debug(f"Parsing metadata from {file_path} using AST.")
-    content = file_path.read_text(encoding="utf-8")
-    tree = ast.parse(content)
-    metadata = {}
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.AnnAssign):
-            target = node.target
-            value_node = node.value
-            if isinstance(target, ast.Name) and target.id.startswith("__") and value_node is not None:
-                try:
-                    value = ast.literal_eval(value_node)
-                    if is_supported_sync_value(value):
-                        metadata[target.id] = value
-                except (ValueError, TypeError, SyntaxError):
-                    logger.debug(f"Skipping non-literal annotation-assignment for {target.id}")
-        elif isinstance(node, ast.Assign):
-            for assign_target in node.targets:
-                if isinstance(assign_target, ast.Name) and assign_target.id.startswith("__"):
-                    try:
-                        value = ast.literal_eval(node.value)
-                        if is_supported_sync_value(value):
-                            metadata[assign_target.id] = value
-                    except (ValueError, TypeError, SyntaxError):
-                        # Ignore values that aren't simple literals (e.g., function calls)
-                        logger.debug(f"Skipping non-literal assignment for {assign_target.id}")
-    return metadata
-
-
-def check_sync(source_metadata: dict[str, Any], about_path: Path) -> list[str]:
+    logger.debug(f"Parsing metadata from {file_path}.")
+    return {key: value for key, value in extract_file(file_path).items() if is_supported_sync_value(value)}
+
+
+def check_sync(source_metadata: Mapping[str, Any], about_path: Path) -> list[str]:
     """
     Compares source metadata with an __about__.py file to check for sync.
 
     Args:
-        source_metadata: The dictionary of metadata from the source (e.g., pyproject.toml).
+        source_metadata: The metadata from the source (e.g., pyproject.toml), as a dict or a ProjectMetadata record.
         about_path: The path to the __about__.py file to check.
 
     Returns:
@@ -117,8 +103,8 @@ def check_sync(source_metadata: dict[str, Any], about_path: Path) -> list[str]:
 
     mismatches = []
 
-    # Normalize source keys for comparison
-    normalized_source = {k.lower().replace("-", "_"): v for k, v in source_metadata.items()}
+    # Normalize source keys for comparison; a record is already normalized.
+    normalized_source = ProjectMetadata.from_mapping(source_metadata)
 
     for source_key, about_key in KEY_MAP.items():
         if source_key in normalized_source:
@@ -133,7 +119,9 @@ def check_sync(source_metadata: dict[str, Any], about_path: Path) -> list[str]:
                 if is_empty_sync_value(source_value):
                     continue
                 mismatches.append(f"'{about_key}' is missing from {about_path.name}")
-            elif normalize_sync_value(source_value) != normalize_sync_value(about_value):
+            elif normalize_sync_value_for_key(source_key, source_value) != normalize_sync_value_for_key(
+                source_key, about_value
+            ):
                 mismatch_msg = (
                     f"'{about_key}' is out of sync. Source: '{source_value}', {about_path.name}: '{about_value}'"
                 )
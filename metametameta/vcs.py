@@ -0,0 +1,565 @@
+"""
+Compute a setuptools-scm style version from a git repository without running git.
+
+Projects versioned by setuptools-scm or hatch-vcs have no version in any file,
+and spawning ``git describe`` per project adds up to hundreds of subprocesses in
+a monorepo. This module reads ``.git`` directly: refs and packed-refs, loose
+objects (zlib) and pack files (index lookup plus delta resolution), then walks
+commit ancestry from ``HEAD`` to the nearest version tag the way ``git
+describe --tags`` does.
+
+Repositories are cached per git directory, so the tag-to-commit map and pack
+indexes are built once however many projects share the repository, and the
+computed version is cached per ``HEAD`` and tag state.
+
+Only what is needed for a version is read. Working-tree dirtiness is not
+checked, so a modified checkout gets the same version as its ``HEAD``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# setuptools-scm's default tag pattern: an optional prefix, then the version.
+TAG_VERSION_PATTERN = re.compile(r"^(?:[\w-]+-)?[vV]?(?P<version>\d+(?:\.\d+){0,2}[^+]*)(?:\+.*)?$")
+
+# How many symbolic refs are followed before giving up (guards against cycles).
+MAX_REF_DEPTH = 8
+
+# Pack object type codes.
+_OBJECT_TYPES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_OFS_DELTA = 6
+_REF_DELTA = 7
+
+_READ_CHUNK = 4096
+
+# How the part of a tag's version after the release numbers ranks, for choosing among tags on one commit.
+_SUFFIX_RANKS = {"dev": 0, "a": 1, "alpha": 1, "b": 1, "beta": 1, "c": 1, "rc": 1, "pre": 1, "preview": 1}
+_FINAL_RANK = 2
+_POST_RANK = 3
+_VERSION_PARTS = re.compile(r"(?P<release>\d+(?:\.\d+)*)[.\-_]?(?P<label>[a-zA-Z]*)[.\-_]?(?P<number>\d*)")
+
+
+class GitError(ValueError):
+    """Raised when a repository cannot be read."""
+
+
+class Commit(NamedTuple):
+    """The parts of a commit needed to walk history."""
+
+    parents: tuple[str, ...]
+    time: int
+
+
+class Description(NamedTuple):
+    """What ``git describe --tags --long`` reports: the tag (if any), the distance from it, and HEAD."""
+
+    tag: str | None
+    distance: int
+    node: str
+
+
+def find_git_dir(start: Path) -> Path | None:
+    """
+    Find the git directory of the repository containing ``start``.
+
+    Args:
+        start: A directory inside the working tree.
+
+    Returns:
+        The git directory (following ``.git`` files of worktrees and submodules), or None.
+    """
+    current = start.resolve()
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:") :].strip()).resolve()
+    return None
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Read a delta header size: little-endian groups of 7 bits."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Rebuild an object from its base and a git delta.
+
+    Args:
+        base: The base object's content.
+        delta: Copy and insert instructions, prefixed by the source and target sizes.
+
+    Returns:
+        The target object's content.
+
+    Raises:
+        GitError: If the delta is malformed or does not fit the base.
+    """
+    source_size, pos = _varint(delta, 0)
+    target_size, pos = _varint(delta, pos)
+    if source_size != len(base):
+        raise GitError("delta base has the wrong size")
+    out = bytearray()
+    while pos < len(delta):
+        opcode = delta[pos]
+        pos += 1
+        if opcode & 0x80:
+            offset = size = 0
+            for index in range(4):
+                if opcode & (1 << index):
+                    offset |= delta[pos] << (8 * index)
+                    pos += 1
+            for index in range(3):
+                if opcode & (0x10 << index):
+                    size |= delta[pos] << (8 * index)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif opcode:
+            out += delta[pos : pos + opcode]
+            pos += opcode
+        else:
+            raise GitError("invalid delta opcode")
+    if len(out) != target_size:
+        raise GitError("delta produced the wrong size")
+    return bytes(out)
+
+
+def _inflate(file: BinaryIO) -> bytes:
+    """Decompress one zlib stream starting at the file's current position."""
+    decompressor = zlib.decompressobj()
+    chunks = []
+    while not decompressor.eof:
+        chunk = file.read(_READ_CHUNK)
+        if not chunk:
+            raise GitError("truncated object")
+        chunks.append(decompressor.decompress(chunk))
+    return b"".join(chunks)
+
+
+class _Pack:
+    """A pack file and its version 2 index."""
+
+    def __init__(self, index_path: Path) -> None:
+        data = index_path.read_bytes()
+        if data[:8] != b"\377tOc\0\0\0\2":
+            raise GitError(f"unsupported pack index {index_path.name}")
+        self.fanout = struct.unpack(">256I", data[8 : 8 + 1024])
+        self.count = self.fanout[255]
+        self.names_start = 8 + 1024
+        self.offsets_start = self.names_start + 24 * self.count
+        self.large_offsets_start = self.offsets_start + 4 * self.count
+        self.index = data
+        self.path = index_path.with_suffix(".pack")
+        self.lock = threading.Lock()
+        self.file: BinaryIO = open(self.path, "rb")  # pylint: disable=consider-using-with
+
+    def close(self) -> None:
+        """Close the pack file."""
+        with self.lock:
+            self.file.close()
+
+    def offset(self, sha: bytes) -> int | None:
+        """Return the pack offset of an object, or None if this pack does not hold it."""
+        low = self.fanout[sha[0] - 1] if sha[0] else 0
+        high = self.fanout[sha[0]]
+        while low < high:
+            middle = (low + high) // 2
+            start = self.names_start + 20 * middle
+            name = self.index[start : start + 20]
+            if name == sha:
+                (offset,) = struct.unpack_from(">I", self.index, self.offsets_start + 4 * middle)
+                if offset & 0x80000000:
+                    large = self.large_offsets_start + 8 * (offset & 0x7FFFFFFF)
+                    (offset,) = struct.unpack_from(">Q", self.index, large)
+                return int(offset)
+            if name < sha:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def read_raw(self, offset: int) -> tuple[int, bytes, int | bytes | None]:
+        """Read the entry at ``offset``: its type code, inflated data, and delta base (offset or sha)."""
+        with self.lock:
+            self.file.seek(offset)
+            header = self.file.read(32)
+            byte = header[0]
+            type_code = (byte >> 4) & 7
+            pos = 1
+            while byte & 0x80:
+                byte = header[pos]
+                pos += 1
+            base: int | bytes | None = None
+            if type_code == _OFS_DELTA:
+                byte = header[pos]
+                pos += 1
+                distance = byte & 0x7F
+                while byte & 0x80:
+                    byte = header[pos]
+                    pos += 1
+                    distance = ((distance + 1) << 7) | (byte & 0x7F)
+                base = offset - distance
+            elif type_code == _REF_DELTA:
+                base = header[pos : pos + 20]
+                pos += 20
+            self.file.seek(offset + pos)
+            return type_code, _inflate(self.file), base
+
+
+class GitRepository:
+    """Read-only access to the refs and objects of one repository."""
+
+    def __init__(self, git_dir: Path) -> None:
+        """
+        Open a repository.
+
+        Args:
+            git_dir: The ``.git`` directory (or a worktree's git directory).
+        """
+        self.git_dir = git_dir
+        common = git_dir / "commondir"
+        self.common_dir = (
+            (git_dir / common.read_text(encoding="utf-8").strip()).resolve() if common.is_file() else git_dir
+        )
+        self.objects_dir = self.common_dir / "objects"
+        self._packs: list[_Pack] | None = None
+        self._commits: dict[str, Commit] = {}
+        self._tags: tuple[tuple[int, ...], dict[str, list[str]]] | None = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> GitRepository:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the open pack files; they are reopened if the repository is read again."""
+        with self._lock:
+            packs, self._packs = self._packs or [], None
+        for pack in packs:
+            pack.close()
+
+    def packs(self, reload: bool = False) -> list[_Pack]:
+        """
+        Return the repository's packs, loading their indexes on first use.
+
+        A reload keeps the packs that are still on disk and closes those that are gone (e.g. after ``git gc``).
+        """
+        with self._lock:
+            if self._packs is None or reload:
+                pack_dir = self.objects_dir / "pack"
+                indexes = sorted(pack_dir.glob("*.idx")) if pack_dir.is_dir() else []
+                loaded = {pack.path.with_suffix(".idx"): pack for pack in self._packs or []}
+                self._packs = [loaded.pop(index) if index in loaded else _Pack(index) for index in indexes]
+                for pack in loaded.values():
+                    pack.close()
+            return self._packs
+
+    def packed_refs(self) -> dict[str, str]:
+        """Return packed refs, with peeled tags stored under ``<ref>^{}``."""
+        refs: dict[str, str] = {}
+        path = self.common_dir / "packed-refs"
+        if not path.is_file():
+            return refs
+        last = ""
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("^"):
+                refs[f"{last}^{{}}"] = line[1:].strip()
+                continue
+            sha, _, last = line.partition(" ")
+            refs[last] = sha
+        return refs
+
+    def resolve_ref(self, name: str) -> str | None:
+        """Resolve a ref (following symbolic refs) to an object id."""
+        for _ in range(MAX_REF_DEPTH):
+            for base in (self.git_dir, self.common_dir):
+                path = base / name
+                if path.is_file():
+                    value = path.read_text(encoding="utf-8").strip()
+                    break
+            else:
+                return self.packed_refs().get(name)
+            if not value.startswith("ref:"):
+                return value
+            name = value[len("ref:") :].strip()
+        raise GitError(f"symbolic ref {name} nests too deeply")
+
+    def head(self) -> str | None:
+        """Return the commit ``HEAD`` points at, or None in a repository without commits."""
+        return self.resolve_ref("HEAD")
+
+    def read_object(self, sha: str) -> tuple[str, bytes]:
+        """
+        Read an object by id from loose storage or a pack.
+
+        Returns:
+            The object type and content.
+
+        Raises:
+            GitError: If the object does not exist or cannot be decoded.
+        """
+        loose = self.objects_dir / sha[:2] / sha[2:]
+        if loose.is_file():
+            data = zlib.decompress(loose.read_bytes())
+            header, _, content = data.partition(b"\0")
+            return header.split(b" ")[0].decode("ascii"), content
+        binary = bytes.fromhex(sha)
+        for reload in (False, True):
+            for pack in self.packs(reload):
+                offset = pack.offset(binary)
+                if offset is not None:
+                    return self._read_packed(pack, offset)
+        raise GitError(f"object {sha} not found")
+
+    def _read_packed(self, pack: _Pack, offset: int) -> tuple[str, bytes]:
+        type_code, data, base = pack.read_raw(offset)
+        if type_code == _OFS_DELTA:
+            base_type, base_data = self._read_packed(pack, base)  # type: ignore[arg-type]
+            return base_type, apply_delta(base_data, data)
+        if type_code == _REF_DELTA:
+            base_type, base_data = self.read_object(base.hex())  # type: ignore[union-attr]
+            return base_type, apply_delta(base_data, data)
+        if type_code not in _OBJECT_TYPES:
+            raise GitError(f"unknown object type {type_code}")
+        return _OBJECT_TYPES[type_code], data
+
+    def commit(self, sha: str) -> Commit:
+        """Return a commit's parents and committer time."""
+        cached = self._commits.get(sha)
+        if cached is not None:
+            return cached
+        kind, content = self.read_object(sha)
+        if kind != "commit":
+            raise GitError(f"{sha} is a {kind}, not a commit")
+        parents = []
+        time = 0
+        for line in content.split(b"\n"):
+            if not line:
+                break
+            if line.startswith(b"parent "):
+                parents.append(line[7:].decode("ascii"))
+            elif line.startswith(b"committer "):
+                time = int(line.rsplit(b" ", 2)[1])
+        commit = Commit(tuple(parents), time)
+        self._commits[sha] = commit
+        return commit
+
+    def peel(self, sha: str) -> str:
+        """Follow annotated tag objects to the commit they point at."""
+        for _ in range(MAX_REF_DEPTH):
+            kind, content = self.read_object(sha)
+            if kind != "tag":
+                return sha
+            sha = content.split(b"\n", 1)[0].split(b" ")[1].decode("ascii")
+        raise GitError(f"tag {sha} nests too deeply")
+
+    def tag_commits(self) -> dict[str, list[str]]:
+        """Map each tagged commit to the names of its tags, rebuilt only when the tag refs change."""
+        signature = self.tags_signature()
+        if self._tags is not None and self._tags[0] == signature:
+            return self._tags[1]
+        tags: dict[str, str] = {}
+        packed = self.packed_refs()
+        for ref, sha in packed.items():
+            if ref.startswith("refs/tags/") and not ref.endswith("^{}"):
+                tags[ref[len("refs/tags/") :]] = packed.get(f"{ref}^{{}}") or sha
+        tag_dir = self.common_dir / "refs" / "tags"
+        for directory, _, files in os.walk(tag_dir):
+            for file_name in files:
+                path = Path(directory) / file_name
+                tags[path.relative_to(tag_dir).as_posix()] = path.read_text(encoding="utf-8").strip()
+
+        commits: dict[str, list[str]] = {}
+        for name, sha in tags.items():
+            try:
+                commits.setdefault(self.peel(sha), []).append(name)
+            except GitError as e:
+                logger.debug(f"Skipping tag {name}: {e}")
+        self._tags = (signature, commits)
+        return commits
+
+    def tags_signature(self) -> tuple[int, ...]:
+        """
+        Return a cheap fingerprint of the tag refs, for cache keys.
+
+        Covers ``packed-refs`` and every directory under ``refs/tags``, so tags added,
+        moved or deleted in nested directories such as ``refs/tags/release/`` change it too.
+        """
+        signature = []
+        try:
+            signature.append(os.stat(self.common_dir / "packed-refs").st_mtime_ns)
+        except OSError:
+            signature.append(0)
+        for directory, _, files in os.walk(self.common_dir / "refs" / "tags"):
+            try:
+                signature.append(os.stat(directory).st_mtime_ns)
+                signature.extend(os.stat(os.path.join(directory, name)).st_mtime_ns for name in files)
+            except OSError:
+                signature.append(0)
+        return tuple(signature)
+
+    def _by_date(self, starts: dict[str, int]) -> list[tuple[int, str]]:
+        return [(-self.commit(sha).time, sha) for sha in starts]
+
+    def distance(self, head: str, base: str | None) -> int:
+        """
+        Count the commits reachable from ``head`` but not from ``base``.
+
+        Walks both histories newest first, like git's merge-base search, and
+        stops once every commit left to visit is known to be reachable from ``base``.
+        """
+        flags = {head: 1}
+        if base is not None:
+            flags[base] = flags.get(base, 0) | 2
+        queue = self._by_date(flags)
+        heapq.heapify(queue)
+        while queue and not all(flags[sha] & 2 for _, sha in queue):
+            _, sha = heapq.heappop(queue)
+            flag = flags[sha]
+            for parent in self.commit(sha).parents:
+                merged = flags.get(parent, 0) | flag
+                if merged != flags.get(parent, 0):
+                    flags[parent] = merged
+                    heapq.heappush(queue, (-self.commit(parent).time, parent))
+        return sum(1 for flag in flags.values() if flag == 1)
+
+    def describe(self, pattern: re.Pattern[str] = TAG_VERSION_PATTERN) -> Description | None:
+        """
+        Describe ``HEAD`` relative to the nearest tag matching ``pattern``.
+
+        When the nearest tagged commit has several matching tags, the one with the
+        highest version wins (see :func:`tag_version_key`), so ``v1.10`` beats ``v1.9``.
+
+        Returns:
+            The description, or None if the repository has no commits.
+        """
+        head = self.head()
+        if head is None:
+            return None
+        tagged = {sha: [name for name in names if pattern.match(name)] for sha, names in self.tag_commits().items()}
+        queue = [(-self.commit(head).time, head)]
+        seen = {head}
+        while queue:
+            _, sha = heapq.heappop(queue)
+            if tagged.get(sha):
+                tag = max(tagged[sha], key=lambda name: (tag_version_key(name, pattern), name))
+                return Description(tag, self.distance(head, sha), head)
+            for parent in self.commit(sha).parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(queue, (-self.commit(parent).time, parent))
+        return Description(None, len(seen), head)
+
+
+def tag_version_key(tag: str, pattern: re.Pattern[str] = TAG_VERSION_PATTERN) -> tuple[tuple[int, ...], int, str, int]:
+    """
+    Return a key that sorts version tags by the version they carry, not by name.
+
+    The release numbers compare numerically (trailing zeros ignored); then dev releases
+    sort below pre-releases, which sort below the final release and post-releases.
+
+    Examples:
+        >>> sorted(["v1.10", "v1.9", "v1.10rc1", "v1.10.post1"], key=tag_version_key)
+        ['v1.9', 'v1.10rc1', 'v1.10', 'v1.10.post1']
+
+    Args:
+        tag: The tag name.
+        pattern: The tag pattern; its ``version`` group, if any, holds the version.
+
+    Returns:
+        ``(release, rank, label, number)``; tags without a version sort lowest.
+    """
+    match = pattern.match(tag)
+    version = match.group("version") if match and "version" in pattern.groupindex else tag
+    parts = _VERSION_PARTS.match(version)
+    if parts is None:
+        return ((), -1, "", 0)
+    release = tuple(int(number) for number in parts.group("release").split("."))
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    label = parts.group("label").lower()
+    rank = _SUFFIX_RANKS.get(label, _POST_RANK) if label else _FINAL_RANK
+    return release, rank, label, int(parts.group("number") or 0)
+
+
+def format_version(description: Description, pattern: re.Pattern[str] = TAG_VERSION_PATTERN) -> str:
+    """
+    Format a description the way setuptools-scm does by default (``guess-next-dev`` + ``node-and-date``).
+
+    Examples:
+        A tagged commit gives ``1.2.3``; five commits later it is ``1.2.4.dev5+g1a2b3c4``;
+        without any tag, ``0.1.dev12+g1a2b3c4``.
+    """
+    node = f"g{description.node[:7]}"
+    if description.tag is None:
+        return f"0.1.dev{description.distance}+{node}"
+    match = pattern.match(description.tag)
+    version = match.group("version") if match else description.tag
+    if not description.distance:
+        return version
+    bumped = re.sub(r"(\d+)(?!.*\d)", lambda last: str(int(last.group(1)) + 1), version, count=1)
+    return f"{bumped}.dev{description.distance}+{node}"
+
+
+@lru_cache(maxsize=32)
+def _repository(git_dir: str) -> GitRepository:
+    return GitRepository(Path(git_dir))
+
+
+@lru_cache(maxsize=256)
+def _cached_version(  # pylint: disable=unused-argument
+    git_dir: str, head: str, tags_signature: tuple[int, ...]
+) -> str | None:
+    description = _repository(git_dir).describe()
+    return format_version(description) if description else None
+
+
+def describe_version(project_root: Path) -> str | None:
+    """
+    Compute the version setuptools-scm would give the repository containing ``project_root``.
+
+    Args:
+        project_root: A directory inside the working tree.
+
+    Returns:
+        The version, or None if there is no readable repository or no commit.
+    """
+    try:
+        git_dir = find_git_dir(project_root)
+        if git_dir is None:
+            return None
+        repository = _repository(str(git_dir))
+        head = repository.head()
+        if head is None:
+            return None
+        return _cached_version(str(git_dir), head, repository.tags_signature())
+    except (OSError, GitError, ValueError, zlib.error) as e:
+        logger.warning(f"Could not compute a version from git for {project_root}: {e}")
+        return None
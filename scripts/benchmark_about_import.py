@@ -0,0 +1,79 @@
+"""Benchmark what a service pays at startup to import __about__ and compare its version."""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+from pathlib import Path
+
+from metametameta.general import any_metadict, merge_sections
+
+METADATA = {
+    "name": "demo_service",
+    "version": "2.7.0rc1",
+    "description": "A service that checks its own version at startup",
+    "dependencies": [f"dependency-{index}>=1.{index}" for index in range(40)],
+}
+
+# What each variant runs in a fresh interpreter: import the metadata and use the version.
+VARIANTS = {
+    "plain + packaging": (
+        False,
+        "from demo_service.__about__ import __version__\n"
+        "from packaging.version import Version\n"
+        "assert Version(__version__) >= Version('2.6')\n",
+    ),
+    "precomputed": (
+        True,
+        "from demo_service.__about__ import __version_info__\nassert __version_info__ >= (2, 6)\n",
+    ),
+}
+
+# A top-level (unindented) entry of ``-X importtime`` output.
+_TOP_LEVEL_IMPORT = re.compile(r"^import time:\s+\d+\s+\|\s+(?P<cumulative>\d+)\s+\| (?P<module>\S+)$")
+
+
+def write_project(root: Path, precompute: bool) -> None:
+    """Write the demo package's __about__.py, with or without precomputed constants."""
+    package = root / "demo_service"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    content, names = any_metadict(METADATA, precompute=precompute)
+    (package / "__about__.py").write_text(merge_sections(names, "demo_service", content), encoding="utf-8")
+
+
+def startup_cost(root: Path, code: str) -> int:
+    """Return the microseconds ``-X importtime`` attributes to the top-level imports ``code`` triggers."""
+    result = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", code], cwd=root, capture_output=True, text=True, check=True
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _TOP_LEVEL_IMPORT.match(line)
+        if match and match.group("module").startswith(("demo_service", "packaging")):
+            total += int(match.group("cumulative"))
+    return total
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=15, help="Fresh interpreters per variant.")
+    args = parser.parse_args()
+
+    for label, (precompute, code) in VARIANTS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            write_project(root, precompute)
+            startup_cost(root, code)  # write __pycache__ first, as an installed package would have
+            costs = [startup_cost(root, code) for _ in range(args.repeat)]
+        print(f"{label:<18} median {statistics.median(costs):7.0f} us   min {min(costs):7.0f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Benchmark requirements.txt parsing on a large pip-compile style file with hashes."""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from metametameta.from_requirements_txt import parse_requirement_line, read_requirements_txt_metadata
+
+HASHES_PER_PACKAGE = 12
+
+
+def write_compiled_requirements(path: Path, lines: int) -> int:
+    """Write a pip-compile style file of roughly ``lines`` lines and return the package count."""
+    packages = lines // (HASHES_PER_PACKAGE + 2)
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("#\n# This file is autogenerated by pip-compile\n#\n")
+        for index in range(packages):
+            file.write(f"package-{index}=={index % 7}.{index % 13}.{index % 3} \\\n")
+            for hash_index in range(HASHES_PER_PACKAGE):
+                digest = f"{index:032x}{hash_index:032x}"
+                end = " \\\n" if hash_index < HASHES_PER_PACKAGE - 1 else "\n"
+                file.write(f"    --hash=sha256:{digest}{end}")
+            file.write(f"    # via package-{max(index - 1, 0)}\n")
+    return packages
+
+
+def read_whole_file(path: Path) -> list[str]:
+    """The previous approach: load the file, split it, and parse every physical line."""
+    requirements = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        parsed = parse_requirement_line(line)
+        if parsed:
+            requirements.append(parsed)
+    return requirements
+
+
+def measure(label: str, func, repeat: int) -> None:
+    """Print the best wall time and the peak traced memory of ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {best * 1000:8.1f} ms   peak {peak / 1024:8.0f} KiB")
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=50_000, help="Approximate file length.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per parser.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "requirements.txt"
+        packages = write_compiled_requirements(path, args.lines)
+        streamed = read_requirements_txt_metadata(str(path), name="bench")["dependencies"]
+        if len(streamed) != packages:
+            raise SystemExit(f"Expected {packages} requirements, parsed {len(streamed)}.")
+        print(f"{packages} packages, {path.stat().st_size / 1024:.0f} KiB")
+        measure("whole-file", lambda: read_whole_file(path), args.repeat)
+        measure("streaming", lambda: read_requirements_txt_metadata(str(path), name="bench"), args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
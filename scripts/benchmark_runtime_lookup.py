@@ -0,0 +1,34 @@
+"""Benchmark version lookups with metametameta.runtime against importlib.metadata."""
+
+from __future__ import annotations
+
+import argparse
+import importlib.metadata
+import timeit
+
+from metametameta import runtime
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("packages", nargs="*", default=["metametameta", "pytest"], help="Packages to look up.")
+    parser.add_argument("--number", type=int, default=200, help="Lookups per measurement.")
+    args = parser.parse_args()
+
+    for package in args.packages:
+        runtime.clear_cache()
+        first = timeit.timeit(lambda package=package: runtime.version(package), number=1)
+        variants = {
+            "importlib.metadata": lambda package=package: importlib.metadata.version(package),
+            "runtime (cached)": lambda package=package: runtime.version(package),
+        }
+        print(f"{package} (runtime first lookup {first * 1e6:.0f} us)")
+        for label, lookup in variants.items():
+            best = min(timeit.repeat(lookup, number=args.number, repeat=5)) / args.number
+            print(f"  {label:<20} {best * 1e6:10.2f} us per lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
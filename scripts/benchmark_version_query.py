@@ -0,0 +1,68 @@
+"""Benchmark `mmm version` per invocation and per additional path against the full CLI."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# The console script's entry point, and the full CLI that parses every subcommand.
+FAST = [sys.executable, "-c", "from metametameta.console import main; raise SystemExit(main())"]
+FULL = [sys.executable, "-c", "from metametameta.__main__ import main; raise SystemExit(main())"]
+
+
+def write_projects(root: Path, count: int) -> list[str]:
+    """Write ``count`` projects: half versioned in pyproject.toml, half in a generated __about__.py."""
+    paths = []
+    for index in range(count):
+        project = root / f"project_{index}"
+        package = project / "src" / f"project_{index}"
+        package.mkdir(parents=True)
+        if index % 2:
+            pyproject = f'[project]\nname = "project-{index}"\ndynamic = ["version"]\n'
+            (package / "__about__.py").write_text(f'__version__ = "1.{index}.0"\n', encoding="utf-8")
+        else:
+            pyproject = f'[project]\nname = "project-{index}"\nversion = "1.{index}.0"\n'
+        (project / "pyproject.toml").write_text(pyproject + "\n[tool.ruff]\nline-length = 120\n" * 20, encoding="utf-8")
+        paths.append(str(project))
+    return paths
+
+
+def wall_time(command: list[str], repeat: int) -> float:
+    """Return the median milliseconds a command takes."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)  # nosec
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--projects", type=int, default=100, help="Paths passed in the many-paths run.")
+    parser.add_argument("--repeat", type=int, default=15, help="Invocations per measurement.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_projects(Path(directory), args.projects)
+        baseline = wall_time([sys.executable, "-c", "pass"], args.repeat)
+        one = wall_time([*FAST, "version", paths[0]], args.repeat)
+        many = wall_time([*FAST, "version", *paths], args.repeat)
+        full = wall_time([*FULL, "version", paths[0]], args.repeat)
+    print(f"bare interpreter          {baseline:7.1f} ms")
+    print(f"mmm version, 1 path       {one:7.1f} ms")
+    print(
+        f"mmm version, {args.projects} paths  {many:7.1f} ms  ({(many - one) / (args.projects - 1):.2f} ms per extra path)"
+    )
+    print(f"full CLI, 1 path          {full:7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from metametameta.autodetect import detect_source
+from metametameta.autodetect import SourceDetection, detect, detect_source
 
 
 def test_detect_source_uses_requirements_txt_as_fallback(tmp_path):
@@ -49,3 +49,38 @@ def test_detect_source_reports_multiple_fallback_sources(tmp_path):
 
     with pytest.raises(ValueError, match="requirements_txt, conda_meta"):
         detect_source(tmp_path)
+
+
+def test_detect_stops_reading_requirements_at_first_requirement(tmp_path):
+    # The tail is not valid UTF-8, so reading the whole file would fail.
+    pins = b"".join(b"    --hash=sha256:%064d \\\n" % index for index in range(5000))
+    (tmp_path / "requirements.txt").write_bytes(b"# pinned\n\nclick==8.1.7 \\\n" + pins + b"\xff")
+
+    assert detect_source(tmp_path) == "requirements_txt"
+
+
+def test_detect_skips_fallback_probes_when_primary_source_exists(tmp_path):
+    (tmp_path / "setup.cfg").write_text("[metadata]\nname = demo-app\n", encoding="utf-8")
+    (tmp_path / "requirements.txt").write_bytes(b"\xff\xfe not utf-8")
+
+    detection = detect(tmp_path)
+
+    assert detection == SourceDetection("setup_cfg", tmp_path / "setup.cfg")
+
+
+def test_detect_returns_parsed_pyproject_table(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(
+        '[project]\nname = "demo-app"\nversion = "1.0"\n\n[tool.ruff]\nline-length = 120\n', encoding="utf-8"
+    )
+
+    detection = detect(tmp_path)
+
+    assert detection.source == "pep621"
+    assert detection.path == tmp_path / "pyproject.toml"
+    assert detection.table == {"name": "demo-app", "version": "1.0"}
+
+
+def test_detect_source_treats_empty_project_table_as_pep621(tmp_path):
+    (tmp_path / "pyproject.toml").write_text("[project]\n\n[tool.black]\nline-length = 120\n", encoding="utf-8")
+
+    assert detect_source(tmp_path) == "pep621"
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 
 from metametameta.find_it import find_metadata_in_file, find_metadata_in_module, main
@@ -120,3 +122,57 @@ def test_find_metadata_in_file_bad_format(tmp_path):
     # Expecting to capture the exception, since not a valid string
     metadata = find_metadata_in_file(bad_format_file)
     assert not metadata  # This test assumes the function should return an empty dict rather than raise an error
+
+
+def test_find_metadata_in_module_prunes_cache_and_test_dirs(tmp_path):
+    for pruned in ("__pycache__", "tests", "_vendor", "pkg.dist-info"):
+        about_file = tmp_path / pruned / "about.py"
+        about_file.parent.mkdir()
+        about_file.write_text("__version__ = '9.9.9'\n", encoding="utf-8")
+    kept = tmp_path / "pkg" / "__about__.py"
+    kept.parent.mkdir()
+    kept.write_text("__version__ = '1.0.0'\n", encoding="utf-8")
+
+    assert find_metadata_in_module(tmp_path) == {"pkg.__about__": {"version": "1.0.0"}}
+
+
+def test_find_metadata_in_module_skips_files_without_version_marker(tmp_path):
+    (tmp_path / "about.py").write_text("__author__ = 'No Version'\n", encoding="utf-8")
+    (tmp_path / "empty_about.py").write_text("", encoding="utf-8")
+
+    assert not find_metadata_in_module(tmp_path)
+
+
+def test_find_metadata_in_module_large_file_uses_mmap_path(tmp_path):
+    padding = "# padding\n" * 10_000
+    (tmp_path / "big_about.py").write_text(padding + "__version__ = '3.0.0'\n", encoding="utf-8")
+    (tmp_path / "big_nothing_about.py").write_text(padding, encoding="utf-8")
+
+    assert find_metadata_in_module(tmp_path, workers=2) == {"big_about": {"version": "3.0.0"}}
+
+
+def test_main_streams_ndjson(capsys):
+    main(["metametameta", "--ndjson"])
+
+    records = {record["module"]: record["metadata"] for record in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert "version" in records["__about__"]
+
+
+def test_results_stream_while_the_walk_is_running(tmp_path, monkeypatch):
+    from metametameta import find_it
+
+    for index in range(50):
+        (tmp_path / f"mod_{index}.py").write_text(f"__version__ = '{index}'\n", encoding="utf-8")
+    walked = []
+
+    def slow_walk(module_path, pruned):
+        for file_path in sorted(tmp_path.glob("*.py")):
+            walked.append(file_path)
+            yield file_path
+
+    monkeypatch.setattr(find_it, "iter_candidate_files", slow_walk)
+    results = find_it.iter_metadata_in_module(tmp_path, workers=2)
+    next(results)
+
+    assert len(walked) <= find_it.PENDING_PER_WORKER * 2
+    assert len(list(results)) == 49
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from metametameta.from_conda_meta import generate_from_conda_meta, read_conda_meta_metadata
+import pytest
+
+from metametameta.from_conda_meta import (
+    generate_from_conda_meta,
+    parse_recipe_yaml,
+    read_conda_meta_metadata,
+    read_conda_recipe,
+    render_recipe,
+)
 
 
 def test_read_conda_meta_metadata(tmp_path):
@@ -161,3 +169,142 @@ about:
 
     assert generated_path == str(nested_output)
     assert '__description__ = "Demo package"' in nested_output.read_text(encoding="utf-8")
+
+
+MULTI_OUTPUT_RECIPE = """
+{% set name = "Foo-Split" %}
+{% set version = "2.4.1" %}
+{% set major = version.split('.')[0] %}
+{# build notes #}
+
+package:
+  name: {{ name|lower }}
+  version: {{ version }}
+
+source:
+  url: https://pypi.io/packages/source/{{ name[0] }}/{{ name }}/{{ name }}-{{ version }}.tar.gz
+
+requirements:
+  run:
+    - python >=3.9
+
+outputs:
+  - name: libfoo
+    requirements:
+      build:
+        - {{ compiler('c') }}
+      run:
+        - zlib
+  - name: {{ name|lower }}-py
+    version: {{ major ~ ".0" }}
+    requirements:
+      - {{ pin_subpackage('libfoo', exact=True) }}
+      - numpy >=1.20  # [py>38]
+    about:
+      summary: Python bindings
+
+about:
+  home: https://example.com/foo
+  license: MIT
+  description: |
+    Foo is a library.
+    It splits things.
+"""
+
+
+@pytest.mark.parametrize(
+    "template, expected",
+    [
+        ('{% set name = "Demo_Pkg" %}{{ name|lower|replace("_", "-") }}', "demo-pkg"),
+        ("{% set version = '1.2.3' %}{{ version.split('.')[0] ~ '.x' }}", "1.x"),
+        ("{{ environ.get('BUILD_NUMBER', 0) }}", "0"),
+        ("{{ undefined_name }}", "{{ undefined_name }}"),
+        ("{% if win %}a{% else %}b{% endif %}", "ab"),
+    ],
+)
+def test_render_recipe(template, expected):
+    assert render_recipe(template) == expected
+
+
+def test_runaway_recipe_expressions_are_left_unrendered(tmp_path):
+    meta_path = tmp_path / "recipe" / "meta.yaml"
+    meta_path.parent.mkdir()
+    meta_path.write_text(
+        '{% set x = "a" * 10000 %}\n'
+        "{% set y = [1 for i in x for j in x for k in x] %}\n"
+        "package:\n"
+        "  name: runaway\n"
+        "  version: {{ y }}\n"
+        "about:\n"
+        '  summary: {{ x|replace("a", x) }}\n'
+        "  license: {{ ('9' * 5000)|int }}\n",
+        encoding="utf-8",
+    )
+
+    recipe = read_conda_recipe(str(meta_path))
+
+    assert recipe.package == {"name": "runaway", "dependencies": []}
+
+
+def test_parse_recipe_yaml_keeps_scalars_as_strings():
+    parsed = parse_recipe_yaml("package:\n  version: 1.10\ntest:\n  imports: [foo, 'bar']\n")
+
+    assert parsed == {"package": {"version": "1.10"}, "test": {"imports": ["foo", "bar"]}}
+
+
+def test_parse_recipe_yaml_drops_selector_guarded_lines():
+    parsed = parse_recipe_yaml("""\
+requirements:
+  host:  # [win]
+    - msvc-runtime
+  run:
+    - requests  # [not win]
+    - pywin32  # [win]
+    - python >=3.9
+    - numpy  #[py>38]
+    - click  # pinned by the feedstock
+""")
+
+    assert parsed == {"requirements": {"run": ["python >=3.9", "click"]}}
+
+
+def test_parse_recipe_yaml_keeps_hashes_inside_quotes():
+    parsed = parse_recipe_yaml("""\
+about:
+  summary: 'A "quoted" summary #1'  # trailing comment
+  description: "It's #2 \\" here"
+  home: https://example.com/#docs
+  license: it's MIT # really
+""")
+
+    assert parsed == {
+        "about": {
+            "summary": 'A "quoted" summary #1',
+            "description": "It's #2 \\\" here",
+            "home": "https://example.com/#docs",
+            "license": "it's MIT",
+        }
+    }
+
+
+def test_read_conda_recipe_renders_jinja_and_reads_outputs(tmp_path):
+    meta_path = tmp_path / "recipe" / "meta.yaml"
+    meta_path.parent.mkdir()
+    meta_path.write_text(MULTI_OUTPUT_RECIPE, encoding="utf-8")
+
+    recipe = read_conda_recipe(str(meta_path))
+
+    assert recipe.package == {
+        "name": "foo-split",
+        "version": "2.4.1",
+        "license": "MIT",
+        "homepage": "https://example.com/foo",
+        "description": "Foo is a library.\nIt splits things.",
+        "dependencies": ["python >=3.9"],
+    }
+    assert [(output["name"], output["version"], output["dependencies"]) for output in recipe.outputs] == [
+        ("libfoo", "2.4.1", ["zlib"]),
+        ("foo-split-py", "2.0", ["libfoo"]),
+    ]
+    assert recipe.outputs[1]["summary"] == "Python bindings"
+    assert read_conda_meta_metadata(str(meta_path), name="libfoo") == recipe.outputs[0]
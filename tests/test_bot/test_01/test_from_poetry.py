@@ -63,3 +63,38 @@ def test_generate_from_poetry_with_no_dependencies_writes_typed_empty_list(tmp_p
 
     assert generated_path.endswith("__about__.py")
     assert "__dependencies__: list[str] = []" in generated_content
+
+
+def test_generate_from_poetry_writes_every_package_with_its_own_docstring(tmp_path, monkeypatch):
+    pyproject_file = tmp_path / "pyproject.toml"
+    packages = [f"pkg_{index}" for index in range(12)]
+    pyproject_file.write_text(
+        toml.dumps(
+            {
+                "tool": {
+                    "poetry": {
+                        "name": "multi",
+                        "version": "3.1.4",
+                        "packages": [{"include": package} for package in [*packages, "pkg_0", "missing"]],
+                    }
+                }
+            }
+        ),
+        encoding="utf-8",
+    )
+    for package in packages:
+        (tmp_path / package).mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    result = generate_from_poetry(source=str(pyproject_file), validate=True)
+
+    assert result.count("__about__.py") == len(packages)
+    bodies = set()
+    for package in packages:
+        content = (tmp_path / package / "__about__.py").read_text(encoding="utf-8")
+        docstring, body = content.split("\n\n", 1)
+        assert docstring == f'"""Metadata for {package}."""'
+        bodies.add(body)
+    assert len(bodies) == 1
+    assert '__version__ = "3.1.4"' in bodies.pop()
+    assert not (tmp_path / "missing").exists()
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import pytest
 
-from metametameta.from_requirements_txt import generate_from_requirements_txt, read_requirements_txt_metadata
+from metametameta.from_requirements_txt import (
+    RequirementsCache,
+    generate_from_requirements_txt,
+    iter_logical_lines,
+    parse_include_line,
+    read_requirements_txt_metadata,
+)
+from metametameta.pipeline import run_batch
 
 
 def test_read_requirements_txt_metadata(tmp_path):
@@ -93,3 +105,151 @@ def test_generate_from_requirements_txt_supports_custom_output_path(tmp_path, mo
 
     assert generated_path == str(nested_output)
     assert '__dependencies__ = ["click>=8"]' in nested_output.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "line, expected",
+    [
+        ("-r base.txt", "base.txt"),
+        ("-rbase.txt  # shared", "base.txt"),
+        ("--requirement=../common/base.txt", "../common/base.txt"),
+        ('--requirement "base.txt"', "base.txt"),
+        ("-c constraints.txt", None),
+        ("requests>=2", None),
+    ],
+)
+def test_parse_include_line(line, expected):
+    assert parse_include_line(line) == expected
+
+
+def test_read_requirements_txt_metadata_follows_nested_includes(tmp_path):
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "base.txt").write_text("click>=8\n-r extra.txt\n", encoding="utf-8")
+    (tmp_path / "common" / "extra.txt").write_text("rich\nclick>=8\n", encoding="utf-8")
+    requirements_path = tmp_path / "requirements.txt"
+    requirements_path.write_text("requests\n-r common/base.txt\n-c constraints.txt\nrich\n", encoding="utf-8")
+
+    metadata = read_requirements_txt_metadata(source=str(requirements_path), name="demo-app")
+
+    assert metadata["dependencies"] == ["requests", "click>=8", "rich"]
+
+
+def test_read_requirements_txt_metadata_breaks_include_cycles(tmp_path, caplog):
+    (tmp_path / "a.txt").write_text("alpha\n-r b.txt\n", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("beta\n-r a.txt\n-r missing.txt\n", encoding="utf-8")
+
+    with caplog.at_level(logging.WARNING):
+        metadata = read_requirements_txt_metadata(source=str(tmp_path / "a.txt"), name="demo-app")
+
+    assert metadata["dependencies"] == ["alpha", "beta"]
+    assert "include cycle: a.txt -> b.txt -> a.txt" in caplog.text
+    assert "missing.txt" in caplog.text
+
+
+def test_requirements_cache_parses_shared_includes_once(tmp_path, monkeypatch):
+    (tmp_path / "base.txt").write_text("click>=8\n", encoding="utf-8")
+    for project in ("api", "worker"):
+        (tmp_path / project).mkdir()
+        (tmp_path / project / "requirements.txt").write_text(f"-r ../base.txt\n{project}-lib\n", encoding="utf-8")
+    parsed: list[str] = []
+    parse = RequirementsCache._parse
+    monkeypatch.setattr(RequirementsCache, "_parse", staticmethod(lambda path: parsed.append(path) or parse(path)))
+    cache = RequirementsCache()
+
+    for project in ("api", "worker"):
+        metadata = read_requirements_txt_metadata(source=str(tmp_path / project / "requirements.txt"), cache=cache)
+        assert metadata["dependencies"] == ["click>=8", f"{project}-lib"]
+
+    assert sorted(parsed).count(str((tmp_path / "base.txt").resolve())) == 1
+    assert len(parsed) == 3
+
+
+def test_requirements_cache_parses_different_files_concurrently(tmp_path, monkeypatch):
+    slow, fast = str(tmp_path / "slow.txt"), str(tmp_path / "fast.txt")
+    for path in (slow, fast):
+        Path(path).write_text("click\n", encoding="utf-8")
+    fast_parsed = threading.Event()
+    parsed: list[str] = []
+    parse = RequirementsCache._parse
+
+    def parse_slow_after_fast(path):
+        parsed.append(path)
+        if path == slow:
+            assert fast_parsed.wait(timeout=5), "parsing one file blocked parsing another"
+        result = parse(path)
+        if path == fast:
+            fast_parsed.set()
+        return result
+
+    monkeypatch.setattr(RequirementsCache, "_parse", staticmethod(parse_slow_after_fast))
+    cache = RequirementsCache()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        slow_results = [pool.submit(cache.entries, slow) for _ in range(3)]
+        fast_result = pool.submit(cache.entries, fast)
+        assert fast_result.result() == (("requirement", "click"),)
+        assert all(result.result() == (("requirement", "click"),) for result in slow_results)
+
+    assert sorted(parsed) == sorted([slow, fast])
+
+
+def test_run_batch_follows_requirements_includes(tmp_path):
+    (tmp_path / "base.txt").write_text("click>=8\n", encoding="utf-8")
+    projects = []
+    for name in ("api_app", "worker_app"):
+        project = tmp_path / name
+        (project / name).mkdir(parents=True)
+        (project / "requirements.txt").write_text("-r ../base.txt\nrich\n", encoding="utf-8")
+        projects.append(project)
+
+    jobs = list(run_batch(tmp_path, projects=projects, fsync=False))
+
+    assert [job.status for job in jobs] == ["written", "written"]
+    for project in projects:
+        about = (project / project.name / "__about__.py").read_text(encoding="utf-8")
+        assert '__dependencies__ = ["click>=8", "rich"]' in about
+
+
+PIP_COMPILE_OUTPUT = """\
+#
+# This file is autogenerated by pip-compile with Python 3.12
+#
+--index-url https://pypi.org/simple
+
+certifi==2024.8.30 \\
+    --hash=sha256:922820b53db7a7257ffbda3f597266d435245903d80737e34f8a45ff3e3230d8 \\
+    --hash=sha256:bec941d2aa8195e248a60b31ff9f0558284cf01a52591ceda73ea9afffd69fd9
+    # via requests
+requests[socks]==2.32.3 ; python_version >= "3.8" \\
+    --hash=sha256:55365417734eb18255590a9ff9eb97e9e1da868d4ccd6402399eaf68af20a760
+urllib3==2.2.3 --hash=sha256:ca899ca043dcb1bafa3e262d73aa25c465bfb49e0bd9dd5d59f1d0acba2f8fac
+-e git+https://example.com/pkg.git#egg=editable-pkg \\
+    --hash=sha256:00
+"""
+
+
+def test_read_requirements_txt_metadata_joins_continuations_and_drops_hashes(tmp_path):
+    requirements_path = tmp_path / "requirements.txt"
+    requirements_path.write_text(PIP_COMPILE_OUTPUT, encoding="utf-8")
+
+    metadata = read_requirements_txt_metadata(source=str(requirements_path), name="demo-app")
+
+    assert metadata["dependencies"] == [
+        "certifi==2024.8.30",
+        'requests[socks]==2.32.3 ; python_version >= "3.8"',
+        "urllib3==2.2.3",
+        "editable-pkg",
+    ]
+
+
+def test_iter_logical_lines_is_lazy():
+    def physical_lines():
+        yield "click>=8 \\\n"
+        yield "    --hash=sha256:00\n"
+        yield "rich\n"
+        raise AssertionError("read past the first requirement")
+
+    lines = iter_logical_lines(physical_lines())
+
+    assert next(lines) == "click>=8 "
+    assert next(lines) == "rich"
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import pytest
 
-from metametameta.general import any_metadict, safe_quote
+from metametameta.extract import extract_metadata
+from metametameta.general import any_metadict, merge_sections, safe_quote, version_info
+from metametameta.validate_sync import check_sync
 
 
 # Parameterized test cases for the any_metadict function
@@ -80,3 +82,57 @@ def test_safe_quote_invalid_type():
     result = safe_quote(value)
 
     assert result == "42"
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [
+        ("1.2.3", (1, 2, 3, 4, 0)),
+        ("v2.0", (2, 0, 0, 4, 0)),
+        ("1.0.0RC1", (1, 0, 0, 3, 1)),
+        ("1.0-1", (1, 0, 0, 5, 1)),
+        ("1.2.4.dev5+g1a2b3c4", (1, 2, 4, 0, 5)),
+        ("1.2.3.0", (1, 2, 3, 4, 0)),
+        ("1.2.3.4", None),
+        ("1.0a1.post2.dev3", None),
+        ("1!2.0", None),
+        ("not-a-version", None),
+    ],
+)
+def test_version_info(version, expected):
+    assert version_info(version) == expected
+
+
+def test_version_info_sorts_like_versions():
+    ordered = ["1.0.dev1", "1.0a1", "1.0a2", "1.0b1", "1.0rc1", "1.0rc2", "1.0", "1.0.post1", "1.0.1.dev0", "1.1"]
+
+    infos = [version_info(version) for version in ordered]
+
+    assert sorted(infos) == infos  # type: ignore[type-var]
+    assert len(set(infos)) == len(infos)
+    assert version_info("2.0.0") > version_info("2.0.0rc1")  # type: ignore[operator]
+    assert version_info("1.0.0.post1") > version_info("1.0.0rc1")  # type: ignore[operator]
+    assert version_info("1.0.dev1") < (1, 0, 0, 4, 0)  # type: ignore[operator]
+    assert version_info("1.0a1") < (1, 0, 0, 4, 0)  # type: ignore[operator]
+    assert version_info("1.0a1") >= (1, 0, 0)  # type: ignore[operator]  # a release prefix compares the release only
+    assert version_info("1.0") >= (1, 0)  # type: ignore[operator]
+
+
+def test_any_metadict_precompute_emits_version_info_and_tuple_dependencies(tmp_path):
+    metadata = {"name": "my_package", "version": "1.4.0b2", "dependencies": ["click>=8"]}
+
+    content, names = any_metadict(metadata, precompute=True)
+    about = merge_sections(names, "my_package", content)
+
+    extracted = extract_metadata(about)
+    extracted.pop("__all__")
+    assert extracted == {
+        "__title__": "my_package",
+        "__version__": "1.4.0b2",
+        "__version_info__": (1, 4, 0, 2, 2),
+        "__dependencies__": ("click>=8",),
+    }
+    about_path = tmp_path / "__about__.py"
+    about_path.write_text(about, encoding="utf-8")
+    assert check_sync(metadata, about_path) == []
+    assert "__dependencies__: tuple[str, ...] = ()" in any_metadict({"dependencies": []}, precompute=True)[0]
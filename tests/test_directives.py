@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import textwrap
+
+import pytest
+
+from metametameta.directives import (
+    DirectiveError,
+    find_module_file,
+    parse_package_dir,
+    read_static_attribute,
+    resolve_attr,
+    resolve_directive,
+    resolve_file,
+)
+from metametameta.from_setup_cfg import read_setup_cfg_metadata
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(text), encoding="utf-8")
+    return path
+
+
+def test_resolve_attr_reads_literal_without_importing(tmp_path):
+    write(tmp_path / "mypkg" / "__init__.py", 'import does_not_exist\n__version__ = "1.2.3"\n')
+
+    assert resolve_attr("mypkg.__version__", tmp_path) == "1.2.3"
+
+
+def test_resolve_attr_follows_reexports_and_aliases(tmp_path):
+    write(
+        tmp_path / "src" / "mypkg" / "__init__.py",
+        "from ._version import *\nfrom .meta import VERSION as __version__\n",
+    )
+    write(tmp_path / "src" / "mypkg" / "_version.py", 'AUTHOR = "Ada"\n')
+    write(tmp_path / "src" / "mypkg" / "meta.py", 'RAW = "4.5.6"\nVERSION: str = RAW\n')
+
+    assert resolve_attr("mypkg.__version__", tmp_path, {"": "src"}) == "4.5.6"
+    assert resolve_attr("mypkg.AUTHOR", tmp_path, {"": "src"}) == "Ada"
+
+
+def test_resolve_attr_rejects_non_literals(tmp_path):
+    write(tmp_path / "mypkg.py", "__version__ = get_version()\n")
+
+    with pytest.raises(DirectiveError, match="not a static literal"):
+        resolve_attr("mypkg.__version__", tmp_path)
+    with pytest.raises(DirectiveError, match="Could not find module"):
+        resolve_attr("missing.__version__", tmp_path)
+
+
+def test_read_static_attribute_cache_tracks_file_signature(tmp_path):
+    module = write(tmp_path / "mod.py", '__version__ = "1.0"\n')
+    assert read_static_attribute(module, "__version__") == "1.0"
+
+    module.write_text('__version__ = "2.0.0"\n', encoding="utf-8")
+    os.utime(module, ns=(1, 1))
+
+    assert read_static_attribute(module, "__version__") == "2.0.0"
+
+
+def test_find_module_file_honours_package_dir(tmp_path):
+    target = write(tmp_path / "lib" / "core" / "version.py", "")
+
+    assert find_module_file("mypkg.version", tmp_path, parse_package_dir("mypkg = lib/core")) == target
+
+
+def test_resolve_file_joins_files_and_stays_in_project(tmp_path):
+    write(tmp_path / "README.md", "Hello")
+    write(tmp_path / "CHANGES.md", "World")
+
+    assert resolve_file("README.md, CHANGES.md", tmp_path) == "Hello\nWorld"
+    assert resolve_directive("plain value", tmp_path) == "plain value"
+    (tmp_path / "project").mkdir()
+    with pytest.raises(DirectiveError, match="outside the project"):
+        resolve_file("../README.md", tmp_path / "project")
+    with pytest.raises(DirectiveError, match="Could not read"):
+        resolve_file("MISSING.md", tmp_path)
+
+
+def test_read_setup_cfg_metadata_resolves_directives(tmp_path, caplog):
+    write(
+        tmp_path / "setup.cfg",
+        """
+        [metadata]
+        name = mypkg
+        version = attr: mypkg.__version__
+        description = file: SUMMARY.txt
+        author = attr: mypkg.missing
+
+        [options]
+        package_dir =
+            =src
+        install_requires = file: requirements.in
+        """,
+    )
+    write(tmp_path / "src" / "mypkg" / "__init__.py", '__version__ = "0.9.0"\n')
+    write(tmp_path / "SUMMARY.txt", "A package.")
+    write(tmp_path / "requirements.in", "# runtime\nclick>=8\nrich\n")
+
+    metadata = read_setup_cfg_metadata(tmp_path / "setup.cfg")
+
+    assert metadata["version"] == "0.9.0"
+    assert metadata["description"] == "A package."
+    assert metadata["dependencies"] == ["click>=8", "rich"]
+    assert metadata["author"] == "attr: mypkg.missing"
+    assert "Could not resolve author" in caplog.text
@@ -140,3 +140,14 @@ def test_sync_check_output_with_path_is_not_double_joined(tmp_path, monkeypatch,
     # The double-joined path must never appear in any diagnostic.
     assert "demo_app/demo_app" not in captured.out
     assert "demo_app\\demo_app" not in captured.out
+
+
+def test_single_generator_precompute(tmp_path, monkeypatch):
+    write_pep621_pyproject(tmp_path, version="2.0rc1")
+    (tmp_path / "demo_app").mkdir()
+    monkeypatch.chdir(tmp_path)
+
+    assert cli_main(["pep621", "--precompute"]) == 0
+
+    about = (tmp_path / "demo_app" / "__about__.py").read_text(encoding="utf-8")
+    assert "__version_info__ = (2, 0, 0, 3, 1)" in about
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from metametameta.dynamic_version import apply_dynamic_version, resolve_dynamic_version
+from metametameta.from_pep621 import read_pep621_metadata
+
+
+def write(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(content), encoding="utf-8")
+    return path
+
+
+PROJECT = """
+    [project]
+    name = "demo-pkg"
+    dynamic = ["version"]
+"""
+
+
+@pytest.mark.parametrize(
+    ("config", "files", "expected"),
+    [
+        (
+            '[build-system]\nbuild-backend = "hatchling.build"\n[tool.hatch.version]\npath = "src/demo/__about__.py"\n',
+            {"src/demo/__about__.py": '__version__ = "v1.2.3"\n'},
+            "1.2.3",
+        ),
+        (
+            '[tool.hatch.version]\npath = "VERSION.txt"\npattern = "release: (?P<version>\\\\S+)"\n',
+            {"VERSION.txt": "release: 4.0rc1\n"},
+            "4.0rc1",
+        ),
+        (
+            '[tool.setuptools]\npackage-dir = {"" = "src"}\n[tool.setuptools.dynamic]\nversion = {attr = "demo.__version__"}\n',
+            {
+                "src/demo/__init__.py": "from ._version import __version__\n",
+                "src/demo/_version.py": "__version__ = '2.0'\n",
+            },
+            "2.0",
+        ),
+        (
+            '[tool.setuptools.dynamic]\nversion = {file = ["VERSION"]}\n',
+            {"VERSION": "3.1.4\n"},
+            "3.1.4",
+        ),
+        (
+            '[tool.pdm.version]\nsource = "file"\npath = "demo/__init__.py"\n',
+            {"demo/__init__.py": "__version__ = '5.0'\n"},
+            "5.0",
+        ),
+        (
+            '[build-system]\nbuild-backend = "flit_core.buildapi"\n',
+            {"demo_pkg/__init__.py": '"""Docs."""\n__version__ = "6.1"\n'},
+            "6.1",
+        ),
+    ],
+    ids=["hatch", "hatch-pattern", "setuptools-attr", "setuptools-file", "pdm", "flit"],
+)
+def test_resolve_dynamic_version_backends(tmp_path: Path, config: str, files: dict[str, str], expected: str):
+    pyproject = write(tmp_path / "pyproject.toml", PROJECT + config)
+    for name, content in files.items():
+        write(tmp_path / name, content)
+
+    assert resolve_dynamic_version(pyproject, {"name": "demo-pkg"}) == expected
+
+
+def test_resolve_dynamic_version_without_repository_or_file(tmp_path: Path, caplog):
+    pyproject = write(tmp_path / "pyproject.toml", PROJECT + '[tool.hatch.version]\nsource = "vcs"\n')
+    assert resolve_dynamic_version(pyproject, {"name": "demo-pkg"}) is None
+
+    write(tmp_path / "pyproject.toml", PROJECT + '[tool.hatch.version]\npath = "missing.py"\n')
+    with caplog.at_level(logging.WARNING):
+        assert resolve_dynamic_version(pyproject, {"name": "demo-pkg"}) is None
+    assert "Could not resolve dynamic version from [tool.hatch]" in caplog.text
+
+
+def test_apply_dynamic_version_only_touches_dynamic_versions(tmp_path: Path):
+    pyproject = write(tmp_path / "pyproject.toml", PROJECT)
+    static = {"name": "demo-pkg", "version": "1.0"}
+
+    assert apply_dynamic_version(static, pyproject) is static
+    assert apply_dynamic_version({"name": "demo-pkg"}, pyproject) == {"name": "demo-pkg"}
+
+
+def test_read_pep621_metadata_fills_dynamic_version(tmp_path: Path):
+    pyproject = write(
+        tmp_path / "pyproject.toml",
+        PROJECT + '[tool.hatch.version]\npath = "demo_pkg/__init__.py"\n[tool.ruff]\nline-length = 120\n',
+    )
+    write(tmp_path / "demo_pkg" / "__init__.py", "__version__ = '0.9.0'\n")
+
+    metadata = read_pep621_metadata(str(pyproject))
+
+    assert metadata["version"] == "0.9.0"
+    assert metadata["dynamic"] == ["version"]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import ast
+
+import pytest
+
+from metametameta.extract import MMAP_THRESHOLD, extract_file, extract_many, extract_metadata, strip_dunders
+
+ABOUT_SOURCE = '''"""Metadata for demo.
+
+__version__ = "not-this-one"
+"""
+
+__all__ = ["__title__", "__version__"]
+
+__title__ = "demo"
+__version__: str = "1.2.3"  # trailing comment
+__build__ = 42
+__ratio__ = 0.5
+__dependencies__ = [
+    "click>=8",  # cli
+    "rich>=13",
+]
+__urls__ = {"Home": "https://example.com"}
+__computed__ = compute()
+__version_info__ = (1, 2, 3)
+'''
+
+
+def test_extract_metadata_returns_typed_values():
+    metadata = extract_metadata(ABOUT_SOURCE)
+
+    assert metadata == {
+        "__all__": ["__title__", "__version__"],
+        "__title__": "demo",
+        "__version__": "1.2.3",
+        "__build__": 42,
+        "__ratio__": 0.5,
+        "__dependencies__": ["click>=8", "rich>=13"],
+        "__urls__": {"Home": "https://example.com"},
+        "__version_info__": (1, 2, 3),
+    }
+
+
+def test_extract_metadata_ignores_strings_and_comments():
+    source = "# __version__ = '0.0.1'\nx = '''\n__author__ = 'nope'\n'''\n__version__ = '1.0'\n"
+
+    assert extract_metadata(source) == {"__version__": "1.0"}
+
+
+def test_extract_metadata_stops_at_unterminated_value():
+    source = "__title__ = 'ok'\n__broken__ = ['a',\n__later__ = 'never'\n"
+
+    assert extract_metadata(source) == {"__title__": "ok"}
+
+
+def test_extract_metadata_handles_multiline_strings():
+    source = '__description__ = """line one\nline "two"\n"""\n__version__ = "2.0"\n'
+
+    assert extract_metadata(source) == {"__description__": 'line one\nline "two"\n', "__version__": "2.0"}
+
+
+def ast_dunders(source: str) -> dict:
+    """What an ast-based reader sees: literal values assigned to dunder names at module level."""
+    found = {}
+    for node in ast.parse(source).body:
+        targets = (
+            node.targets if isinstance(node, ast.Assign) else [node.target] if isinstance(node, ast.AnnAssign) else []
+        )
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id.startswith("__") and target.id.endswith("__"):
+                try:
+                    found[target.id] = ast.literal_eval(node.value)
+                except ValueError:
+                    pass
+    return found
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ('__title__ = __name_alias__ = "demo"\n', {"__title__": "demo", "__name_alias__": "demo"}),
+        ('__version__ = version = "1.0"\n', {"__version__": "1.0"}),
+        ('__title__ = "demo"; __version__ = "1.0"\n', {"__title__": "demo", "__version__": "1.0"}),
+        ('x = 1; __version__ = "2.0"  # ; __author__ = "no"\n', {"__version__": "2.0"}),
+        ('__a__ = __b__ = [1, 2]; __c__ = "x;y"\n__d__ = 1 == 1\n', {"__a__": [1, 2], "__b__": [1, 2], "__c__": "x;y"}),
+    ],
+)
+def test_extract_metadata_reads_chained_and_joined_assignments(source, expected):
+    assert extract_metadata(source) == expected == ast_dunders(source)
+
+
+def test_extract_file_uses_mmap_for_large_files(tmp_path):
+    about_path = tmp_path / "__about__.py"
+    padding = "# padding\n" * (MMAP_THRESHOLD // 10 + 1)
+    about_path.write_text(padding + "__version__ = '3.0.0'\n", encoding="utf-8")
+
+    assert extract_file(about_path) == {"__version__": "3.0.0"}
+
+
+def test_extract_many_reports_missing_files_as_empty(tmp_path):
+    first = tmp_path / "a.py"
+    first.write_text("__version__ = '1'\n", encoding="utf-8")
+    missing = tmp_path / "missing.py"
+
+    assert extract_many([first, missing], workers=2) == {first: {"__version__": "1"}, missing: {}}
+
+
+def test_strip_dunders_drops_all():
+    assert strip_dunders({"__all__": ["x"], "__version__": "1"}) == {"version": "1"}
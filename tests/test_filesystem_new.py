@@ -4,15 +4,26 @@ Tests for the filesystem module.
 
 from __future__ import annotations
 
+import importlib.util
+import os
+import subprocess  # nosec
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
+from metametameta.__main__ import main as cli_main
+
 # Functions to test, including the private ones
 from metametameta.filesystem import (
     PackageDirectoryNotFoundError,
+    _lock_file_path,
+    compile_files,
     determine_target_dir,
     find_existing_package_dir,
+    sync_files,
+    write_output,
     write_to_file,
     write_to_package_dir,
 )
@@ -178,3 +189,112 @@ def test_write_to_file_legacy_wrapper_raises_when_dir_missing(tmp_path: Path, mo
     with pytest.raises(PackageDirectoryNotFoundError):
         write_to_file(directory="legacy-app", about_content="__license__ = 'MIT'")
     assert not (tmp_path / "legacy_app").exists()
+
+
+# --- Tests for write_output (atomic writes) ---
+
+
+def test_write_output_replaces_atomically_and_keeps_mode(tmp_path: Path):
+    """Should replace the file in one step, leave no temp files and keep the existing permissions."""
+    target = tmp_path / "__about__.py"
+    target.write_text("old", encoding="utf-8")
+    target.chmod(0o640)
+
+    write_output(target, "__version__ = '2.0'\n")
+
+    assert target.read_text(encoding="utf-8") == "__version__ = '2.0'\n"
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert [path.name for path in tmp_path.iterdir()] == ["__about__.py"]
+
+
+def test_write_output_leaves_old_file_when_write_fails(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """A failure before the rename must leave the previous content untouched."""
+    target = tmp_path / "__about__.py"
+    target.write_text("old", encoding="utf-8")
+
+    def fail_replace(src, dst):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("metametameta.filesystem.os.replace", fail_replace)
+    with pytest.raises(KeyboardInterrupt):
+        write_output(target, "new")
+
+    assert target.read_text(encoding="utf-8") == "old"
+    assert [path.name for path in tmp_path.iterdir()] == ["__about__.py"]
+
+
+def test_concurrent_writes_never_interleave(tmp_path: Path):
+    """Parallel writers to one directory each produce a complete file."""
+    target = tmp_path / "__about__.py"
+    contents = [f"__version__ = '{number}'\n" * 200 for number in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda content: write_output(target, content, fsync=False), contents))
+
+    assert target.read_text(encoding="utf-8") in contents
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="per-user lock directories are POSIX only")
+def test_lock_files_live_in_a_private_per_user_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Each user gets their own lock directory; one owned by someone else is refused."""
+    monkeypatch.setattr("tempfile.gettempdir", lambda: str(tmp_path))
+
+    lock_path = _lock_file_path(tmp_path / "pkg")
+    assert lock_path.parent == tmp_path / f"metametameta-locks-{os.getuid()}"
+    assert lock_path.parent.stat().st_mode & 0o777 == 0o700
+
+    monkeypatch.setattr(os, "getuid", lambda: lock_path.parent.stat().st_uid + 1)
+    (tmp_path / f"metametameta-locks-{os.getuid()}").mkdir()
+    with pytest.raises(PermissionError):
+        _lock_file_path(tmp_path / "pkg")
+    write_output(tmp_path / "__about__.py", "x = 1\n", fsync=False)
+    assert (tmp_path / "__about__.py").read_text(encoding="utf-8") == "x = 1\n"
+
+
+def test_sync_files_skips_missing_paths(tmp_path: Path):
+    """Deferred fsync tolerates files that disappeared since they were written."""
+    written = tmp_path / "__about__.py"
+    write_output(written, "x = 1\n", fsync=False)
+
+    sync_files([written, tmp_path / "gone.py"])
+
+
+def test_compile_files_writes_unchecked_hash_pycs(tmp_path: Path):
+    """Unchecked-hash pycs are flagged so imports skip validating them against the source."""
+    good = tmp_path / "__about__.py"
+    broken = tmp_path / "broken.py"
+    write_output(good, '__version__ = "1.0"\n', fsync=False)
+    broken.write_text("def (:\n", encoding="utf-8")
+
+    compiled = compile_files([good, broken], "unchecked-hash", workers=2)
+
+    assert compiled == [Path(importlib.util.cache_from_source(str(good)))]
+    # PEP 552: flags word 0b01 marks a hash-based pyc whose source is not checked.
+    assert int.from_bytes(compiled[0].read_bytes()[4:8], "little") == 0b01
+
+
+def test_regenerating_removes_stale_unchecked_hash_pyc(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """An unchecked-hash pyc is never re-validated, so regenerating must not leave it behind."""
+    package = tmp_path / "demo"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    pyproject = tmp_path / "pyproject.toml"
+    monkeypatch.chdir(tmp_path)
+
+    pyproject.write_text('[project]\nname = "demo"\nversion = "1.0"\n', encoding="utf-8")
+    assert cli_main(["pep621", "--compile", "--invalidation-mode", "unchecked-hash"]) == 0
+    pyc = Path(importlib.util.cache_from_source(str(package / "__about__.py")))
+    assert pyc.exists()
+
+    pyproject.write_text('[project]\nname = "demo"\nversion = "2.0"\n', encoding="utf-8")
+    assert cli_main(["pep621"]) == 0
+
+    assert not pyc.exists()
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", "import demo.__about__ as about; print(about.__version__)"],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "2.0"
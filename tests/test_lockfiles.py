@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import toml
+
+from metametameta.general import any_metadict
+from metametameta.lockfiles import find_lockfile, parse_lock_index, pin_requirements, read_lock_index
+from metametameta.pipeline import run_batch
+
+UV_LOCK = """\
+version = 1
+requires-python = ">=3.9"
+
+[[package]]
+name = "demo"
+version = "0.1.0"
+source = { editable = "." }
+dependencies = [
+    { name = "requests", extra = ["socks"] },
+    { name = "typing-extensions", marker = "python_full_version < '3.11'" },
+]
+
+[package.metadata]
+requires-dist = [{ name = "requests", specifier = ">=2" }]
+
+[[package]]
+name = "requests"
+version = "2.32.3"
+source = { registry = "https://pypi.org/simple" }
+dependencies = [
+    { name = "urllib3" },
+]
+wheels = [
+    { url = "https://files.example/requests-2.32.3-py3-none-any.whl", hash = "sha256:00" },
+]
+
+[package.optional-dependencies]
+socks = [
+    { name = "pysocks" },
+]
+
+[[package]]
+name = "Typing_Extensions"
+version = "4.12.2"
+source = { registry = "https://pypi.org/simple" }
+
+[[package]]
+name = "numpy"
+version = "1.26.4"
+resolution-markers = ["python_full_version < '3.10'"]
+
+[[package]]
+name = "numpy"
+version = "2.1.0"
+resolution-markers = ["python_full_version >= '3.10'"]
+"""
+
+POETRY_LOCK = """\
+# This file is automatically @generated by Poetry and should not be changed by hand.
+
+[[package]]
+name = "click"
+version = "8.1.7"
+description = "Composable command line interface toolkit"
+optional = false
+python-versions = ">=3.7"
+files = [
+    {file = "click-8.1.7-py3-none-any.whl", hash = "sha256:00"},
+]
+
+[package.dependencies]
+colorama = {version = "*", markers = "platform_system == \\"Windows\\""}
+
+[metadata]
+lock-version = "2.0"
+python-versions = "^3.9"
+content-hash = "abc"
+"""
+
+
+def test_parse_lock_index_matches_full_toml_parse():
+    index = parse_lock_index(UV_LOCK.encode("utf-8"))
+
+    assert index == {"demo": "0.1.0", "requests": "2.32.3", "typing-extensions": "4.12.2"}
+    unambiguous = [package for package in toml.loads(UV_LOCK)["package"] if package["name"] != "numpy"]
+    assert {package["name"].lower().replace("_", "-"): package["version"] for package in unambiguous} == index
+
+
+def test_parse_lock_index_reads_poetry_lock():
+    assert parse_lock_index(POETRY_LOCK.encode("utf-8")) == {"click": "8.1.7"}
+
+
+def test_read_lock_index_is_cached_per_signature(tmp_path: Path):
+    lockfile = tmp_path / "uv.lock"
+    lockfile.write_text(UV_LOCK, encoding="utf-8")
+
+    first = read_lock_index(lockfile)
+    assert read_lock_index(lockfile) is first
+
+    lockfile.write_text(UV_LOCK.replace('"2.32.3"', '"2.32.10"'), encoding="utf-8")
+    assert read_lock_index(lockfile)["requests"] == "2.32.10"
+
+
+@pytest.mark.parametrize(
+    ("requirement", "expected"),
+    [
+        ("requests[socks]>=2", "requests[socks]==2.32.3"),
+        ("typing_extensions>=4; python_version < '3.11'", "typing_extensions==4.12.2; python_version < '3.11'"),
+        ("numpy>=1.24", "numpy>=1.24"),
+        ("unlocked", "unlocked"),
+        ("requests @ https://example.com/requests.zip", "requests @ https://example.com/requests.zip"),
+    ],
+)
+def test_pin_requirements(requirement: str, expected: str):
+    pins = parse_lock_index(UV_LOCK.encode("utf-8"))
+
+    assert pin_requirements([requirement], pins) == [expected]
+
+
+def test_find_lockfile_walks_up_to_workspace_root(tmp_path: Path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "uv.lock").write_text(UV_LOCK, encoding="utf-8")
+    member = tmp_path / "packages" / "member"
+    member.mkdir(parents=True)
+
+    assert find_lockfile(member) == tmp_path / "uv.lock"
+    (tmp_path / "packages" / ".git").mkdir()
+    assert find_lockfile(member) is None
+
+
+def test_any_metadict_pins_dependencies():
+    metadata = {"name": "demo", "dependencies": ["requests[socks]>=2"]}
+
+    assert '"requests[socks]>=2"' in any_metadict(metadata)[0]
+    assert '"requests[socks]==2.32.3"' in any_metadict(metadata, {"requests": "2.32.3"})[0]
+
+
+def test_run_batch_pins_dependencies_from_lockfile(tmp_path: Path):
+    project = tmp_path / "demo"
+    (project / "demo").mkdir(parents=True)
+    (project / "pyproject.toml").write_text(
+        '[project]\nname = "demo"\nversion = "0.1.0"\ndependencies = ["requests>=2"]\n', encoding="utf-8"
+    )
+    (project / "uv.lock").write_text(UV_LOCK, encoding="utf-8")
+
+    (job,) = run_batch(tmp_path, pin_dependencies=True)
+
+    assert job.status == "written"
+    assert '__dependencies__ = ["requests==2.32.3"]' in (project / "demo" / "__about__.py").read_text(encoding="utf-8")
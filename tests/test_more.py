@@ -128,28 +128,28 @@ def test_safe_quote_produces_valid_roundtripping_literal(value):
 def test_cli_pep621_subcommand(mock_generate: MagicMock):
     """Tests if the 'pep621' subcommand calls the correct function."""
     cli_main(["pep621", "--source", "test.toml", "--output", "test_about.py"])
-    mock_generate.assert_called_once_with(name="", source="test.toml", output="test_about.py")
+    mock_generate.assert_called_once_with(name="", source="test.toml", output="test_about.py", precompute=False)
 
 
 @patch("metametameta.__main__.generate_from_poetry")
 def test_cli_poetry_subcommand(mock_generate: MagicMock):
     """Tests if the 'poetry' subcommand calls the correct function."""
     cli_main(["poetry"])
-    mock_generate.assert_called_once_with(name="", source="pyproject.toml", output="__about__.py")
+    mock_generate.assert_called_once_with(name="", source="pyproject.toml", output="__about__.py", precompute=False)
 
 
 @patch("metametameta.__main__.generate_from_setup_cfg")
 def test_cli_setup_cfg_subcommand(mock_generate: MagicMock):
     """Tests if the 'setup_cfg' subcommand calls the correct function."""
     cli_main(["setup_cfg"])
-    mock_generate.assert_called_once_with(name="", source="setup.cfg", output="__about__.py")
+    mock_generate.assert_called_once_with(name="", source="setup.cfg", output="__about__.py", precompute=False)
 
 
 @patch("metametameta.__main__.generate_from_importlib")
 def test_cli_importlib_subcommand(mock_generate: MagicMock):
     """Tests if the 'importlib' subcommand calls the correct function."""
     cli_main(["importlib", "--name", "my-package"])
-    mock_generate.assert_called_once_with(name="my-package", output="__about__.py")
+    mock_generate.assert_called_once_with(name="my-package", output="__about__.py", precompute=False)
 
 
 # @patch('logging.config.dictConfig')
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from metametameta.pep508 import Requirement, canonical_requirement, parse_requirement
+from metametameta.validate_sync import check_sync
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("requests", Requirement("requests")),
+        (
+            "Requests[SOCKS, security] >= 2.0 , <3 ; python_version<'3.11'",
+            Requirement("requests", ("security", "socks"), "<3,>=2.0", 'python_version < "3.11"'),
+        ),
+        ("zope.interface (>=5.0)", Requirement("zope-interface", specifier=">=5.0")),
+        (
+            "pkg @ https://example.com/pkg-1.0.zip ; sys_platform == 'win32'",
+            Requirement("pkg", url="https://example.com/pkg-1.0.zip", marker='sys_platform == "win32"'),
+        ),
+        (
+            'colorama; (os_name=="nt" and python_version >= "3.8")',
+            Requirement("colorama", marker='(os_name == "nt" and python_version >= "3.8")'),
+        ),
+    ],
+)
+def test_parse_requirement(raw, expected):
+    assert parse_requirement(raw) == expected
+
+
+@pytest.mark.parametrize("raw", ["-e .", "numpy 1.20.*", "pkg >= 1 ; python_version ~ 3", ""])
+def test_parse_requirement_rejects_what_it_cannot_read(raw):
+    assert parse_requirement(raw) is None
+    assert canonical_requirement(f" {raw} ") == raw.strip()
+
+
+def test_equivalent_spellings_share_a_canonical_form():
+    spellings = [
+        "typing_extensions>=4,<5; python_version < '3.11'",
+        'Typing.Extensions (<5, >=4);python_version<"3.11"',
+    ]
+
+    assert {canonical_requirement(spelling) for spelling in spellings} == {
+        'typing-extensions<5,>=4; python_version < "3.11"'
+    }
+
+
+def test_parse_requirement_is_memoized():
+    raw = "memoized-requirement>=1"
+
+    assert parse_requirement(raw) is parse_requirement(raw)
+
+
+def test_check_sync_compares_canonical_dependencies(tmp_path):
+    about_path = tmp_path / "__about__.py"
+    about_path.write_text(
+        '__title__ = "demo"\n__dependencies__ = ["Requests >= 2.0", "click"]\n',
+        encoding="utf-8",
+    )
+
+    assert check_sync({"name": "demo", "dependencies": ["requests>=2.0", "click"]}, about_path) == []
+    assert check_sync({"name": "demo", "dependencies": ["requests>=2.1", "click"]}, about_path) != []
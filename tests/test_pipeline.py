@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from metametameta.__main__ import main
+from metametameta.pipeline import ProjectJob, discover_projects, index_conda_recipes, run_batch, run_stage
+
+
+def make_pep621_project(root: Path, name: str, version: str = "1.0.0") -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "pyproject.toml").write_text(
+        textwrap.dedent(f"""
+            [project]
+            name = "{name}"
+            version = "{version}"
+            dependencies = ["click>=8"]
+            """),
+        encoding="utf-8",
+    )
+    (root / name.replace("-", "_")).mkdir()
+    return root
+
+
+def test_discover_projects_finds_nested_projects_and_prunes(tmp_path):
+    make_pep621_project(tmp_path / "services" / "alpha", "alpha")
+    make_pep621_project(tmp_path / "services" / "beta", "beta")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "requirements.txt").write_text("mkdocs\n", encoding="utf-8")
+    make_pep621_project(tmp_path / "node_modules" / "ignored", "ignored")
+
+    assert list(discover_projects(tmp_path)) == [tmp_path / "services" / "alpha", tmp_path / "services" / "beta"]
+
+
+def test_run_batch_writes_every_project(tmp_path):
+    alpha = make_pep621_project(tmp_path / "alpha", "alpha", "1.0.0")
+    beta = make_pep621_project(tmp_path / "beta", "beta-app", "2.0.0")
+
+    jobs = sorted(run_batch(tmp_path, workers=2, maxsize=1), key=lambda job: job.root)
+
+    assert [job.status for job in jobs] == ["written", "written"]
+    assert '__version__ = "1.0.0"' in (alpha / "alpha" / "__about__.py").read_text(encoding="utf-8")
+    assert '__version__ = "2.0.0"' in (beta / "beta_app" / "__about__.py").read_text(encoding="utf-8")
+
+
+def test_run_batch_sync_check_reports_stale_projects(tmp_path):
+    fresh = make_pep621_project(tmp_path / "fresh", "fresh")
+    stale = make_pep621_project(tmp_path / "stale", "stale")
+    list(run_batch(tmp_path))
+    (stale / "pyproject.toml").write_text('[project]\nname = "stale"\nversion = "9.9.9"\n', encoding="utf-8")
+
+    jobs = {job.root: job for job in run_batch(tmp_path, sync_check=True)}
+
+    assert jobs[fresh].status == "in-sync"
+    assert jobs[stale].status == "out-of-sync"
+    assert "__version__" in jobs[stale].message
+
+
+def test_run_batch_reports_missing_package_dir(tmp_path):
+    project = tmp_path / "orphan"
+    project.mkdir()
+    (project / "setup.cfg").write_text("[metadata]\nname = orphan\nversion = 1.0\n", encoding="utf-8")
+
+    (job,) = run_batch(tmp_path)
+
+    assert job.failed
+    assert "Could not find package directory" in job.message
+
+
+def test_run_batch_executes_dynamic_setup_py_only_when_asked(tmp_path):
+    project = tmp_path / "legacy"
+    (project / "legacy").mkdir(parents=True)
+    (project / "setup.py").write_text(
+        "from setuptools import setup\nclass Meta:\n    version = '4.5'\nsetup(name='legacy', version=Meta.version)\n",
+        encoding="utf-8",
+    )
+
+    (static_job,) = run_batch(tmp_path, check=True)
+    (executed_job,) = run_batch(tmp_path, execute_setup_py=True)
+
+    assert "__version__" not in static_job.message
+    assert executed_job.status == "written"
+    assert '__version__ = "4.5"' in (project / "legacy" / "__about__.py").read_text(encoding="utf-8")
+
+
+def test_run_stage_is_bounded_and_streams():
+    results = run_stage(lambda value: value * 2, iter(range(100)), workers=3, maxsize=2)
+
+    assert sorted(results) == [value * 2 for value in range(100)]
+
+
+def test_run_stage_turns_unexpected_errors_into_failed_jobs(tmp_path):
+    def explode(job: ProjectJob) -> ProjectJob:
+        raise RuntimeError("boom")
+
+    (job,) = run_stage(explode, [ProjectJob(tmp_path)])
+
+    assert job.status == "failed"
+    assert job.message == "boom"
+
+
+def test_batch_cli_exit_codes(tmp_path, capsys):
+    make_pep621_project(tmp_path / "alpha", "alpha")
+
+    assert main(["batch", str(tmp_path)]) == 0
+    assert main(["batch", str(tmp_path), "--sync-check"]) == 0
+
+    (tmp_path / "alpha" / "pyproject.toml").write_text('[project]\nname = "alpha"\nversion = "2"\n', encoding="utf-8")
+    with pytest.raises(SystemExit) as excinfo:
+        main(["batch", str(tmp_path), "--sync-check"])
+    assert excinfo.value.code == 1
+    assert "out-of-sync" in capsys.readouterr().err
+
+
+def test_run_batch_check_diffs_without_writing(tmp_path):
+    project = make_pep621_project(tmp_path / "alpha", "alpha", "1.0.0")
+    about = project / "alpha" / "__about__.py"
+
+    (missing,) = run_batch(tmp_path, check=True)
+    assert missing.status == "would-change"
+    assert missing.message.startswith("--- /dev/null")
+    assert not about.exists()
+
+    list(run_batch(tmp_path))
+    (unchanged,) = run_batch(tmp_path, check=True)
+    assert unchanged.status == "unchanged"
+    assert not unchanged.failed
+
+    before = about.read_text(encoding="utf-8")
+    (project / "pyproject.toml").write_text('[project]\nname = "alpha"\nversion = "2.0.0"\n', encoding="utf-8")
+    (changed,) = run_batch(tmp_path, check=True)
+    assert changed.failed
+    assert '-__version__ = "1.0.0"' in changed.message
+    assert '+__version__ = "2.0.0"' in changed.message
+    assert about.read_text(encoding="utf-8") == before
+
+
+def test_auto_check_cli(tmp_path, monkeypatch, capsys):
+    make_pep621_project(tmp_path, "alpha")
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(["auto", "--check"])
+    assert excinfo.value.code == 1
+    assert '+__version__ = "1.0.0"' in capsys.readouterr().out
+    assert not (tmp_path / "alpha" / "__about__.py").exists()
+
+    assert main(["auto"]) == 0
+    assert main(["auto", "--check"]) == 0
+    assert "is up to date" in capsys.readouterr().out
+
+
+def test_batch_cli_compiles_written_files(tmp_path):
+    about = make_pep621_project(tmp_path / "alpha", "alpha") / "alpha" / "__about__.py"
+
+    assert main(["batch", str(tmp_path), "--compile", "--invalidation-mode", "checked-hash"]) == 0
+
+    pyc = about.parent / "__pycache__" / f"__about__.{sys.implementation.cache_tag}.pyc"
+    assert int.from_bytes(pyc.read_bytes()[4:8], "little") == 0b11
+
+
+def test_auto_cli_compiles_generated_file(tmp_path, monkeypatch):
+    make_pep621_project(tmp_path, "alpha")
+    monkeypatch.chdir(tmp_path)
+
+    assert main(["auto", "--compile"]) == 0
+
+    assert list((tmp_path / "alpha" / "__pycache__").glob("__about__.*.pyc"))
+
+
+def test_index_conda_recipes_reads_every_feedstock(tmp_path: Path):
+    for name in ("alpha", "beta", "gamma"):
+        recipe_dir = tmp_path / f"{name}-feedstock" / "recipe"
+        recipe_dir.mkdir(parents=True)
+        (recipe_dir / "meta.yaml").write_text(
+            f'{{% set version = "1.0" %}}\npackage:\n  name: {name}\n  version: {{{{ version }}}}\n', encoding="utf-8"
+        )
+    (tmp_path / "alpha-feedstock" / "meta.yaml").write_text("package:\n  name: stray\n", encoding="utf-8")
+
+    index = dict(index_conda_recipes(tmp_path, workers=2))
+
+    assert sorted(path.parent.parent.name for path in index) == ["alpha-feedstock", "beta-feedstock", "gamma-feedstock"]
+    assert {recipe.package["name"]: recipe.package["version"] for recipe in index.values()} == {
+        "alpha": "1.0",
+        "beta": "1.0",
+        "gamma": "1.0",
+    }
+
+
+def test_conda_index_cli_prints_one_json_line_per_recipe(tmp_path: Path, capsys):
+    for name in ("alpha", "beta"):
+        recipe_dir = tmp_path / f"{name}-feedstock" / "recipe"
+        recipe_dir.mkdir(parents=True)
+        (recipe_dir / "meta.yaml").write_text(f"package:\n  name: {name}\n  version: 1.0\n", encoding="utf-8")
+
+    assert main(["conda-index", str(tmp_path), "--workers", "2"]) == 0
+
+    records = sorted((json.loads(line) for line in capsys.readouterr().out.splitlines()), key=lambda r: r["recipe"])
+    assert [record["recipe"] for record in records] == [
+        "alpha-feedstock/recipe/meta.yaml",
+        "beta-feedstock/recipe/meta.yaml",
+    ]
+    assert records[0]["package"] == {"name": "alpha", "version": "1.0", "dependencies": []}
+    assert records[0]["outputs"] == []
+    with pytest.raises(SystemExit):
+        main(["conda-index", str(tmp_path / "alpha-feedstock" / "recipe" / "missing")])
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from metametameta.general import any_metadict
+from metametameta.project_metadata import ProjectMetadata, canonical_key
+
+
+def test_record_normalizes_keys_once():
+    record = ProjectMetadata({"Name": "demo", "Requires-Python": ">=3.9", "install_requires": ["click"]})
+
+    assert dict(record) == {"name": "demo", "requires_python": ">=3.9", "dependencies": ["click"]}
+
+
+def test_record_prefers_summary_for_description():
+    record = ProjectMetadata({"Summary": "short", "Description": "long"})
+
+    assert record["description"] == "short"
+    assert "summary" not in record
+
+
+def test_record_keeps_explicit_dependencies_over_install_requires():
+    record = ProjectMetadata({"dependencies": ["a"], "install_requires": ["b"]})
+
+    assert record["dependencies"] == ["a"]
+    assert record["install_requires"] == ["b"]
+
+
+def test_record_compares_equal_to_dict_and_is_not_renormalized():
+    record = ProjectMetadata({"name": "demo", "version": "1.0"})
+
+    assert record == {"name": "demo", "version": "1.0"}
+    assert ProjectMetadata.from_mapping(record) is record
+
+
+def test_records_with_same_layout_share_index_and_interned_keys():
+    first = ProjectMetadata({"name": "a", "version": "1"})
+    second = ProjectMetadata({"Name": "b", "Version": "2"})
+
+    assert first._index is second._index
+    assert canonical_key("Home-Page") is canonical_key("home-page".lower())
+
+
+def test_any_metadict_renders_record_and_dict_identically():
+    raw = {"name": "demo", "Version": "1.0", "keywords": ["a"], "Summary": "short"}
+
+    assert any_metadict(ProjectMetadata(raw)) == any_metadict(raw)
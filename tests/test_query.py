@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import subprocess  # nosec
+import sys
+
+import pytest
+
+from metametameta.__main__ import main as cli_main
+from metametameta.console import main as dispatch
+from metametameta.query import query, scan_about, scan_pyproject
+
+PYPROJECT = """\
+[build-system]
+requires = ["hatchling"]
+version = "not-this-one"
+
+[project]
+name = "demo"
+version = "1.2.3"  # released
+requires-python = '>=3.9'
+dependencies = ["requests"]
+
+[tool.demo]
+version = "not-this-one-either"
+"""
+
+
+def test_scan_pyproject_reads_only_the_project_table():
+    assert scan_pyproject(PYPROJECT, "version") == "1.2.3"
+    assert scan_pyproject(PYPROJECT, "requires-python") == ">=3.9"
+    assert scan_pyproject(PYPROJECT, "dependencies") is None
+    assert scan_pyproject('[tool.poetry]\nversion = "1"\n', "version") is None
+
+
+def test_scan_pyproject_skips_multiline_strings():
+    text = '''\
+[project]
+name = "demo"
+description = """
+[not a header]
+version = "9.9"
+# """ is quoted here, so this is no comment
+"""
+readme = \'\'\'
+[tool.fake]
+\'\'\'
+keywords = ["has \\" and \'\'\' and [brackets]"]  # a comment with """
+version = "1.2.3"
+requires-python = """>=3.9"""
+
+[tool.demo]
+version = "0"
+'''
+
+    assert scan_pyproject(text, "version") == "1.2.3"
+    assert scan_pyproject(text, "name") == "demo"
+    assert scan_pyproject('[project]\nx = """a""""\nname = "demo"\n[tool]\n', "name") == "demo"
+
+
+def test_scan_about_maps_keys_to_dunders():
+    text = '__title__ = "demo"\n__version__ = "2.0"\n__requires_python__: str = ">=3.10"\n'
+
+    assert scan_about(text, "name") == "demo"
+    assert scan_about(text, "version") == "2.0"
+    assert scan_about(text, "requires-python") == ">=3.10"
+    assert scan_about(text, "description") is None
+
+
+def test_query_falls_back_to_about(tmp_path):
+    (tmp_path / "pyproject.toml").write_text('[project]\nname = "demo"\ndynamic = ["version"]\n', encoding="utf-8")
+    package = tmp_path / "src" / "demo"
+    package.mkdir(parents=True)
+    (package / "__about__.py").write_text('__version__ = "3.1"\n', encoding="utf-8")
+
+    assert query(str(tmp_path), "version") == "3.1"
+    assert query(str(tmp_path), "name") == "demo"
+    assert query(str(package / "__about__.py"), "version") == "3.1"
+    assert query(str(tmp_path / "missing"), "version") is None
+
+
+def test_dispatch_prints_one_line_per_path(tmp_path, capsys):
+    first = tmp_path / "first"
+    first.mkdir()
+    (first / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+    empty = tmp_path / "empty"
+    empty.mkdir()
+
+    assert dispatch(["version", str(first), str(empty), str(first / "pyproject.toml")]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "1.2.3\n\n1.2.3\n"
+    assert "no version found" in captured.err
+
+    assert dispatch(["get", "requires-python", str(first)]) == 0
+    assert capsys.readouterr().out == ">=3.9\n"
+
+
+def test_dispatch_usage_errors(capsys):
+    assert dispatch(["get"]) == 2
+    assert "usage: mmm version" in capsys.readouterr().err
+    assert dispatch(["version", "--help"]) == 0
+
+
+def test_full_cli_answers_queries_too(tmp_path, capsys):
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+
+    assert cli_main(["get", "name", str(tmp_path)]) == 0
+    assert capsys.readouterr().out == "demo\n"
+    with pytest.raises(SystemExit):
+        cli_main(["version", str(tmp_path / "missing")])
+
+
+def test_query_does_not_import_the_full_cli(tmp_path):
+    (tmp_path / "pyproject.toml").write_text(PYPROJECT, encoding="utf-8")
+    code = (
+        "import sys; from metametameta.console import main; main(['version', sys.argv[1]]); "
+        "print(sorted(m for m in ('rich', 'totalhelp', 'toml', 'metametameta.__main__') if m in sys.modules))"
+    )
+    result = subprocess.run(  # nosec
+        [sys.executable, "-c", code, str(tmp_path)], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines() == ["1.2.3", "[]"]
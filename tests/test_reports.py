@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import json
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from metametameta.__main__ import main
+from metametameta.reports import ReportMergeError, merge_reports, parse_shard, select_shard, shard_of
+
+
+def make_project(root: Path, name: str) -> None:
+    root.mkdir(parents=True)
+    (root / "pyproject.toml").write_text(
+        textwrap.dedent(f"""
+            [project]
+            name = "{name}"
+            version = "1.0.0"
+            """),
+        encoding="utf-8",
+    )
+    (root / name).mkdir()
+
+
+@pytest.mark.parametrize("value, expected", [("1/1", (1, 1)), ("3/16", (3, 16))])
+def test_parse_shard(value, expected):
+    assert parse_shard(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0/4", "5/4", "1/0", "2", "a/b"])
+def test_parse_shard_rejects_bad_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
+
+
+def test_shards_partition_projects_disjointly_and_completely(tmp_path):
+    projects = [tmp_path / f"service_{number}" for number in range(50)]
+
+    slices = [set(select_shard(projects, tmp_path, (index, 4))) for index in range(1, 5)]
+
+    assert set().union(*slices) == set(projects)
+    assert sum(len(project_slice) for project_slice in slices) == len(projects)
+
+
+def test_shard_of_is_stable():
+    assert shard_of("services/alpha", 16) == shard_of("services/alpha", 16)
+    assert 1 <= shard_of("services/alpha", 16) <= 16
+
+
+def test_sharded_batch_reports_merge_into_one_result(tmp_path, capsys):
+    for number in range(6):
+        make_project(tmp_path / "repo" / f"svc{number}", f"svc{number}")
+    repo = tmp_path / "repo"
+
+    for index in (1, 2, 3):
+        assert main(["batch", str(repo), "--shard", f"{index}/3", "--report", str(tmp_path / f"r{index}.json")]) == 0
+    merged_path = tmp_path / "merged.json"
+    reports = [str(tmp_path / f"r{index}.json") for index in (1, 2, 3)]
+
+    with pytest.raises(SystemExit) as excinfo:
+        main(["merge-reports", *reports[:2]])
+    assert excinfo.value.code == 1
+    assert "Missing reports for shard(s): 3" in capsys.readouterr().err
+
+    assert main(["merge-reports", *reports, "--output", str(merged_path)]) == 0
+    merged = json.loads(merged_path.read_text(encoding="utf-8"))
+    assert [record["project"] for record in merged["results"]] == [f"svc{number}" for number in range(6)]
+    assert merged["failed"] == 0
+
+
+def test_batch_without_report_keeps_no_records(tmp_path, monkeypatch):
+    for number in range(3):
+        make_project(tmp_path / "repo" / f"svc{number}", f"svc{number}")
+
+    def no_records(*_args):
+        raise AssertionError("job_record called without --report")
+
+    monkeypatch.setattr("metametameta.__main__.job_record", no_records)
+
+    assert main(["batch", str(tmp_path / "repo")]) == 0
+
+
+def test_merge_reports_rejects_duplicate_shards(tmp_path):
+    report = {"version": 1, "shard": "1/2", "failed": 0, "results": []}
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text(json.dumps(report), encoding="utf-8")
+
+    with pytest.raises(ReportMergeError, match="more than once"):
+        merge_reports([tmp_path / "a.json", tmp_path / "b.json"])
+
+
+@pytest.mark.parametrize(
+    "report",
+    [
+        [],
+        {"version": 1, "shard": None, "failed": 0, "results": {}},
+        {"version": 1, "shard": None, "failed": 0, "results": [{"source": "pep621", "failed": False}]},
+        {"version": 1, "shard": None, "failed": 0, "results": [{"project": "x"}]},
+        {"version": 1, "shard": None, "failed": 0, "results": ["x"]},
+    ],
+)
+def test_merge_reports_rejects_malformed_reports(tmp_path, report, capsys):
+    (tmp_path / "a.json").write_text(json.dumps(report), encoding="utf-8")
+
+    with pytest.raises(ReportMergeError, match="a.json"):
+        merge_reports([tmp_path / "a.json"])
+    with pytest.raises(SystemExit):
+        main(["merge-reports", str(tmp_path / "a.json")])
+    assert "Could not merge reports" in capsys.readouterr().err
+
+
+def test_merge_reports_fails_when_any_shard_failed(tmp_path):
+    failed = {
+        "project": "x",
+        "source": "pep621",
+        "status": "out-of-sync",
+        "failed": True,
+        "about_path": None,
+        "message": "m",
+    }
+    (tmp_path / "a.json").write_text(
+        json.dumps({"version": 1, "shard": "1/1", "failed": 1, "results": [failed]}), encoding="utf-8"
+    )
+
+    with pytest.raises(SystemExit):
+        main(["merge-reports", str(tmp_path / "a.json")])
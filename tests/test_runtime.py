@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+import subprocess  # nosec
+import sys
+
+import pytest
+
+from metametameta import runtime
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    runtime.clear_cache()
+    yield
+    runtime.clear_cache()
+
+
+def write_package(root, name, about):
+    package = root / name
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    if about is not None:
+        (package / "__about__.py").write_text(about, encoding="utf-8")
+
+
+def test_metadata_reads_generated_about(tmp_path, monkeypatch):
+    write_package(
+        tmp_path,
+        "runtime_demo",
+        '__all__ = ["__title__", "__version__"]\n__title__ = "runtime-demo"\n__version__ = "1.2.3"\n__other__ = 1\n',
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert dict(runtime.metadata("runtime_demo")) == {"__title__": "runtime-demo", "__version__": "1.2.3"}
+    assert runtime.version("runtime_demo") == "1.2.3"
+    assert runtime.metadata("runtime_demo") is runtime.metadata("runtime_demo")
+    with pytest.raises(TypeError):
+        runtime.metadata("runtime_demo")["__version__"] = "2"  # type: ignore[index]
+
+
+def test_metadata_without_all_skips_module_attributes(tmp_path, monkeypatch):
+    write_package(tmp_path, "runtime_no_all", '__version__ = "0.1"\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert dict(runtime.metadata("runtime_no_all")) == {"__version__": "0.1"}
+
+
+def test_falls_back_to_distribution_index(tmp_path, monkeypatch):
+    write_package(tmp_path, "runtime_dist", None)
+    (tmp_path / "Runtime_Dist-4.5.6.dist-info").mkdir()
+    egg_info = tmp_path / "runtime_egg.egg-info"
+    egg_info.mkdir()
+    (egg_info / "PKG-INFO").write_text("Metadata-Version: 2.1\nName: runtime_egg\nVersion: 0.9\n", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert runtime.version("runtime_dist") == "4.5.6"
+    assert runtime.metadata("runtime-dist")["__title__"] == "Runtime_Dist"
+    assert runtime.version("runtime_egg") == "0.9"
+    assert runtime.version("runtime_missing") is None
+
+
+def test_distribution_index_lists_each_path_once(tmp_path, monkeypatch):
+    (tmp_path / "indexed-1.0.dist-info").mkdir()
+    monkeypatch.syspath_prepend(str(tmp_path))
+    listed = []
+    original = runtime.os.listdir
+
+    def counting_listdir(path):
+        listed.append(path)
+        return original(path)
+
+    monkeypatch.setattr(runtime.os, "listdir", counting_listdir)
+
+    assert runtime.version("indexed") == "1.0"
+    calls = len(listed)
+    assert runtime.version("indexed") == "1.0"
+    assert runtime.version("not-indexed") is None
+    assert len(listed) == calls
+
+
+@pytest.mark.parametrize("name", ["Foo__Bar.baz-", "-a.-_b", "Django", "zope.interface", "a___b", "_"])
+def test_normalize_name_matches_pep503(name):
+    assert runtime.normalize_name(name) == re.sub(r"[-_.]+", "-", name).lower()
+
+
+def test_import_errors_inside_about_are_not_hidden(tmp_path, monkeypatch):
+    write_package(tmp_path, "runtime_broken", "import runtime_not_installed\n__version__ = '1.0'\n")
+    (tmp_path / "runtime_broken-1.0.dist-info").mkdir()
+    write_package(tmp_path, "runtime_failing", "from os import not_a_name\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    with pytest.raises(ModuleNotFoundError, match="runtime_not_installed"):
+        runtime.metadata("runtime_broken")
+    with pytest.raises(ImportError, match="not_a_name"):
+        runtime.metadata("runtime_failing")
+
+
+def test_importing_runtime_does_not_import_generators():
+    code = "import sys, metametameta.runtime; print(any(m.startswith('metametameta.from_') for m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)  # nosec
+
+    assert result.stdout.strip() == "False"
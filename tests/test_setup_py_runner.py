@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from metametameta.from_setup_py import read_setup_py_metadata, read_setup_py_metadata_with_fallback
+from metametameta.setup_py_runner import SetupPyRunError, SetupPyRunner, execute_setup_py, run_setup_py
+
+COMPUTED_SETUP_PY = """
+from setuptools import setup
+
+
+class Meta:
+    name = "computed-" + "package"
+    version = "1.2.3"
+
+
+print("noise that must not reach the caller's stdout")
+setup(name=Meta.name, version=Meta.version, cmdclass={"build": Meta}, keywords=("a", "b"))
+"""
+
+
+@pytest.fixture
+def setup_py(tmp_path: Path):
+    def write(content: str) -> Path:
+        path = tmp_path / "setup.py"
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    return write
+
+
+def test_execute_setup_py_captures_plain_arguments(setup_py, capsys):
+    """Tests that setup() arguments are captured, unpicklable ones dropped, and output swallowed."""
+    path = setup_py(COMPUTED_SETUP_PY)
+
+    result = execute_setup_py(str(path))
+
+    assert result == {"name": "computed-package", "version": "1.2.3", "keywords": ["a", "b"]}
+    assert "noise" not in capsys.readouterr().out
+
+
+def test_execute_setup_py_restores_interpreter_state(setup_py):
+    """Tests that cwd, sys.path, sys.modules and setuptools.setup are restored after a run."""
+    path = setup_py(COMPUTED_SETUP_PY)
+    setuptools = sys.modules.get("setuptools")
+    before = (os.getcwd(), list(sys.path), set(sys.modules), getattr(setuptools, "setup", None))
+
+    execute_setup_py(str(path))
+
+    assert (os.getcwd(), sys.path, set(sys.modules), getattr(setuptools, "setup", None)) == before
+
+
+def test_execute_setup_py_errors(setup_py):
+    """Tests failures, scripts that never call setup(), and timeouts."""
+    with pytest.raises(SetupPyRunError, match="RuntimeError: boom"):
+        execute_setup_py(str(setup_py("raise RuntimeError('boom')\n")))
+    with pytest.raises(SetupPyRunError, match="without calling setup"):
+        execute_setup_py(str(setup_py("x = 1\n")))
+    with pytest.raises(SetupPyRunError, match="within 0.2s"):
+        execute_setup_py(str(setup_py("while True:\n    pass\n")), timeout=0.2)
+
+
+def test_runner_runs_in_worker_and_caches_by_content(setup_py, tmp_path: Path):
+    """Tests that the pool runs setup.py once per content hash, persisting results to the cache dir."""
+    path = setup_py(COMPUTED_SETUP_PY)
+    cache_dir = tmp_path / "cache"
+
+    with SetupPyRunner(workers=1, cache_dir=cache_dir) as runner:
+        with patch.object(runner, "_run_in_pool", wraps=runner._run_in_pool) as run:
+            assert runner.read(path)["version"] == "1.2.3"
+            assert runner.read(path)["version"] == "1.2.3"
+            assert run.call_count == 1
+
+            path.write_text(COMPUTED_SETUP_PY.replace('"1.2.3"', '"2.0"'), encoding="utf-8")
+            assert runner.read(path)["version"] == "2.0"
+            assert run.call_count == 2
+
+    assert len(list(cache_dir.glob("*.json"))) == 2
+    with SetupPyRunner(workers=1, cache_dir=cache_dir) as runner:
+        with patch.object(runner, "_run_in_pool") as run:
+            assert runner.read(path)["version"] == "2.0"
+            run.assert_not_called()
+
+
+def test_runner_reports_worker_timeouts(setup_py):
+    """Tests that a hanging setup.py fails with a timeout instead of blocking the batch."""
+    path = setup_py("while True:\n    pass\n")
+
+    with SetupPyRunner(workers=1, timeout=0.5) as runner:
+        with pytest.raises(SetupPyRunError, match="within 0.5s"):
+            runner.read(path)
+
+
+def test_fallback_only_executes_when_static_parsing_falls_short(setup_py, caplog):
+    """Tests that the runner fills in what the AST reader cannot see, and is skipped otherwise."""
+    path = setup_py(COMPUTED_SETUP_PY)
+    assert "version" not in read_setup_py_metadata(str(path))
+
+    with SetupPyRunner(workers=1) as runner:
+        metadata = read_setup_py_metadata_with_fallback(str(path), runner)
+        assert metadata["name"] == "computed-package"
+        assert metadata["version"] == "1.2.3"
+
+        path.write_text("from setuptools import setup\nsetup(name='static', version='1.0')\n", encoding="utf-8")
+        with patch.object(runner, "read") as read:
+            assert read_setup_py_metadata_with_fallback(str(path), runner) == {"name": "static", "version": "1.0"}
+            read.assert_not_called()
+
+        path.write_text("raise SystemExit(3)\n", encoding="utf-8")
+        with caplog.at_level(logging.WARNING):
+            assert read_setup_py_metadata_with_fallback(str(path), runner) == {}
+        assert "SystemExit" in caplog.text
+
+
+READS_VERSION_FILE = """
+from setuptools import setup
+
+with open("version.txt") as f:
+    version = f.read().strip()
+
+setup(name="reader", version=version)
+"""
+
+
+def test_run_setup_py_reports_project_files_read(setup_py, tmp_path: Path):
+    """Tests that the files a run opens are recorded, and that starting a process makes it untracked."""
+    (tmp_path / "version.txt").write_text("1.0\n", encoding="utf-8")
+
+    assert run_setup_py(str(setup_py(READS_VERSION_FILE))) == ({"name": "reader", "version": "1.0"}, ["version.txt"])
+    untracked = "import subprocess, sys\nsubprocess.run([sys.executable, '-c', ''])\n" + READS_VERSION_FILE
+    assert run_setup_py(str(setup_py(untracked)))[1] is None
+
+
+def test_runner_cache_is_invalidated_by_files_setup_py_reads(setup_py, tmp_path: Path):
+    """Tests that a cached result is not reused once a file setup.py read has changed."""
+    version_file = tmp_path / "version.txt"
+    version_file.write_text("1.0\n", encoding="utf-8")
+    path = setup_py(READS_VERSION_FILE)
+    cache_dir = tmp_path / "cache"
+
+    with SetupPyRunner(workers=1, cache_dir=cache_dir) as runner:
+        assert runner.read(path)["version"] == "1.0"
+        version_file.write_text("2.0\n", encoding="utf-8")
+        assert runner.read(path)["version"] == "2.0"
+
+    with SetupPyRunner(workers=1, cache_dir=cache_dir) as runner:
+        with patch.object(runner, "_run_in_pool") as run:
+            assert runner.read(path)["version"] == "2.0"
+            run.assert_not_called()
+        version_file.write_text("3.0\n", encoding="utf-8")
+        assert runner.read(path)["version"] == "3.0"
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import ast
+import textwrap
+
+import pytest
+
+from metametameta.from_setup_py import read_setup_py_metadata
+from metametameta import static_eval
+from metametameta.static_eval import NotStaticError, StaticEvaluator
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(text), encoding="utf-8")
+    return path
+
+
+def evaluate(tmp_path, module, expression):
+    evaluator = StaticEvaluator(tmp_path / "setup.py")
+    evaluator.run(ast.parse(textwrap.dedent(module)).body)
+    return evaluator.evaluate(ast.parse(expression, mode="eval").body)
+
+
+def test_kwargs_dict_unpacking_and_constant_propagation(tmp_path):
+    setup_py = write(
+        tmp_path / "setup.py",
+        """
+        from setuptools import setup
+
+        NAME = "demo"
+        BASE = {"name": NAME, "keywords": ["a"]}
+        metadata = dict(BASE, version="1." + "2")
+        metadata["keywords"] += ["b"]
+        metadata.update(license="MIT")
+
+        setup(**metadata, description=f"{NAME} tools")
+        """,
+    )
+
+    assert read_setup_py_metadata(str(setup_py)) == {
+        "name": "demo",
+        "keywords": ["a", "b"],
+        "version": "1.2",
+        "license": "MIT",
+        "description": "demo tools",
+    }
+
+
+def test_version_file_and_readme_helper(tmp_path):
+    write(tmp_path / "demo" / "_version.py", '__version__ = "3.4.5"\n')
+    write(tmp_path / "README.rst", "Demo\n====\n")
+    write(tmp_path / "requirements.txt", "# pins\nclick>=8\n\nrich\n")
+    setup_py = write(
+        tmp_path / "setup.py",
+        """
+        import io
+        import os
+        import re
+        from pathlib import Path
+
+        from setuptools import find_packages, setup
+
+        here = os.path.abspath(os.path.dirname(__file__))
+
+
+        def read(*parts, **kwargs):
+            \"\"\"Read a file next to setup.py.\"\"\"
+            with io.open(os.path.join(here, *parts), encoding=kwargs.get("encoding", "utf8")) as handle:
+                return handle.read()
+
+
+        with open("demo/_version.py") as version_file:
+            VERSION = version_file.read().split("__version__ = ")[1].split('"')[1]
+
+        REQUIREMENTS = [
+            line.strip()
+            for line in (Path(__file__).parent / "requirements.txt").read_text().splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
+
+        setup(
+            name="demo",
+            version=VERSION,
+            long_description=read("README.rst"),
+            install_requires=REQUIREMENTS,
+            packages=find_packages(),
+        )
+        """,
+    )
+
+    metadata = read_setup_py_metadata(str(setup_py))
+
+    assert metadata["version"] == "3.4.5"
+    assert metadata["long_description"] == "Demo\n====\n"
+    assert metadata["install_requires"] == ["click>=8", "rich"]
+    assert "packages" not in metadata
+
+
+def test_exec_version_file_into_namespace_and_module_attribute(tmp_path):
+    write(tmp_path / "demo" / "__about__.py", '__version__ = "0.1.0"\n__author__ = "Ada"\n')
+    write(tmp_path / "demo" / "__init__.py", "from .__about__ import *\n")
+    module = """
+        import demo
+        about = {}
+        with open("demo/__about__.py") as f:
+            exec(f.read(), about)
+        """
+
+    assert evaluate(tmp_path, module, 'about["__version__"]') == "0.1.0"
+    assert evaluate(tmp_path, module, "demo.__author__") == "Ada"
+
+
+@pytest.mark.parametrize(
+    ("module", "expression"),
+    [
+        ("import subprocess", 'subprocess.check_output(["git", "describe"])'),
+        ("", 'open("/etc/hostname").read()'),
+        ("", 'open("out.txt", "w")'),
+        ("import sys\nif sys.argv:\n    VERSION = '1'\n", "VERSION"),
+        ("VERSION = '1'\nVERSION = compute()", "VERSION"),
+        ("", "__import__('os').system('true')"),
+        ("", "'x' * 10**6"),
+    ],
+)
+def test_refuses_anything_outside_the_whitelist(tmp_path, module, expression):
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, module, expression)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "100000 * 'x'",
+        "['x'] * 100000",
+        "100000 * ('x',)",
+        "'%100000s' % 'x'",
+        "'%.100000f' % 1.0",
+        "'%*s' % (100000, 'x')",
+        "'{:>100000}'.format('x')",
+        "'{:>{width}}'.format('x', width=100000)",
+        "f'{1:>100000}'",
+        "f'{1.5:.100000f}'",
+        "('x' * 10000).replace('x', 'y' * 10000)",
+        "('x' * 5000).join(['y' * 5000] * 2001)",
+    ],
+)
+def test_refuses_expressions_that_build_huge_values(tmp_path, expression):
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, "", expression)
+
+
+def test_doubling_stops_at_the_value_limit(tmp_path):
+    module = "TEXT = 'x' * 10000\n" + "TEXT = TEXT + TEXT\n" * 12
+
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, module, "TEXT")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "A = 3\n" + "A = A * A\n" * 30,
+        "A = 3\n" + "A *= A\n" * 30,
+        "A = int('9' * 100000)",
+    ],
+)
+def test_refuses_numbers_that_grow_without_bound(tmp_path, module):
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, module, "A")
+    assert evaluate(tmp_path, "A = 3\n" + "A = A * A\n" * 5, "A") == 3**32
+
+
+def test_comprehensions_stop_at_the_iteration_limit(tmp_path):
+    module = "BIG = 'a' * 10000\nX = [1 for i in BIG for j in BIG for k in BIG]\nY = [c for c in BIG[:3]]\n"
+
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, module, "X")
+    assert evaluate(tmp_path, module, "Y") == ["a", "a", "a"]
+
+
+def test_regex_matching_is_not_evaluated(tmp_path):
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, "import re", 're.match("(a+)+$", "a" * 40 + "b")')
+    with pytest.raises(NotStaticError):
+        evaluate(tmp_path, "import re", 're.compile("(a+)+$").search("a" * 40 + "b")')
+
+
+def test_each_evaluator_has_a_step_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_eval, "MAX_EVALUATION_STEPS", 1000)
+    module = "ROW = 'a' * 40\nTABLE = [[c for c in ROW] for r in ROW]\nLATER = 1\n"
+
+    with pytest.raises(NotStaticError, match="budget"):
+        evaluate(tmp_path, module, "LATER")
+
+
+def test_setup_py_with_runaway_expressions_still_reads(tmp_path):
+    setup_py = write(
+        tmp_path / "setup.py",
+        "import re\nfrom setuptools import setup\n\nN = 3\n"
+        + "N = N * N\n" * 30
+        + 'BIG = "a" * 10000\n'
+        + "X = [1 for i in BIG for j in BIG for k in BIG]\n"
+        + 'M = re.match("(a+)+$", "a" * 40 + "b")\n'
+        + 'setup(name="demo", version="1.0")\n',
+    )
+
+    assert read_setup_py_metadata(str(setup_py)) == {"name": "demo", "version": "1.0"}
+
+
+def test_ordinary_widths_still_evaluate(tmp_path):
+    assert evaluate(tmp_path, "", "'%-4s|%5.2f %%' % ('ab', 1.5)") == "ab  | 1.50 %"
+    assert evaluate(tmp_path, "", "'{:>8}'.format('ok')") == "      ok"
+    assert evaluate(tmp_path, "", "f'{3.14159:.2f}' + 2 * '='") == "3.14=="
+
+
+def test_if_with_static_test_takes_the_right_branch(tmp_path):
+    module = """
+        DEBUG = False
+        if DEBUG:
+            VERSION = "dev"
+        else:
+            VERSION = "1.0"
+        """
+
+    assert evaluate(tmp_path, module, "VERSION") == "1.0"
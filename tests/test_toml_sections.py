@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import textwrap
+
+import pytest
+import toml
+
+from metametameta import toml_sections
+from metametameta.toml_sections import load_toml_table, read_toml_table
+
+TRICKY = textwrap.dedent('''
+    # [project] in a comment is not a header
+    [build-system]
+    requires = ["setuptools"]
+
+    [ project ]  # spaced header with a comment
+    name = "demo"
+    description = """
+    [tool.poetry]
+    not a header inside a multi-line string
+    """
+    dependencies = [
+        "click>=8",
+    ]
+    matrix = [
+      ["a", "b"],
+      ["c"],
+    ]
+
+    [project.urls]
+    homepage = "https://example.com"
+
+    [tool.ruff]
+    line-length = 120
+    [tool.ruff.lint]
+    select = ["E", "F"]
+
+    [tool.poetry]
+    name = "demo"
+
+    [[tool.poetry.source]]
+    name = "private"
+    url = "https://pypi.example.com"
+
+    [tool.poetry.dependencies]
+    python = "^3.9"
+    ''')
+
+
+@pytest.mark.parametrize("table", ["project", "tool.poetry", "tool.ruff", "tool.mypy", "build-system"])
+def test_load_toml_table_matches_full_parse(table):
+    expected = toml.loads(TRICKY)
+    for part in table.split("."):
+        expected = expected.get(part) if expected is not None else None
+
+    assert load_toml_table(TRICKY, table) == expected
+
+
+def test_read_toml_table_handles_crlf_files(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_bytes(TRICKY.replace("\n", "\r\n").encode("utf-8"))
+
+    assert read_toml_table(str(path), "tool.poetry") == toml.loads(TRICKY)["tool"]["poetry"]
+
+
+def test_load_toml_table_only_parses_needed_sections(monkeypatch):
+    parsed = []
+    real_loads = toml.loads
+    monkeypatch.setattr(toml_sections.toml, "loads", lambda text: parsed.append(text) or real_loads(text))
+
+    load_toml_table(TRICKY, "project")
+
+    (chunk,) = parsed
+    assert "[project.urls]" in chunk
+    assert "tool.ruff" not in chunk
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        'project.name = "dotted-root"\n[tool.ruff]\nx = 1\n',
+        '[tool]\npoetry = { name = "inline" }\n',
+        '[tool]\npoetry.name = "dotted"\n[tool.poetry.dependencies]\npython = "^3.9"\n',
+        '[tool."poetry"]\nname = "quoted"\n',
+    ],
+)
+def test_load_toml_table_falls_back_for_other_definitions(text):
+    expected = toml.loads(text)
+    table = "project" if "project" in expected else "tool.poetry"
+    path = table.split(".")
+    for part in path:
+        expected = expected[part]
+
+    assert load_toml_table(text, table) == expected
+
+
+def test_read_toml_table_missing_table_and_file(tmp_path):
+    path = tmp_path / "pyproject.toml"
+    path.write_text("[tool.black]\nline-length = 120\n", encoding="utf-8")
+
+    assert read_toml_table(str(path), "project") == {}
+    assert load_toml_table("[project]\n[tool.black]\nline-length = 120\n", "project") == {}
+    assert load_toml_table("[tool.black]\nline-length = 120\n", "project") is None
+    with pytest.raises(FileNotFoundError):
+        read_toml_table(str(tmp_path / "missing.toml"), "project")
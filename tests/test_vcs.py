@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from metametameta.dynamic_version import resolve_dynamic_version
+from metametameta.vcs import (
+    Description,
+    GitRepository,
+    apply_delta,
+    describe_version,
+    find_git_dir,
+    format_version,
+    tag_version_key,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(repo: Path, *args: str, tick: list[int] | None = None) -> str:
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test",
+        "GIT_AUTHOR_EMAIL": "test@example.com",
+        "GIT_COMMITTER_NAME": "Test",
+        "GIT_COMMITTER_EMAIL": "test@example.com",
+        "GIT_CONFIG_GLOBAL": os.devnull,
+        "GIT_CONFIG_NOSYSTEM": "1",
+    }
+    if tick is not None:
+        tick[0] += 60
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"{tick[0]} +0000"
+    return subprocess.run(["git", *args], cwd=repo, env=env, check=True, capture_output=True, text=True).stdout.strip()
+
+
+class Repo:
+    """A scratch repository with a deterministic clock."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.clock = [1_700_000_000]
+        git(root, "init", "-q", "-b", "main")
+
+    def git(self, *args: str) -> str:
+        return git(self.root, *args, tick=self.clock)
+
+    def commit(self, message: str, content: str | None = None, name: str = "data.txt") -> str:
+        (self.root / name).write_text(content if content is not None else message * 200, encoding="utf-8")
+        self.git("add", name)
+        self.git("commit", "-q", "-m", message)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Repo:
+    root = tmp_path / "repo"
+    root.mkdir()
+    return Repo(root)
+
+
+def git_describe(root: Path) -> Description:
+    tag, distance, node = git(root, "describe", "--tags", "--long").rsplit("-", 2)
+    return Description(tag, int(distance), git(root, "rev-parse", "HEAD"))
+
+
+def test_describe_matches_git_for_loose_and_packed_repositories(repo):
+    repo.commit("first")
+    repo.git("tag", "v1.0.0")
+    repo.commit("second")
+    repo.git("tag", "-a", "v1.1.0", "-m", "annotated")
+    for index in range(3):
+        repo.commit(f"change {index}")
+
+    loose = GitRepository(find_git_dir(repo.root)).describe()
+    assert loose == git_describe(repo.root) == Description("v1.1.0", 3, loose.node)
+
+    repo.git("gc", "-q", "--aggressive")
+    assert not list((repo.root / ".git" / "refs" / "tags").iterdir())
+    assert GitRepository(find_git_dir(repo.root)).describe() == loose
+
+
+def test_describe_counts_commits_across_merges(repo):
+    repo.commit("base")
+    repo.git("tag", "2.0")
+    repo.git("checkout", "-q", "-b", "feature")
+    repo.commit("feature one", name="feature.txt")
+    repo.commit("feature two", name="feature.txt")
+    repo.git("checkout", "-q", "main")
+    repo.commit("main one", name="main.txt")
+    repo.git("merge", "-q", "--no-ff", "feature", "-m", "merge")
+    repo.git("gc", "-q")
+
+    assert GitRepository(find_git_dir(repo.root)).describe() == git_describe(repo.root)
+
+
+def test_packed_objects_with_deltas_match_git(repo):
+    for index in range(4):
+        repo.commit(f"edit {index}", "shared line\n" * 500 + f"tail {index}\n")
+    repo.git("gc", "-q", "--aggressive")
+    repository = GitRepository(find_git_dir(repo.root))
+
+    for index in range(4):
+        sha = repo.git("rev-parse", f"HEAD~{index}:data.txt")
+        kind, content = repository.read_object(sha)
+        assert kind == "blob"
+        assert content.decode("utf-8") == f"{'shared line' + chr(10)}" * 500 + f"tail {3 - index}\n"
+
+
+def test_describe_prefers_the_highest_version_on_a_commit(repo):
+    repo.commit("first")
+    for tag in ("v1.9", "v1.10rc1", "v1.10", "v1.2"):
+        repo.git("tag", tag)
+
+    assert GitRepository(find_git_dir(repo.root)).describe().tag == "v1.10"
+    assert sorted(["v2.0", "v2.0.post1", "v2.0.dev3", "v2.0b1", "v1.99"], key=tag_version_key) == [
+        "v1.99",
+        "v2.0.dev3",
+        "v2.0b1",
+        "v2.0",
+        "v2.0.post1",
+    ]
+
+
+def test_tag_cache_sees_tags_in_nested_directories(repo):
+    repo.commit("first")
+    repo.git("tag", "release/v1.0")
+    repo.commit("second")
+    repository = GitRepository(find_git_dir(repo.root))
+    pattern = re.compile(r"^release/v(?P<version>.+)$")
+    assert repository.describe(pattern).tag == "release/v1.0"
+    before = repository.tags_signature()
+
+    repo.git("tag", "release/v2.0")
+
+    assert repository.tags_signature() != before
+    assert repository.describe(pattern) == Description("release/v2.0", 0, repo.git("rev-parse", "HEAD"))
+
+
+def test_pack_files_are_closed(repo):
+    repo.commit("first")
+    repo.git("gc", "-q")
+    with GitRepository(find_git_dir(repo.root)) as repository:
+        assert repository.describe() is not None
+        first = repository.packs()
+        repo.commit("second")
+        repo.git("repack", "-q", "-a", "-d")
+        current = repository.packs(reload=True)
+        assert first and all(pack.file.closed for pack in first if pack not in current)
+    assert current and all(pack.file.closed for pack in current)
+
+
+def test_apply_delta_copy_and_insert():
+    base = b"hello world"
+    # sizes 11 -> 11; copy "hello " (offset 0, size 6), insert "there"
+    delta = bytes([11, 11, 0x90, 6, 5]) + b"there"
+
+    assert apply_delta(base, delta) == b"hello there"
+
+
+@pytest.mark.parametrize(
+    ("description", "expected"),
+    [
+        (Description("v1.2.3", 0, "a" * 40), "1.2.3"),
+        (Description("v1.2.3", 5, "1a2b3c4d" * 5), "1.2.4.dev5+g1a2b3c4"),
+        (Description("release-2.0rc1", 1, "f" * 40), "2.0rc2.dev1+gfffffff"),
+        (Description(None, 12, "1a2b3c4d" * 5), "0.1.dev12+g1a2b3c4"),
+    ],
+)
+def test_format_version(description, expected):
+    assert format_version(description) == expected
+
+
+def test_describe_version_is_shared_by_projects_in_one_repository(repo):
+    repo.commit("first")
+    repo.git("tag", "v3.0.0")
+    repo.commit("second")
+    (repo.root / "services" / "api").mkdir(parents=True)
+    (repo.root / "libs" / "core").mkdir(parents=True)
+
+    assert describe_version(repo.root / "services" / "api") == describe_version(repo.root / "libs" / "core")
+    assert describe_version(repo.root / "libs" / "core").startswith("3.0.1.dev1+g")
+
+
+def test_describe_version_without_repository_or_commits(tmp_path: Path):
+    assert describe_version(tmp_path) is None or find_git_dir(tmp_path) is not None
+    git(tmp_path, "init", "-q")
+
+    assert describe_version(tmp_path) is None
+
+
+def test_vcs_dynamic_versions_resolve_through_backend_config(repo):
+    repo.commit("first")
+    repo.git("tag", "v0.4.0")
+    pyproject = repo.root / "pyproject.toml"
+    project = '[project]\nname = "demo"\ndynamic = ["version"]\n'
+
+    pyproject.write_text(project + '[tool.hatch.version]\nsource = "vcs"\n', encoding="utf-8")
+    assert resolve_dynamic_version(pyproject, {"name": "demo"}) == "0.4.0"
+
+    pyproject.write_text(project + '[build-system]\nrequires = ["setuptools", "setuptools-scm>=8"]\n', encoding="utf-8")
+    assert resolve_dynamic_version(pyproject, {"name": "demo"}) == "0.4.0"
+
+    pyproject.write_text(project + '[tool.pdm.version]\nsource = "scm"\n', encoding="utf-8")
+    assert resolve_dynamic_version(pyproject, {"name": "demo"}) == "0.4.0"